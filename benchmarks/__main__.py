@@ -0,0 +1,141 @@
+"""Run the benchmarks and write the results as JSON.
+
+Usage, from the repository root with Home Assistant installed:
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --sizes 10,100,2048 --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from homeassistant.const import __version__ as HA_VERSION
+
+from . import suite
+from .media_server import MediaServer
+
+_MANIFEST = (
+    Path(__file__).parent.parent
+    / "custom_components"
+    / "ha_dashboard_player"
+    / "manifest.json"
+)
+_BENCHMARKS = ("download", "cache_hit", "play_media", "report_state")
+# Fields that identify a row of a list result rather than measure it.
+_ID_FIELDS = ("size_mb", "origin_ranges", "cards", "pattern")
+
+
+def main() -> int:
+    """Parse arguments, run the selected benchmarks and report."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--output", type=Path, help="write results to this file")
+    parser.add_argument(
+        "--compare", type=Path, help="print changes relative to a previous run"
+    )
+    parser.add_argument(
+        "--only", default=",".join(_BENCHMARKS), help="comma-separated benchmarks"
+    )
+    parser.add_argument("--sizes", default="10,100,2048", help="download sizes in MiB")
+    parser.add_argument("--cards", default="1,10,100", help="simulated card counts")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--duration", type=float, default=2.0, help="seconds per report_state run"
+    )
+    args = parser.parse_args()
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    if unknown := set(only) - set(_BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(_async_run(args, only))
+    report = {
+        "integration_version": json.loads(_MANIFEST.read_text())["version"],
+        "homeassistant_version": HA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        _print_comparison(baseline["results"], results)
+    return 0
+
+
+async def _async_run(args: argparse.Namespace, only: list[str]) -> dict:
+    server = MediaServer()
+    await server.async_start()
+    results: dict = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="ha-dashboard-player-bench-") as tmp:
+            async with suite.async_bench_hass(tmp) as hass:
+                if "download" in only:
+                    sizes = [int(size) for size in args.sizes.split(",")]
+                    results["download"] = await suite.async_bench_download(
+                        hass, server, sizes
+                    )
+                if "cache_hit" in only:
+                    results["cache_hit"] = await suite.async_bench_cache_hit(
+                        hass, server, args.iterations
+                    )
+                if "play_media" in only:
+                    results["play_media"] = await suite.async_bench_play_media(
+                        hass, server, max(1, args.iterations // 10)
+                    )
+                if "report_state" in only:
+                    cards = [int(count) for count in args.cards.split(",")]
+                    results["report_state"] = await suite.async_bench_report_state(
+                        hass, cards, args.duration
+                    )
+    finally:
+        await server.async_stop()
+    return results
+
+
+def _flatten(value, prefix: str = "") -> dict[str, float]:
+    """Map dotted paths to the numeric leaves of a result tree."""
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+        return flat
+    if isinstance(value, list):
+        flat = {}
+        for item in value:
+            ident = ",".join(
+                f"{field}={item[field]}" for field in _ID_FIELDS if field in item
+            )
+            metrics = {k: v for k, v in item.items() if k not in _ID_FIELDS}
+            flat.update(_flatten(metrics, f"{prefix}[{ident}]"))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    return {}
+
+
+def _print_comparison(baseline: dict, current: dict) -> None:
+    old = _flatten(baseline)
+    new = _flatten(current)
+    for path in sorted(old.keys() & new.keys()):
+        if old[path]:
+            change = (new[path] - old[path]) / old[path] * 100
+            print(
+                f"{path}: {old[path]} -> {new[path]} ({change:+.1f}%)", file=sys.stderr
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Local stand-in for a media origin used by the benchmarks."""
+
+from __future__ import annotations
+
+import random
+
+from aiohttp import hdrs, web
+
+_BLOCK_SIZE = 1024 * 1024
+_BLOCK = random.Random(0).randbytes(_BLOCK_SIZE)
+_LAST_MODIFIED = "Thu, 01 Jan 2026 00:00:00 GMT"
+
+
+class MediaServer:
+    """Serve synthetic files of any size without holding them in memory.
+
+    /media/<bytes>.bin answers like a static file server: ETag,
+    Last-Modified, conditional requests and byte ranges. Add ?ranges=0 to
+    hide Accept-Ranges, which forces single-connection downloads.
+    """
+
+    def __init__(self) -> None:
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def async_start(self) -> None:
+        """Listen on a free port on the loopback interface."""
+        app = web.Application()
+        app.router.add_get(r"/media/{size:\d+}.bin", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+
+    async def async_stop(self) -> None:
+        """Shut the server down."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def url(self, size: int, ranges: bool = True, tag: str | None = None) -> str:
+        """Return the URL of a synthetic file of size bytes."""
+        url = f"{self.base_url}/media/{size}.bin?ranges={int(ranges)}"
+        return f"{url}&tag={tag}" if tag else url
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        size = int(request.match_info["size"])
+        ranges = request.query.get("ranges", "1") != "0"
+        etag = f'"{size}"'
+        headers = {
+            hdrs.ETAG: etag,
+            hdrs.LAST_MODIFIED: _LAST_MODIFIED,
+            hdrs.CONTENT_TYPE: "application/octet-stream",
+        }
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers=headers)
+
+        start, end, status = 0, size, 200
+        if ranges:
+            headers[hdrs.ACCEPT_RANGES] = "bytes"
+            http_range = request.http_range
+            if http_range.start is not None or http_range.stop is not None:
+                start = http_range.start or 0
+                if start < 0:
+                    start = max(size + start, 0)
+                end = min(http_range.stop or size, size)
+                if start >= end:
+                    raise web.HTTPRequestRangeNotSatisfiable(
+                        headers={hdrs.CONTENT_RANGE: f"bytes */{size}"}
+                    )
+                headers[hdrs.CONTENT_RANGE] = f"bytes {start}-{end - 1}/{size}"
+                status = 206
+
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = end - start
+        await response.prepare(request)
+        position = start
+        while position < end:
+            offset = position % _BLOCK_SIZE
+            length = min(_BLOCK_SIZE - offset, end - position)
+            await response.write(_BLOCK[offset : offset + length])
+            position += length
+        await response.write_eof()
+        return response
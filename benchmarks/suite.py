@@ -0,0 +1,286 @@
+"""Benchmarks of the cache, play_media and feedback hot paths.
+
+Each benchmark runs against a bare Home Assistant core with no
+integrations loaded and a MediaServer on the loopback interface, so the
+numbers do not depend on the network or on a configured instance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from collections.abc import AsyncIterator
+
+from homeassistant.components.http.auth import STORAGE_KEY as HTTP_AUTH_KEY
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_dashboard_player.cache import get_media_cache
+from custom_components.ha_dashboard_player.const import DATA_PLAYERS, DOMAIN
+from custom_components.ha_dashboard_player.media_player import HADashboardPlayer
+
+from .media_server import MediaServer
+
+MB = 1024 * 1024
+
+_PLAY_MEDIA_SIZE = 64 * MB
+_HIT_SIZE = MB
+_REPORT_DURATION = 600.0
+_player_ids = itertools.count(1)
+
+
+@contextlib.asynccontextmanager
+async def async_bench_hass(config_dir: str) -> AsyncIterator[HomeAssistant]:
+    """Yield a running Home Assistant core with no integrations loaded."""
+    hass = HomeAssistant(config_dir)
+    hass.data.setdefault(DOMAIN, {})
+    # Players sign cached file URLs for the content user that the http
+    # integration creates; nothing checks the signatures here.
+    hass.data[HTTP_AUTH_KEY] = "bench-content-user"
+    await hass.async_start()
+    try:
+        yield hass
+    finally:
+        await hass.async_stop(force=True)
+
+
+class PeakRss:
+    """Sample resident memory in the background and keep the peak."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> PeakRss:
+        self.baseline = self.peak = _rss_bytes()
+        self._task = asyncio.create_task(self._async_sample())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        assert self._task is not None
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self.peak = max(self.peak, _rss_bytes())
+
+    @property
+    def delta_mb(self) -> float:
+        """Return the peak growth over the baseline in MiB."""
+        return round((self.peak - self.baseline) / MB, 2)
+
+    async def _async_sample(self) -> None:
+        while True:
+            self.peak = max(self.peak, _rss_bytes())
+            await asyncio.sleep(self.interval)
+
+
+async def async_bench_download(
+    hass: HomeAssistant, server: MediaServer, sizes_mb: list[int]
+) -> list[dict]:
+    """Measure cold download throughput and peak RSS per file size.
+
+    Every size is fetched once from an origin without byte ranges and once
+    from one that offers them, so both download paths are covered.
+    """
+    cache = get_media_cache(hass)
+    results = []
+    for size_mb, ranges in itertools.product(sizes_mb, (False, True)):
+        url = server.url(size_mb * MB, ranges=ranges)
+        async with PeakRss() as rss:
+            start = time.perf_counter()
+            entry = await cache.async_cache_entry(url)
+            elapsed = time.perf_counter() - start
+        results.append(
+            {
+                "size_mb": size_mb,
+                "origin_ranges": ranges,
+                "seconds": round(elapsed, 4),
+                "throughput_mb_s": round(entry.size / MB / elapsed, 2),
+                "peak_rss_delta_mb": rss.delta_mb,
+            }
+        )
+        await _async_drop(hass, url)
+    return results
+
+
+async def async_bench_cache_hit(
+    hass: HomeAssistant, server: MediaServer, iterations: int
+) -> dict:
+    """Measure the latency of _maybe_cache_media and _resolve_media_url hits."""
+    player = _make_player(hass, enable_cache=True)
+    url = server.url(_HIT_SIZE)
+    await player._maybe_cache_media(url)  # pylint: disable=protected-access
+
+    hit_samples = []
+    resolve_samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await player._resolve_media_url(url)  # pylint: disable=protected-access
+        resolve_samples.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await player._maybe_cache_media(url)  # pylint: disable=protected-access
+        hit_samples.append(time.perf_counter() - start)
+
+    await _async_drop(hass, url)
+    return {
+        "maybe_cache_media": _summary(hit_samples),
+        "resolve_media_url": _summary(resolve_samples),
+    }
+
+
+async def async_bench_play_media(
+    hass: HomeAssistant, server: MediaServer, iterations: int
+) -> dict:
+    """Measure the time from play_media until the playing state is written.
+
+    uncached plays the origin URL directly, cache_miss starts a fresh
+    download each time and cache_hit plays a file that is already cached.
+    """
+    uncached = _make_player(hass, enable_cache=False)
+    cached = _make_player(hass, enable_cache=True)
+    hit_url = server.url(_PLAY_MEDIA_SIZE)
+    await cached._maybe_cache_media(hit_url)  # pylint: disable=protected-access
+
+    samples: dict[str, list[float]] = {
+        "uncached": [],
+        "cache_miss": [],
+        "cache_hit": [],
+    }
+    for index in range(iterations):
+        miss_url = server.url(_PLAY_MEDIA_SIZE, tag=f"miss{index}")
+        for scenario, player, url in (
+            ("uncached", uncached, server.url(_PLAY_MEDIA_SIZE)),
+            ("cache_miss", cached, miss_url),
+            ("cache_hit", cached, hit_url),
+        ):
+            start = time.perf_counter()
+            await player.async_play_media("video/mp4", url)
+            samples[scenario].append(time.perf_counter() - start)
+            state = hass.states.get(player.entity_id)
+            if state is None or state.state != "playing":
+                raise RuntimeError(f"{scenario}: player did not reach playing")
+        await _async_drain_downloads(hass)
+        await _async_drop(hass, miss_url)
+
+    await _async_drop(hass, hit_url)
+    return {scenario: _summary(values) for scenario, values in samples.items()}
+
+
+async def async_bench_report_state(
+    hass: HomeAssistant, cards: list[int], duration: float
+) -> list[dict]:
+    """Measure report_state calls/sec and state writes with N cards.
+
+    steady reports follow the extrapolated position, as cards do during
+    normal playback; seeking reports jump to a random position every time.
+    """
+    writes = 0
+
+    def _count_write(_event) -> None:
+        nonlocal writes
+        writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+    results = []
+    try:
+        for count, pattern in itertools.product(cards, ("steady", "seeking")):
+            players = [_make_player(hass, enable_cache=False) for _ in range(count)]
+            for player in players:
+                await player.async_play_media("video/mp4", "http://127.0.0.1/x.mp4")
+            await hass.async_block_till_done()
+            started = time.monotonic()
+            writes = 0
+            calls = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < duration:
+                for player in players:
+                    if pattern == "steady":
+                        position = time.monotonic() - started
+                    else:
+                        position = random.uniform(0, _REPORT_DURATION)
+                    await player.async_report_state(
+                        state="playing",
+                        media_position=position,
+                        media_duration=_REPORT_DURATION,
+                    )
+                    calls += 1
+                await asyncio.sleep(0)
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "cards": count,
+                    "pattern": pattern,
+                    "calls_per_sec": round(calls / elapsed, 1),
+                    "state_writes_per_sec": round(writes / elapsed, 1),
+                }
+            )
+            for player in players:
+                await _async_remove_player(hass, player)
+    finally:
+        unsub()
+    return results
+
+
+def _make_player(hass: HomeAssistant, enable_cache: bool) -> HADashboardPlayer:
+    """Create a player entity outside of an entity platform."""
+    index = next(_player_ids)
+    player = HADashboardPlayer(
+        hass, f"Bench {index}", f"bench_{index}", enable_cache, False
+    )
+    player.entity_id = f"media_player.bench_{index}"
+    hass.data[DOMAIN].setdefault(DATA_PLAYERS, {})[player.entity_id] = player
+    return player
+
+
+async def _async_remove_player(hass: HomeAssistant, player: HADashboardPlayer) -> None:
+    await player.async_will_remove_from_hass()
+    hass.states.async_remove(player.entity_id)
+
+
+async def _async_drain_downloads(hass: HomeAssistant) -> None:
+    """Wait for background downloads so they do not skew the next sample."""
+    cache = get_media_cache(hass)
+    # pylint: disable-next=protected-access
+    while downloads := list(cache._downloads.values()):
+        await asyncio.gather(*downloads, return_exceptions=True)
+
+
+async def _async_drop(hass: HomeAssistant, key: str) -> None:
+    """Remove key from the cache so the next fetch is cold."""
+    await _async_drain_downloads(hass)
+    cache = get_media_cache(hass)
+    if (entry := cache.index.async_remove(key)) is not None:
+        path = cache.cache_dir / entry.filename
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+
+def _summary(samples: list[float]) -> dict:
+    """Return latency statistics in milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "count": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def _rss_bytes() -> int:
+    """Return the current resident set size, or the peak where unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
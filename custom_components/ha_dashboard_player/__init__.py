@@ -1,19 +1,98 @@
 """HA Dashboard Player integration."""
 
+from datetime import time
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .cache import get_media_cache
+from .const import (
+    CONF_BANDWIDTH_LIMIT,
+    CONF_CACHE_MAX_ENTRIES,
+    CONF_CACHE_MAX_SIZE,
+    CONF_ENABLE_CACHE,
+    CONF_FULL_SPEED_END,
+    CONF_FULL_SPEED_START,
+    DEFAULT_BANDWIDTH_LIMIT,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_MAX_SIZE,
+    DEFAULT_ENABLE_CACHE,
+    DOMAIN,
+    PLATFORMS,
+)
+from .profiler import async_register_profile_service
+from .throttle import BandwidthPolicy
+from .views import CacheView
+from .websocket import async_register_websocket_commands
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-from .const import DOMAIN, PLATFORMS
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration-wide websocket API, cache view and services."""
+    hass.data.setdefault(DOMAIN, {})
+    async_register_websocket_commands(hass)
+    async_register_profile_service(hass)
+    hass.http.register_view(CacheView(get_media_cache(hass)))
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up HA Dashboard Player from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    enable_cache = entry.options.get(
+        CONF_ENABLE_CACHE, entry.data.get(CONF_ENABLE_CACHE, DEFAULT_ENABLE_CACHE)
+    )
+    if enable_cache:
+        cache_max_size = entry.options.get(
+            CONF_CACHE_MAX_SIZE,
+            entry.data.get(CONF_CACHE_MAX_SIZE, DEFAULT_CACHE_MAX_SIZE),
+        )
+        cache_max_entries = entry.options.get(
+            CONF_CACHE_MAX_ENTRIES,
+            entry.data.get(CONF_CACHE_MAX_ENTRIES, DEFAULT_CACHE_MAX_ENTRIES),
+        )
+        bandwidth = BandwidthPolicy(
+            limit=int(
+                float(entry.options.get(CONF_BANDWIDTH_LIMIT, DEFAULT_BANDWIDTH_LIMIT))
+                * 125_000
+            ),
+            window_start=_parse_time(entry.options.get(CONF_FULL_SPEED_START)),
+            window_end=_parse_time(entry.options.get(CONF_FULL_SPEED_END)),
+        )
+        cache = get_media_cache(hass)
+        entry.async_on_unload(
+            cache.async_register(
+                entry.entry_id,
+                int(cache_max_size) * 1024 * 1024,
+                int(cache_max_entries),
+                bandwidth,
+            )
+        )
+        entry.async_create_background_task(
+            hass, cache.index.async_load(), f"{DOMAIN} cache index load"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+def _parse_time(value: str | None) -> time | None:
+    """Parse an HH:MM[:SS] option into a time, or None if unset."""
+    return dt_util.parse_time(value) if value else None
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
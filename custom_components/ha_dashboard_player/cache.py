@@ -0,0 +1,1274 @@
+"""Shared media cache for HA Dashboard Player."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.network import get_url
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CACHE_DIR,
+    CACHE_SWEEP_INTERVAL,
+    CACHE_VIEW_URL,
+    DATA_CACHE,
+    DOMAIN,
+    LEGACY_CACHE_DIR,
+    SIGNAL_CACHE_UPDATED,
+)
+from .faststart import MP4_CONTENT_TYPES, FastStartError, make_faststart
+from .images import ImageSpec, render_derivative
+from .metrics import get_metrics
+from .throttle import BandwidthPolicy, TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.cache"
+SAVE_DELAY = 10
+
+_CHUNK_SIZE = 1024 * 1024
+_REVALIDATE_INTERVAL = 60
+# Entries without validators, or keyed on a media-source ID, are fetched
+# again after this many seconds because the origin cannot be asked.
+_UNVALIDATED_MAX_AGE = 60 * 60
+_SEGMENTED_MIN_SIZE = 32 * 1024 * 1024
+_SEGMENT_SIZE = 8 * 1024 * 1024
+_SEGMENT_CONNECTIONS = 4
+_SEGMENT_ATTEMPTS = 3
+_PREFETCH_CONCURRENCY = 2
+_PARTIAL_MAX_AGE = 24 * 60 * 60
+_MP4_SUFFIXES = (".mp4", ".m4v", ".mov", ".m4a")
+# Suffixes kept on cache filenames; anything else, such as the object ID
+# at the end of a media-source ID, is dropped.
+_SUFFIX_RE = re.compile(r"\.[A-Za-z0-9]{1,8}")
+_STREAMING_CONTENT_TYPES = {
+    "application/vnd.apple.mpegurl",
+    "application/x-mpegurl",
+    "multipart/x-mixed-replace",
+}
+
+
+class SegmentMismatchError(HomeAssistantError):
+    """The origin stopped honouring range requests for the cached version."""
+
+
+@dataclass
+class CacheEntry:
+    """A single cached media file."""
+
+    url: str
+    filename: str
+    size: int
+    content_type: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    last_access: float = 0.0
+    last_validated: float = 0.0
+    faststart_pending: bool = False
+
+    @property
+    def local_url(self) -> str:
+        """Return the URL the frontend uses to load the cached file."""
+        return cache_url(self.filename)
+
+
+class DownloadProgress:
+    """Bytes of an in-flight download that can already be served.
+
+    available counts the contiguous bytes from the start of path; readers
+    wait for it to grow until the download is done or failed. Background
+    downloads are throttled by bucket until something in the foreground
+    needs the same file.
+    """
+
+    def __init__(
+        self, bucket: TokenBucket | None = None, foreground: bool = True
+    ) -> None:
+        self.bucket = bucket
+        self.foreground = foreground
+        self.path: Path | None = None
+        self.size: int | None = None
+        self.content_type: str | None = None
+        self.available = 0
+        self.done = False
+        self.error: BaseException | None = None
+        self._changed = asyncio.Event()
+        self._promoted = asyncio.Event()
+
+    @callback
+    def async_promote(self) -> None:
+        """Stop throttling because something in the foreground needs the file."""
+        self.foreground = True
+        self._promoted.set()
+
+    async def async_wait_promoted(self) -> None:
+        """Wait until async_promote was called."""
+        await self._promoted.wait()
+
+    @callback
+    def async_update(self, available: int) -> None:
+        """Record that the first available bytes are on disk."""
+        self.available = available
+        self._wake()
+
+    @callback
+    def async_finish(self, error: BaseException | None = None) -> None:
+        """Mark the download as complete or failed."""
+        self.done = True
+        self.error = error
+        self._wake()
+
+    async def async_wait(self, position: int) -> int:
+        """Wait until position bytes are available or the download ended."""
+        while self.available < position and not self.done:
+            await self._changed.wait()
+        return self.available
+
+    async def async_throttle(self, nbytes: int) -> None:
+        """Charge nbytes against the bandwidth limit."""
+        if self.bucket is None:
+            return
+        if self.foreground:
+            self.bucket.async_spend(nbytes)
+        else:
+            await self.bucket.async_consume(nbytes, self._promoted)
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed.clear()
+
+
+class CacheIndex:
+    """Map source URLs to cached files, persisted across restarts.
+
+    The index also keeps the per-install secret that cache filenames are
+    derived from, so they cannot be computed from a URL or media-source ID.
+    """
+
+    def __init__(self, hass: HomeAssistant, cache_dir: Path) -> None:
+        self.hass = hass
+        self.cache_dir = cache_dir
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._secret: str | None = None
+        self._entries: dict[str, CacheEntry] = {}
+        self._by_filename: dict[str, CacheEntry] = {}
+        self._total_size = 0
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    @property
+    def total_size(self) -> int:
+        """Return the number of bytes used by cached files."""
+        return self._total_size
+
+    @property
+    def entry_count(self) -> int:
+        """Return the number of cached files."""
+        return len(self._entries)
+
+    def filename(self, key: str) -> str:
+        """Return the cache filename for key; the index must be loaded."""
+        assert self._secret is not None
+        return cache_filename(key, self._secret)
+
+    def digest(self, key: str) -> str:
+        """Return the keyed digest of key; the index must be loaded."""
+        assert self._secret is not None
+        return _digest(key, self._secret)
+
+    async def async_load(self) -> None:
+        """Load the stored index once and reconcile it against the cache dir."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load() or {}
+            secret = stored.get("secret")
+            if not isinstance(secret, str) or not secret:
+                secret = secrets.token_hex(32)
+                # Files of older versions lived in www/ under guessable names.
+                await asyncio.to_thread(
+                    shutil.rmtree, self.hass.config.path(LEGACY_CACHE_DIR), True
+                )
+            entries: dict[str, CacheEntry] = {}
+            for item in stored.get("entries", []):
+                try:
+                    entry = CacheEntry(**item)
+                except TypeError:
+                    continue
+                entries[entry.url] = entry
+
+            missing = await asyncio.to_thread(
+                _reconcile_cache_dir, self.cache_dir, entries
+            )
+            for url in missing:
+                entries.pop(url, None)
+            self._entries = entries
+            self._by_filename = {entry.filename: entry for entry in entries.values()}
+            self._total_size = sum(entry.size for entry in entries.values())
+            self._secret = secret
+            self._loaded = True
+            if missing:
+                _LOGGER.debug("Dropped %d stale cache index entries", len(missing))
+            if missing or secret != stored.get("secret"):
+                self._async_schedule_save()
+
+    @callback
+    def async_get(self, url: str) -> CacheEntry | None:
+        """Return the entry for url and mark it as recently used."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            entry.last_access = time.time()
+            self._async_schedule_save()
+        return entry
+
+    @callback
+    def async_add(self, entry: CacheEntry) -> CacheEntry | None:
+        """Record a newly cached file and return the entry it replaces."""
+        entry.last_access = entry.last_validated = time.time()
+        if (previous := self._entries.get(entry.url)) is not None:
+            self._total_size -= previous.size
+            if previous.filename != entry.filename:
+                self._by_filename.pop(previous.filename, None)
+        self._entries[entry.url] = entry
+        self._by_filename[entry.filename] = entry
+        self._total_size += entry.size
+        self._async_schedule_save()
+        return previous
+
+    @callback
+    def async_mark_validated(self, entry: CacheEntry) -> None:
+        """Record that the origin confirmed entry is still current."""
+        entry.last_validated = time.time()
+        self._async_schedule_save()
+
+    @callback
+    def async_faststarted(self, entry: CacheEntry, filename: str | None) -> None:
+        """Clear the pending rewrite of entry, moving it to filename if given."""
+        entry.faststart_pending = False
+        if filename is not None:
+            self._by_filename.pop(entry.filename, None)
+            entry.filename = filename
+            self._by_filename[filename] = entry
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, url: str) -> CacheEntry | None:
+        """Forget a cached file."""
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._by_filename.pop(entry.filename, None)
+            self._total_size -= entry.size
+            self._async_schedule_save()
+        return entry
+
+    def entry_for_filename(self, filename: str) -> CacheEntry | None:
+        """Return the entry stored under filename without touching it."""
+        return self._by_filename.get(filename)
+
+    def least_recently_used(self) -> Iterator[CacheEntry]:
+        """Iterate over entries, oldest access first."""
+        return iter(sorted(self._entries.values(), key=lambda item: item.last_access))
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "secret": self._secret,
+            "entries": [asdict(entry) for entry in self._entries.values()],
+        }
+
+
+class MediaCache:
+    """Integration-wide cache that downloads each URL once per host."""
+
+    def __init__(self, hass: HomeAssistant, cache_dir: Path) -> None:
+        self.hass = hass
+        self.cache_dir = cache_dir
+        self.index = CacheIndex(hass, cache_dir)
+        self._limits: dict[str, tuple[int, int]] = {}
+        self._bandwidth: dict[str, BandwidthPolicy] = {}
+        self.bucket = TokenBucket(self._current_rate)
+        self._prefetch_slots = asyncio.Semaphore(_PREFETCH_CONCURRENCY)
+        self._pinned: dict[str, str] = {}
+        self._downloads: dict[str, asyncio.Task[CacheEntry]] = {}
+        self._waiters: dict[str, int] = {}
+        self._revalidations: dict[str, asyncio.Task[None]] = {}
+        self._derivatives: dict[str, asyncio.Task[CacheEntry]] = {}
+        self._progress: dict[str, DownloadProgress] = {}
+        self._download_files: dict[str, str] = {}
+        self._claimed: set[str] = set()
+        self._faststarts: dict[str, asyncio.Task[None]] = {}
+        self._readers: dict[str, int] = {}
+        self._retired: dict[str, str | None] = {}
+        # Derivative keys, by source key, of images served as they are.
+        self._passthrough: dict[str, set[str]] = {}
+        self._sweep_unsub: Callable[[], None] | None = None
+
+    @property
+    def max_bytes(self) -> int:
+        """Return the tightest size quota of all registered players."""
+        return _tightest(limit[0] for limit in self._limits.values())
+
+    @property
+    def max_entries(self) -> int:
+        """Return the tightest entry quota of all registered players."""
+        return _tightest(limit[1] for limit in self._limits.values())
+
+    @callback
+    def async_register(
+        self,
+        owner: str,
+        max_bytes: int,
+        max_entries: int,
+        bandwidth: BandwidthPolicy | None = None,
+    ) -> Callable[[], None]:
+        """Register a config entry using the cache, its quota and bandwidth."""
+        self._limits[owner] = (max_bytes, max_entries)
+        if bandwidth is not None:
+            self._bandwidth[owner] = bandwidth
+        if self._sweep_unsub is None:
+            self._sweep_unsub = async_track_time_interval(
+                self.hass, self._async_sweep, CACHE_SWEEP_INTERVAL
+            )
+
+        @callback
+        def _unregister() -> None:
+            self._limits.pop(owner, None)
+            self._bandwidth.pop(owner, None)
+            if not self._limits and self._sweep_unsub is not None:
+                self._sweep_unsub()
+                self._sweep_unsub = None
+
+        return _unregister
+
+    @callback
+    def async_pin(self, owner: str, local_url: str | None) -> None:
+        """Protect the file a player is showing from eviction."""
+        if local_url is None:
+            self._pinned.pop(owner, None)
+        else:
+            self._pinned[owner] = local_url
+
+    async def async_cache_media(self, url: str, key: str | None = None) -> str:
+        """Return a local URL for url, downloading it if needed."""
+        return (await self.async_cache_entry(url, key)).local_url
+
+    async def async_cache_entry(
+        self,
+        url: str,
+        key: str | None = None,
+        background: bool = False,
+        queued: bool = True,
+    ) -> CacheEntry:
+        """Return the cache entry for url, downloading it if needed.
+
+        key identifies the content in the index and defaults to url; callers
+        pass a stable ID when url is a short-lived signed link. Background
+        downloads wait for a prefetch slot and are bandwidth-limited, while
+        foreground ones start at once and lift the limit from a background
+        download of the same file. Callers that bound their own concurrency
+        pass queued=False to skip the prefetch slots.
+        """
+        key = key or url
+        if (entry := await self._async_lookup(key)) is not None:
+            return entry
+        return await self._async_join(
+            key,
+            self._async_start_download(
+                key, url, foreground=not background, queued=queued
+            ),
+        )
+
+    async def async_cache_progressive(
+        self,
+        url: str,
+        key: str | None = None,
+        on_failure: Callable[[str, BaseException], None] | None = None,
+    ) -> str:
+        """Return a local URL for url as soon as playback can start.
+
+        On a miss the URL is returned once the first bytes are on disk; the
+        cache view streams the rest while the download continues. If the
+        download fails after that, on_failure is called with the local URL
+        and the error.
+        """
+        key = key or url
+        if (entry := await self._async_lookup(key)) is not None:
+            return entry.local_url
+
+        task = self._async_start_download(key, url)
+        filename = self._download_files.get(key)
+        if filename is not None and (progress := self._progress.get(filename)):
+            waiter = asyncio.ensure_future(progress.async_wait(1))
+            try:
+                await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            if not task.done() and progress.available > 0:
+                local_url = cache_url(filename)
+                if on_failure is not None:
+
+                    @callback
+                    def _async_done(task: asyncio.Task[CacheEntry]) -> None:
+                        if not task.cancelled() and (err := task.exception()):
+                            on_failure(local_url, err)
+
+                    task.add_done_callback(_async_done)
+                return local_url
+        return (await self._async_join(key, task)).local_url
+
+    @callback
+    def async_servable(self, filename: str) -> bool:
+        """Return True if filename is a cached file or an in-flight download.
+
+        Files replaced by a rewrite stay servable until nobody uses them.
+        """
+        return (
+            filename in self._progress
+            or filename in self._retired
+            or self.index.entry_for_filename(filename) is not None
+        )
+
+    @callback
+    def async_content_type(self, filename: str) -> str | None:
+        """Return the content type of a cached or replaced file."""
+        if (entry := self.index.entry_for_filename(filename)) is not None:
+            return entry.content_type
+        return self._retired.get(filename)
+
+    @callback
+    def async_open_reader(self, filename: str) -> Callable[[], None]:
+        """Count a request reading filename until the returned callable runs."""
+        self._readers[filename] = self._readers.get(filename, 0) + 1
+
+        @callback
+        def _release() -> None:
+            self._readers[filename] -= 1
+            if not self._readers[filename]:
+                del self._readers[filename]
+
+        return _release
+
+    @callback
+    def async_progress(self, filename: str) -> DownloadProgress | None:
+        """Return the progress of an in-flight download of filename."""
+        return self._progress.get(filename)
+
+    @property
+    def downloads_in_flight(self) -> int:
+        """Return the number of downloads currently running."""
+        return len(self._downloads)
+
+    @callback
+    def async_in_flight(self) -> list[dict[str, Any]]:
+        """Return the progress of every running download."""
+        return [
+            {
+                "filename": filename,
+                "size": progress.size,
+                "available": progress.available,
+                "readers": self._readers.get(filename, 0),
+            }
+            for filename, progress in self._progress.items()
+        ]
+
+    async def async_verify(self, local_url: str) -> bool:
+        """Return True if local_url is an indexed file of the indexed size.
+
+        Files only appear under their final name once complete, so the size
+        check catches truncation without hashing large files. A stale index
+        entry is dropped so the next request downloads the file again.
+        """
+        await self.index.async_load()
+        filename = urlparse(local_url).path.rsplit("/", 1)[-1]
+        if (entry := self.index.entry_for_filename(filename)) is None:
+            return False
+        try:
+            stat = await asyncio.to_thread(os.stat, self.cache_dir / filename)
+        except FileNotFoundError:
+            size = None
+        else:
+            size = stat.st_size
+        if size == entry.size:
+            return True
+        _LOGGER.debug(
+            "Cached file %s has %s bytes, expected %d", filename, size, entry.size
+        )
+        self.index.async_remove(entry.url)
+        self._passthrough.pop(entry.url, None)
+        return False
+
+    async def async_derivative(self, entry: CacheEntry, spec: ImageSpec) -> CacheEntry:
+        """Return a display-sized derivative of a cached image.
+
+        Derivatives are cache entries of their own, keyed on the original's
+        key, the spec and the original's version, so each is rendered once.
+        The original is returned when it already fits the spec.
+        """
+        # Without validators the download time tells refetched copies apart.
+        version = (
+            entry.etag
+            or entry.last_modified
+            or f"{entry.size}-{int(entry.last_validated)}"
+        )
+        key = spec.derivative_key(entry.url, version)
+        if key in self._passthrough.get(entry.url, ()):
+            return entry
+        if (derivative := self.index.async_get(key)) is not None:
+            return derivative
+
+        task = self._derivatives.get(key)
+        if task is None:
+            task = self.hass.async_create_task(
+                self._async_run_derivative(key, entry, spec),
+                f"{DOMAIN} derivative {key}",
+            )
+            self._derivatives[key] = task
+        return await asyncio.shield(task)
+
+    async def async_evict(self, keep: set[str] | None = None) -> int:
+        """Remove least recently used files until the cache fits the quota."""
+        max_bytes = self.max_bytes
+        max_entries = self.max_entries
+        protected = set(self._pinned.values()) | (keep or set())
+        total = self.index.total_size
+        count = self.index.entry_count
+        victims: list[CacheEntry] = []
+        for entry in self.index.least_recently_used():
+            over_size = max_bytes > 0 and total > max_bytes
+            over_count = max_entries > 0 and count > max_entries
+            if not over_size and not over_count:
+                break
+            if entry.local_url in protected:
+                continue
+            victims.append(entry)
+            total -= entry.size
+            count -= 1
+
+        if not victims:
+            return 0
+
+        for entry in victims:
+            self.index.async_remove(entry.url)
+            self._passthrough.pop(entry.url, None)
+        await asyncio.to_thread(
+            _remove_cache_files, self.cache_dir, [entry.filename for entry in victims]
+        )
+        _LOGGER.debug("Evicted %d cached files", len(victims))
+        async_dispatcher_send(self.hass, SIGNAL_CACHE_UPDATED)
+        return len(victims)
+
+    @callback
+    def _async_start_download(
+        self, key: str, url: str, foreground: bool = True, queued: bool = True
+    ) -> asyncio.Task[CacheEntry]:
+        """Return the download task for key, starting it if needed."""
+        if (task := self._downloads.get(key)) is not None:
+            _LOGGER.debug("Joining in-flight download of %s", key)
+            progress = self._download_progress(key)
+            if foreground and progress is not None:
+                progress.async_promote()
+            return task
+        filename = self._async_claim_filename(key)
+        progress = DownloadProgress(self.bucket, foreground)
+        self._download_files[key] = filename
+        self._progress[filename] = progress
+        task = self.hass.async_create_task(
+            self._async_run_download(key, url, filename, progress, queued),
+            f"{DOMAIN} download {key}",
+        )
+        task.add_done_callback(_log_download_failure)
+        self._downloads[key] = task
+        return task
+
+    async def _async_join(
+        self, key: str, task: asyncio.Task[CacheEntry]
+    ) -> CacheEntry:
+        """Wait for the download of key without cancelling it for others.
+
+        A background download is cancelled once every caller waiting for it
+        was cancelled, so cancelled preloads do not keep downloading.
+        """
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                progress = self._download_progress(key)
+                if not task.done() and progress is not None and not progress.foreground:
+                    _LOGGER.debug("Cancelling download of %s, nobody waits", key)
+                    task.cancel()
+
+    def _download_progress(self, key: str) -> DownloadProgress | None:
+        """Return the progress of the running download of key."""
+        if (filename := self._download_files.get(key)) is None:
+            return None
+        return self._progress.get(filename)
+
+    @callback
+    def _async_claim_filename(self, key: str) -> str:
+        """Return a filename for a new version of key that nothing uses.
+
+        The file of a live entry is never overwritten, because players and
+        clients may hold byte offsets into it. The claim is released once
+        the new file is indexed or discarded.
+        """
+        generation = 0
+        while True:
+            filename = self.index.filename(
+                f"{key}#{generation}" if generation else key
+            )
+            if (
+                filename not in self._claimed
+                and filename not in self._retired
+                and self.index.entry_for_filename(filename) is None
+                and not self._in_use(filename)
+            ):
+                self._claimed.add(filename)
+                return filename
+            generation += 1
+
+    async def _async_lookup(self, key: str) -> CacheEntry | None:
+        """Return the indexed entry for key and count the hit or miss."""
+        await self.index.async_load()
+        metrics = get_metrics(self.hass)
+        if (entry := self.index.async_get(key)) is None or _expired(entry):
+            metrics.cache_misses += 1
+            return None
+        metrics.cache_hits += 1
+        self._async_schedule_revalidation(entry)
+        self._async_schedule_faststart(entry)
+        return entry
+
+    async def _async_run_download(
+        self,
+        key: str,
+        url: str,
+        filename: str,
+        progress: DownloadProgress,
+        queued: bool = True,
+    ) -> CacheEntry:
+        metrics = get_metrics(self.hass)
+        slot = False
+        try:
+            if queued and not progress.foreground:
+                slot = await self._async_take_slot(progress)
+            started = time.monotonic()
+            entry = await self._async_download(key, url, filename, progress=progress)
+            assert entry is not None
+            metrics.async_record_download(entry.size, time.monotonic() - started)
+            if self._in_use(filename):
+                # Clients may still hold byte offsets into the streamed
+                # layout, so the rewrite waits until nobody uses the file.
+                entry.faststart_pending = _is_mp4(entry)
+            else:
+                await self._async_optimize(entry)
+            await self._async_add(entry)
+        except BaseException as err:
+            if isinstance(err, Exception):
+                metrics.downloads_failed += 1
+            progress.async_finish(err)
+            raise
+        finally:
+            if slot:
+                self._prefetch_slots.release()
+            self._downloads.pop(key, None)
+            self._download_files.pop(key, None)
+            self._progress.pop(filename, None)
+            self._claimed.discard(filename)
+        progress.async_finish()
+        await self.async_evict(keep={entry.local_url})
+        async_dispatcher_send(self.hass, SIGNAL_CACHE_UPDATED)
+        return entry
+
+    async def _async_take_slot(self, progress: DownloadProgress) -> bool:
+        """Wait for a prefetch slot or until the download is promoted.
+
+        Returns True if a slot was taken; the caller releases it.
+        """
+        acquire = asyncio.ensure_future(self._prefetch_slots.acquire())
+        promoted = asyncio.ensure_future(progress.async_wait_promoted())
+        try:
+            await asyncio.wait(
+                (acquire, promoted), return_when=asyncio.FIRST_COMPLETED
+            )
+        except asyncio.CancelledError:
+            promoted.cancel()
+            if not acquire.cancel():
+                self._prefetch_slots.release()
+            raise
+        promoted.cancel()
+        if acquire.done():
+            return True
+        # A cancelled acquire passes a slot it was just granted on.
+        acquire.cancel()
+        return False
+
+    async def _async_run_derivative(
+        self, key: str, entry: CacheEntry, spec: ImageSpec
+    ) -> CacheEntry:
+        try:
+            result = await self.hass.async_add_executor_job(
+                render_derivative,
+                self.cache_dir / entry.filename,
+                self.cache_dir,
+                self.index.digest(key),
+                spec,
+            )
+        except Exception:
+            # Corrupt, unsupported or oversized images are not retried.
+            self._passthrough.setdefault(entry.url, set()).add(key)
+            raise
+        finally:
+            self._derivatives.pop(key, None)
+        if result is None:
+            self._passthrough.setdefault(entry.url, set()).add(key)
+            return entry
+        filename, size, content_type = result
+        derivative = CacheEntry(
+            url=key, filename=filename, size=size, content_type=content_type
+        )
+        await self._async_add(derivative)
+        await self.async_evict(keep={derivative.local_url, entry.local_url})
+        async_dispatcher_send(self.hass, SIGNAL_CACHE_UPDATED)
+        return derivative
+
+    async def _async_add(self, entry: CacheEntry) -> None:
+        """Index entry and retire the file it replaces under another name."""
+        self._retired.pop(entry.filename, None)
+        if (previous := self.index.async_add(entry)) is None:
+            return
+        self._passthrough.pop(entry.url, None)
+        if previous.filename != entry.filename:
+            await self._async_retire(previous.filename, previous.content_type)
+
+    async def _async_retire(self, filename: str, content_type: str | None) -> None:
+        """Delete a replaced file, or keep serving it while it is in use."""
+        if self._in_use(filename):
+            self._retired[filename] = content_type
+            return
+        await asyncio.to_thread(_remove_cache_files, self.cache_dir, [filename])
+
+    def _in_use(self, filename: str) -> bool:
+        """Return True if a request reads filename or a player shows it."""
+        return filename in self._readers or cache_url(filename) in self._pinned.values()
+
+    async def _async_optimize(self, entry: CacheEntry) -> None:
+        """Rewrite MP4 files to fast-start layout so playback begins early."""
+        if not _is_mp4(entry):
+            return
+        try:
+            await self.hass.async_add_executor_job(
+                make_faststart, self.cache_dir / entry.filename
+            )
+        except (OSError, FastStartError) as err:
+            _LOGGER.debug("Leaving %s as downloaded: %s", entry.url, err)
+
+    @callback
+    def _async_schedule_faststart(self, entry: CacheEntry) -> None:
+        """Rewrite a streamed MP4 once no request or player uses it.
+
+        The result gets a new filename, so clients that still hold byte
+        offsets into the streamed layout keep reading the old file.
+        """
+        if (
+            not entry.faststart_pending
+            or entry.url in self._faststarts
+            or entry.url in self._downloads
+            or entry.url in self._revalidations
+            or self._in_use(entry.filename)
+        ):
+            return
+        target = self._async_claim_filename(entry.url)
+        self._faststarts[entry.url] = self.hass.async_create_background_task(
+            self._async_faststart(entry, target), f"{DOMAIN} faststart {entry.url}"
+        )
+
+    async def _async_faststart(self, entry: CacheEntry, target: str) -> None:
+        source = entry.filename
+        try:
+            rewritten = await self.hass.async_add_executor_job(
+                make_faststart, self.cache_dir / source, self.cache_dir / target
+            )
+        except (OSError, FastStartError) as err:
+            _LOGGER.debug("Leaving %s as downloaded: %s", entry.url, err)
+            rewritten = False
+        finally:
+            self._faststarts.pop(entry.url, None)
+
+        try:
+            if self.index.entry_for_filename(source) is not entry:
+                # Replaced or evicted while the rewrite ran.
+                if rewritten:
+                    await asyncio.to_thread(
+                        _remove_cache_files, self.cache_dir, [target]
+                    )
+                return
+            if not rewritten:
+                self.index.async_faststarted(entry, None)
+                return
+            self.index.async_faststarted(entry, target)
+        finally:
+            self._claimed.discard(target)
+        await self._async_retire(source, entry.content_type)
+        _LOGGER.debug("Moved %s to fast-start layout", entry.url)
+        async_dispatcher_send(self.hass, SIGNAL_CACHE_UPDATED)
+
+    @callback
+    def _async_schedule_revalidation(self, entry: CacheEntry) -> None:
+        """Check a cache hit against the origin without delaying playback."""
+        if not _can_revalidate(entry):
+            return
+        if time.time() - entry.last_validated < _REVALIDATE_INTERVAL:
+            return
+        if entry.url in self._revalidations or entry.url in self._downloads:
+            return
+        self._revalidations[entry.url] = self.hass.async_create_background_task(
+            self._async_revalidate(entry), f"{DOMAIN} revalidate {entry.url}"
+        )
+
+    async def _async_revalidate(self, entry: CacheEntry) -> None:
+        # A changed file gets a new name; the old one is retired once added.
+        filename = self._async_claim_filename(entry.url)
+        try:
+            try:
+                fresh = await self._async_download(
+                    entry.url,
+                    entry.url,
+                    filename,
+                    entry,
+                    progress=DownloadProgress(self.bucket, foreground=False),
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Revalidation of %s failed: %s", entry.url, err)
+                return
+            finally:
+                self._revalidations.pop(entry.url, None)
+
+            if fresh is None:
+                self.index.async_mark_validated(entry)
+                return
+
+            await self._async_optimize(fresh)
+            _LOGGER.debug("Refreshed cached copy of %s", entry.url)
+            await self._async_add(fresh)
+        finally:
+            self._claimed.discard(filename)
+        await self.async_evict(keep={fresh.local_url})
+        async_dispatcher_send(self.hass, SIGNAL_CACHE_UPDATED)
+
+    async def _async_download(
+        self,
+        key: str,
+        url: str,
+        filename: str,
+        cached: CacheEntry | None = None,
+        progress: DownloadProgress | None = None,
+    ) -> CacheEntry | None:
+        """Stream url into the cache directory as filename, the entry for key.
+
+        With a cached entry the request is conditional and None is returned
+        when the origin answers 304 Not Modified. progress is updated as
+        bytes arrive so the file can be served while it downloads.
+        """
+        if url.startswith("/"):
+            url = f"{get_url(self.hass)}{url}"
+        target = self.cache_dir / filename
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        await asyncio.to_thread(self.cache_dir.mkdir, parents=True, exist_ok=True)
+
+        session = async_get_clientsession(self.hass)
+        async with session.get(url, headers=headers) as resp:
+            if cached is not None and resp.status == HTTPStatus.NOT_MODIFIED:
+                return None
+            resp.raise_for_status()
+            if resp.content_type in _STREAMING_CONTENT_TYPES:
+                raise HomeAssistantError(f"Live stream {url} cannot be cached")
+            entry = CacheEntry(
+                url=key,
+                filename=filename,
+                size=resp.content_length or 0,
+                content_type=resp.content_type,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+            if progress is not None:
+                progress.size = entry.size or None
+                progress.content_type = entry.content_type
+            segmented = (
+                resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+                and entry.size >= _SEGMENTED_MIN_SIZE
+            )
+            if not segmented:
+                entry.size = await _async_stream_to_file(resp, target, progress)
+                return entry
+
+        await self._async_download_segments(entry, url, target, progress)
+        return entry
+
+    async def _async_download_segments(
+        self,
+        entry: CacheEntry,
+        url: str,
+        target: Path,
+        progress: DownloadProgress | None = None,
+    ) -> None:
+        """Fetch a large file as byte ranges over several connections.
+
+        Completed segments are recorded next to a partial file, so a failed
+        download resumes where it stopped on the next attempt as long as
+        the origin still serves the same version.
+        """
+        partial = target.with_name(f".{target.name}.partial")
+        state_path = partial.with_name(f"{partial.name}.json")
+        validator = _range_validator(entry)
+        opening = asyncio.ensure_future(
+            asyncio.to_thread(
+                _open_partial_download, partial, state_path, entry.size, validator
+            )
+        )
+        try:
+            done, fd = await asyncio.shield(opening)
+        except asyncio.CancelledError:
+            # Keep the partial file for the next attempt but not the fd.
+            _, fd = await opening
+            await asyncio.to_thread(os.close, fd)
+            raise
+        if done:
+            _LOGGER.debug(
+                "Resuming %s with %d segments already on disk", url, len(done)
+            )
+
+        @callback
+        def _async_report_progress() -> None:
+            if progress is None:
+                return
+            contiguous = 0
+            while contiguous in done:
+                contiguous += 1
+            progress.path = partial
+            progress.async_update(min(contiguous * _SEGMENT_SIZE, entry.size))
+
+        _async_report_progress()
+
+        session = async_get_clientsession(self.hass)
+        semaphore = asyncio.Semaphore(_SEGMENT_CONNECTIONS)
+
+        async def _async_fetch(index: int, start: int, end: int) -> None:
+            async with semaphore:
+                for attempt in range(1, _SEGMENT_ATTEMPTS + 1):
+                    try:
+                        await _async_fetch_segment(
+                            session, url, fd, start, end, validator, progress
+                        )
+                        break
+                    except aiohttp.ClientError:
+                        if attempt == _SEGMENT_ATTEMPTS:
+                            raise
+            done.add(index)
+            _async_report_progress()
+            await asyncio.to_thread(
+                _save_partial_state, state_path, entry.size, validator, sorted(done)
+            )
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for index, start in enumerate(range(0, entry.size, _SEGMENT_SIZE)):
+                    if index not in done:
+                        end = min(start + _SEGMENT_SIZE, entry.size) - 1
+                        group.create_task(_async_fetch(index, start, end))
+        except BaseException as err:
+            await asyncio.to_thread(os.close, fd)
+            if isinstance(err, ExceptionGroup):
+                if any(
+                    isinstance(exc, SegmentMismatchError) for exc in err.exceptions
+                ):
+                    await asyncio.to_thread(_discard_partial, partial, state_path)
+                raise err.exceptions[0] from err
+            raise
+
+        await asyncio.to_thread(os.close, fd)
+        await asyncio.to_thread(os.replace, partial, target)
+        await asyncio.to_thread(state_path.unlink, missing_ok=True)
+
+    @callback
+    def _current_rate(self) -> int:
+        """Return the tightest background bandwidth limit in force now."""
+        now = dt_util.now().time()
+        return _tightest(
+            policy.current_limit(now) for policy in self._bandwidth.values()
+        )
+
+    async def _async_sweep(self, _now) -> None:
+        """Periodically enforce the cache quota and finish deferred rewrites."""
+        await self.index.async_load()
+        if unused := [name for name in self._retired if not self._in_use(name)]:
+            for filename in unused:
+                del self._retired[filename]
+            await asyncio.to_thread(_remove_cache_files, self.cache_dir, unused)
+        await self.async_evict()
+        for entry in self.index.least_recently_used():
+            self._async_schedule_faststart(entry)
+
+
+@callback
+def get_media_cache(hass: HomeAssistant) -> MediaCache:
+    """Return the media cache shared by all players."""
+    data = hass.data.setdefault(DOMAIN, {})
+    cache: MediaCache | None = data.get(DATA_CACHE)
+    if cache is None:
+        cache = MediaCache(hass, Path(hass.config.path(CACHE_DIR)))
+        data[DATA_CACHE] = cache
+    return cache
+
+
+def cache_url(filename: str) -> str:
+    """Return the URL of the cache view serving filename."""
+    return f"{CACHE_VIEW_URL}/{filename}"
+
+
+def cache_filename(key: str, secret: str) -> str:
+    """Return the stable cache filename for a URL or media-source ID."""
+    suffix = Path(urlparse(key).path).suffix
+    if not _SUFFIX_RE.fullmatch(suffix):
+        suffix = ""
+    return f"{_digest(key, secret)}{suffix}"
+
+
+def _digest(key: str, secret: str) -> str:
+    return hmac.new(
+        secret.encode("utf-8"), key.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def _is_mp4(entry: CacheEntry) -> bool:
+    return (
+        entry.content_type in MP4_CONTENT_TYPES
+        or entry.filename.lower().endswith(_MP4_SUFFIXES)
+    )
+
+
+@callback
+def _log_download_failure(task: asyncio.Task[CacheEntry]) -> None:
+    """Retrieve the error of a download that nobody may be waiting for."""
+    if not task.cancelled() and (err := task.exception()) is not None:
+        _LOGGER.debug("%s failed: %s", task.get_name(), err)
+
+
+def _can_revalidate(entry: CacheEntry) -> bool:
+    """Return True if the origin of entry can answer a conditional request."""
+    return (entry.etag is not None or entry.last_modified is not None) and (
+        entry.url.startswith(("http://", "https://"))
+    )
+
+
+def _expired(entry: CacheEntry) -> bool:
+    """Return True if entry cannot be revalidated and is past its max age."""
+    return (
+        not _can_revalidate(entry)
+        and time.time() - entry.last_validated > _UNVALIDATED_MAX_AGE
+    )
+
+
+def _tightest(limits: Iterable[int]) -> int:
+    """Return the smallest non-zero limit, or 0 for unlimited."""
+    return min((limit for limit in limits if limit > 0), default=0)
+
+
+async def _async_stream_to_file(
+    resp, target: Path, progress: DownloadProgress | None = None
+) -> int:
+    """Write a response body to target in chunks, replacing it atomically."""
+    opening = asyncio.ensure_future(asyncio.to_thread(_open_temp_file, target))
+    try:
+        handle, temp_path = await asyncio.shield(opening)
+    except asyncio.CancelledError:
+        # The thread creates the file even when the download is cancelled.
+        handle, temp_path = await opening
+        await asyncio.to_thread(_discard_temp_file, handle, temp_path)
+        raise
+    if progress is not None:
+        progress.path = temp_path
+    size = 0
+    try:
+        async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+            await asyncio.to_thread(_write_chunk, handle, chunk)
+            size += len(chunk)
+            if progress is not None:
+                progress.async_update(size)
+                await progress.async_throttle(len(chunk))
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(os.replace, temp_path, target)
+    except BaseException:
+        await asyncio.to_thread(_discard_temp_file, handle, temp_path)
+        raise
+    return size
+
+
+def _write_chunk(handle, chunk: bytes) -> None:
+    """Write chunk and flush it so readers of the temp file can see it."""
+    handle.write(chunk)
+    handle.flush()
+
+
+def _open_temp_file(target: Path):
+    """Open a unique temporary file next to target for a streamed download."""
+    fd, temp_name = tempfile.mkstemp(
+        prefix=f".{target.name}.", suffix=".part", dir=target.parent
+    )
+    return os.fdopen(fd, "wb"), Path(temp_name)
+
+
+def _discard_temp_file(handle, temp_path: Path) -> None:
+    """Close and remove a partially written download."""
+    handle.close()
+    temp_path.unlink(missing_ok=True)
+
+
+def _reconcile_cache_dir(cache_dir: Path, entries: dict[str, CacheEntry]) -> list[str]:
+    """Return URLs whose files are gone and remove files the index does not know."""
+    if not cache_dir.is_dir():
+        return list(entries)
+
+    known = {entry.filename for entry in entries.values()}
+    stale_before = time.time() - _PARTIAL_MAX_AGE
+    for path in cache_dir.iterdir():
+        if not path.is_file() or path.name in known:
+            continue
+        if path.name.endswith((".partial", ".partial.json")):
+            if path.stat().st_mtime >= stale_before:
+                continue
+        path.unlink(missing_ok=True)
+
+    missing = []
+    for url, entry in entries.items():
+        try:
+            size = (cache_dir / entry.filename).stat().st_size
+        except OSError:
+            missing.append(url)
+            continue
+        if size != entry.size:
+            missing.append(url)
+    return missing
+
+
+def _range_validator(entry: CacheEntry) -> str | None:
+    """Return a validator usable in If-Range, which rejects weak ETags."""
+    if entry.etag and not entry.etag.startswith("W/"):
+        return entry.etag
+    return entry.last_modified
+
+
+async def _async_fetch_segment(
+    session: aiohttp.ClientSession,
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    validator: str | None,
+    progress: DownloadProgress | None = None,
+) -> None:
+    """Download bytes start..end of url into fd at the same offset."""
+    headers = {"Range": f"bytes={start}-{end}"}
+    if validator:
+        headers["If-Range"] = validator
+    async with session.get(url, headers=headers) as resp:
+        resp.raise_for_status()
+        if resp.status != HTTPStatus.PARTIAL_CONTENT:
+            raise SegmentMismatchError(f"{url} changed during a segmented download")
+        offset = start
+        async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+            await asyncio.to_thread(os.pwrite, fd, chunk, offset)
+            offset += len(chunk)
+            if progress is not None:
+                await progress.async_throttle(len(chunk))
+    if offset != end + 1:
+        raise aiohttp.ClientPayloadError(
+            f"Short segment {start}-{end} from {url}: got {offset - start} bytes"
+        )
+
+
+def _open_partial_download(
+    partial: Path, state_path: Path, size: int, validator: str | None
+) -> tuple[set[int], int]:
+    """Open the partial file and return the segments already completed."""
+    done: set[int] = set()
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = None
+    if (
+        isinstance(state, dict)
+        and state.get("size") == size
+        and state.get("validator") == validator
+        and validator is not None
+        and partial.exists()
+    ):
+        done = set(state.get("done", []))
+    else:
+        partial.unlink(missing_ok=True)
+
+    fd = os.open(partial, os.O_RDWR | os.O_CREAT, 0o644)
+    os.ftruncate(fd, size)
+    if not done:
+        _save_partial_state(state_path, size, validator, [])
+    return done, fd
+
+
+def _save_partial_state(
+    state_path: Path, size: int, validator: str | None, done: list[int]
+) -> None:
+    temp_path = state_path.with_name(f"{state_path.name}.tmp")
+    temp_path.write_text(
+        json.dumps({"size": size, "validator": validator, "done": done}),
+        encoding="utf-8",
+    )
+    os.replace(temp_path, state_path)
+
+
+def _discard_partial(partial: Path, state_path: Path) -> None:
+    partial.unlink(missing_ok=True)
+    state_path.unlink(missing_ok=True)
+
+
+def _remove_cache_files(cache_dir: Path, filenames: list[str]) -> None:
+    for filename in filenames:
+        (cache_dir / filename).unlink(missing_ok=True)
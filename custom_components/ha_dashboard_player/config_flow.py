@@ -7,19 +7,52 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, selector
 from homeassistant.util import slugify as ha_slugify
 
 from .const import (
+    DEFAULT_BANDWIDTH_LIMIT,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_MAX_SIZE,
     DEFAULT_ENABLE_CACHE,
+    DEFAULT_FEEDBACK_TIMEOUT,
+    DEFAULT_IMAGE_FORMAT,
+    DEFAULT_IMAGE_MAX_HEIGHT,
+    DEFAULT_IMAGE_MAX_WIDTH,
+    DEFAULT_IMAGE_QUALITY,
+    DEFAULT_METRICS_SENSORS,
     DEFAULT_NAME,
+    DEFAULT_RESOLVE_CACHE_TTL,
     DEFAULT_RESTORE_LAST_MEDIA,
+    DEFAULT_SYNC_TOLERANCE,
     DOMAIN,
+    CONF_BANDWIDTH_LIMIT,
+    CONF_CACHE_MAX_ENTRIES,
+    CONF_CACHE_MAX_SIZE,
     CONF_ENABLE_CACHE,
+    CONF_FEEDBACK_TIMEOUT,
+    CONF_FULL_SPEED_END,
+    CONF_FULL_SPEED_START,
+    CONF_IMAGE_FORMAT,
+    CONF_IMAGE_MAX_HEIGHT,
+    CONF_IMAGE_MAX_WIDTH,
+    CONF_IMAGE_QUALITY,
+    CONF_METRICS_SENSORS,
+    CONF_RESOLVE_CACHE_TTL,
     CONF_RESTORE_LAST_MEDIA,
+    CONF_SYNC_MEMBERS,
+    CONF_SYNC_TOLERANCE,
+    IMAGE_FORMATS,
 )
 
 
+_CACHE_LIMIT = vol.All(vol.Coerce(int), vol.Range(min=0))
+_FEEDBACK_TIMEOUT = vol.All(vol.Coerce(float), vol.Range(min=1, max=60))
+_SYNC_TOLERANCE = vol.All(vol.Coerce(float), vol.Range(min=0.05, max=2))
+_IMAGE_QUALITY = vol.All(vol.Coerce(int), vol.Range(min=1, max=100))
+_BANDWIDTH_LIMIT = vol.All(vol.Coerce(float), vol.Range(min=0))
+
+
 class HADashboardPlayerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow."""
 
@@ -42,6 +75,10 @@ class HADashboardPlayerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_NAME: sanitized_name,
                     CONF_ENABLE_CACHE: user_input[CONF_ENABLE_CACHE],
                     CONF_RESTORE_LAST_MEDIA: user_input[CONF_RESTORE_LAST_MEDIA],
+                    CONF_CACHE_MAX_SIZE: user_input[CONF_CACHE_MAX_SIZE],
+                    CONF_CACHE_MAX_ENTRIES: user_input[CONF_CACHE_MAX_ENTRIES],
+                    CONF_RESOLVE_CACHE_TTL: user_input[CONF_RESOLVE_CACHE_TTL],
+                    CONF_FEEDBACK_TIMEOUT: user_input[CONF_FEEDBACK_TIMEOUT],
                 },
             )
 
@@ -52,6 +89,18 @@ class HADashboardPlayerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(
                     CONF_RESTORE_LAST_MEDIA, default=DEFAULT_RESTORE_LAST_MEDIA
                 ): cv.boolean,
+                vol.Optional(
+                    CONF_CACHE_MAX_SIZE, default=DEFAULT_CACHE_MAX_SIZE
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_CACHE_MAX_ENTRIES, default=DEFAULT_CACHE_MAX_ENTRIES
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_RESOLVE_CACHE_TTL, default=DEFAULT_RESOLVE_CACHE_TTL
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_FEEDBACK_TIMEOUT, default=DEFAULT_FEEDBACK_TIMEOUT
+                ): _FEEDBACK_TIMEOUT,
             }
         )
 
@@ -94,6 +143,108 @@ class HADashboardPlayerOptionsFlow(config_entries.OptionsFlow):
                         ),
                     ),
                 ): cv.boolean,
+                vol.Optional(
+                    CONF_CACHE_MAX_SIZE,
+                    default=self._config_entry.options.get(
+                        CONF_CACHE_MAX_SIZE,
+                        self._config_entry.data.get(
+                            CONF_CACHE_MAX_SIZE, DEFAULT_CACHE_MAX_SIZE
+                        ),
+                    ),
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_CACHE_MAX_ENTRIES,
+                    default=self._config_entry.options.get(
+                        CONF_CACHE_MAX_ENTRIES,
+                        self._config_entry.data.get(
+                            CONF_CACHE_MAX_ENTRIES, DEFAULT_CACHE_MAX_ENTRIES
+                        ),
+                    ),
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_RESOLVE_CACHE_TTL,
+                    default=self._config_entry.options.get(
+                        CONF_RESOLVE_CACHE_TTL,
+                        self._config_entry.data.get(
+                            CONF_RESOLVE_CACHE_TTL, DEFAULT_RESOLVE_CACHE_TTL
+                        ),
+                    ),
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_FEEDBACK_TIMEOUT,
+                    default=self._config_entry.options.get(
+                        CONF_FEEDBACK_TIMEOUT,
+                        self._config_entry.data.get(
+                            CONF_FEEDBACK_TIMEOUT, DEFAULT_FEEDBACK_TIMEOUT
+                        ),
+                    ),
+                ): _FEEDBACK_TIMEOUT,
+                vol.Optional(
+                    CONF_SYNC_MEMBERS,
+                    default=self._config_entry.options.get(CONF_SYNC_MEMBERS, []),
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain="media_player", integration=DOMAIN, multiple=True
+                    )
+                ),
+                vol.Optional(
+                    CONF_SYNC_TOLERANCE,
+                    default=self._config_entry.options.get(
+                        CONF_SYNC_TOLERANCE, DEFAULT_SYNC_TOLERANCE
+                    ),
+                ): _SYNC_TOLERANCE,
+                vol.Optional(
+                    CONF_IMAGE_MAX_WIDTH,
+                    default=self._config_entry.options.get(
+                        CONF_IMAGE_MAX_WIDTH, DEFAULT_IMAGE_MAX_WIDTH
+                    ),
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_IMAGE_MAX_HEIGHT,
+                    default=self._config_entry.options.get(
+                        CONF_IMAGE_MAX_HEIGHT, DEFAULT_IMAGE_MAX_HEIGHT
+                    ),
+                ): _CACHE_LIMIT,
+                vol.Optional(
+                    CONF_IMAGE_FORMAT,
+                    default=self._config_entry.options.get(
+                        CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT
+                    ),
+                ): vol.In(IMAGE_FORMATS),
+                vol.Optional(
+                    CONF_IMAGE_QUALITY,
+                    default=self._config_entry.options.get(
+                        CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY
+                    ),
+                ): _IMAGE_QUALITY,
+                vol.Optional(
+                    CONF_METRICS_SENSORS,
+                    default=self._config_entry.options.get(
+                        CONF_METRICS_SENSORS, DEFAULT_METRICS_SENSORS
+                    ),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_BANDWIDTH_LIMIT,
+                    default=self._config_entry.options.get(
+                        CONF_BANDWIDTH_LIMIT, DEFAULT_BANDWIDTH_LIMIT
+                    ),
+                ): _BANDWIDTH_LIMIT,
+                vol.Optional(
+                    CONF_FULL_SPEED_START,
+                    description={
+                        "suggested_value": self._config_entry.options.get(
+                            CONF_FULL_SPEED_START
+                        )
+                    },
+                ): selector.TimeSelector(),
+                vol.Optional(
+                    CONF_FULL_SPEED_END,
+                    description={
+                        "suggested_value": self._config_entry.options.get(
+                            CONF_FULL_SPEED_END
+                        )
+                    },
+                ): selector.TimeSelector(),
             }
         )
 
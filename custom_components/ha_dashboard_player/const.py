@@ -1,29 +1,99 @@
 """Constants for HA Dashboard Player."""
 
+from datetime import timedelta
+
 from homeassistant.const import Platform
 
 DOMAIN = "ha_dashboard_player"
-PLATFORMS = [Platform.MEDIA_PLAYER]
+PLATFORMS = [Platform.MEDIA_PLAYER, Platform.SENSOR]
 
 CONF_NAME = "name"
 CONF_ENABLE_CACHE = "enable_cache"
 CONF_RESTORE_LAST_MEDIA = "restore_last_media"
+CONF_CACHE_MAX_SIZE = "cache_max_size"
+CONF_CACHE_MAX_ENTRIES = "cache_max_entries"
+CONF_RESOLVE_CACHE_TTL = "resolve_cache_ttl"
+CONF_FEEDBACK_TIMEOUT = "feedback_timeout"
+CONF_SYNC_MEMBERS = "sync_members"
+CONF_SYNC_TOLERANCE = "sync_tolerance"
+CONF_IMAGE_MAX_WIDTH = "image_max_width"
+CONF_IMAGE_MAX_HEIGHT = "image_max_height"
+CONF_IMAGE_FORMAT = "image_format"
+CONF_IMAGE_QUALITY = "image_quality"
+CONF_METRICS_SENSORS = "metrics_sensors"
+CONF_BANDWIDTH_LIMIT = "bandwidth_limit"
+CONF_FULL_SPEED_START = "full_speed_start"
+CONF_FULL_SPEED_END = "full_speed_end"
 
 DEFAULT_NAME = "Dashboard Player"
 DEFAULT_ENABLE_CACHE = False
 DEFAULT_RESTORE_LAST_MEDIA = True
+DEFAULT_CACHE_MAX_SIZE = 2048
+DEFAULT_CACHE_MAX_ENTRIES = 0
+DEFAULT_RESOLVE_CACHE_TTL = 300
+DEFAULT_FEEDBACK_TIMEOUT = 3.0
+DEFAULT_SYNC_TOLERANCE = 0.2
+DEFAULT_IMAGE_MAX_WIDTH = 1920
+DEFAULT_IMAGE_MAX_HEIGHT = 1080
+DEFAULT_IMAGE_FORMAT = "original"
+DEFAULT_IMAGE_QUALITY = 85
+DEFAULT_METRICS_SENSORS = False
+DEFAULT_BANDWIDTH_LIMIT = 0
+IMAGE_FORMATS = ["original", "jpeg", "webp"]
+DEFAULT_PRELOAD_CONCURRENCY = 3
+MAX_PRELOAD_CONCURRENCY = 16
+PLAYLIST_PREFETCH_COUNT = 2
+DEFAULT_SLIDESHOW_INTERVAL = 10
+SLIDESHOW_ORDERS = ["sequential", "shuffle"]
+DEFAULT_PROFILE_DURATION = 30
+MAX_PROFILE_DURATION = 600
+PROFILE_MODES = ["sampling", "cprofile"]
+
+CACHE_DIR = ".cache/ha_dashboard_player"
+LEGACY_CACHE_DIR = "www/ha-dashboard-player/cache"
+CACHE_VIEW_URL = f"/api/{DOMAIN}/cache"
+
+DATA_CACHE = "cache"
+DATA_METRICS = "metrics"
+DATA_PLAYERS = "players"
+DATA_PROFILING = "profiling"
+DATA_WATCHDOG = "watchdog"
+
+SIGNAL_CACHE_UPDATED = f"{DOMAIN}_cache_updated"
+SIGNAL_PLAYER_COMMAND = f"{DOMAIN}_command_{{}}"
+
+WS_TYPE_REPORT_STATE = f"{DOMAIN}/report_state"
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+
+CACHE_SWEEP_INTERVAL = timedelta(hours=1)
 
 ATTR_MEDIA_URL = "media_url"
 ATTR_CACHED_MEDIA_URL = "cached_media_url"
 ATTR_CACHE_ENABLED = "cache_enabled"
+ATTR_CACHE_SIZE = "cache_size"
+ATTR_CACHE_ENTRIES = "cache_entries"
 ATTR_LAST_ERROR = "last_error"
+ATTR_PRELOAD_PROGRESS = "preload_progress"
+ATTR_QUEUE_POSITION = "queue_position"
+ATTR_QUEUE_SIZE = "queue_size"
+ATTR_NEXT_MEDIA_URL = "next_media_url"
+ATTR_NEXT_MEDIA_CONTENT_TYPE = "next_media_content_type"
+ATTR_SLIDESHOW_INTERVAL = "slideshow_interval"
 ATTR_INTEGRATION = "ha_dashboard_player"
 
 SERVICE_PRELOAD_MEDIA = "preload_media"
+SERVICE_PRELOAD_MEDIA_BATCH = "preload_media_batch"
+SERVICE_CANCEL_PRELOAD = "cancel_preload"
+SERVICE_CLEAR_RESOLVE_CACHE = "clear_resolve_cache"
 SERVICE_CLEAR_SCREEN = "clear_screen"
 SERVICE_REPORT_STATE = "report_state"
+SERVICE_START_SLIDESHOW = "start_slideshow"
+SERVICE_MEDIA_ENDED = "media_ended"
+SERVICE_PROFILE = "profile"
 
 SERVICE_FIELD_MEDIA_URL = "media_url"
+SERVICE_FIELD_MEDIA_URLS = "media_urls"
+SERVICE_FIELD_CONCURRENCY = "concurrency"
 SERVICE_FIELD_STATE = "state"
 SERVICE_FIELD_MEDIA_POSITION = "media_position"
 SERVICE_FIELD_MEDIA_DURATION = "media_duration"
@@ -31,3 +101,9 @@ SERVICE_FIELD_VOLUME_LEVEL = "volume_level"
 SERVICE_FIELD_IS_VOLUME_MUTED = "is_volume_muted"
 SERVICE_FIELD_REPEAT = "repeat"
 SERVICE_FIELD_SHUFFLE = "shuffle"
+SERVICE_FIELD_MEDIA_CONTENT_ID = "media_content_id"
+SERVICE_FIELD_QUEUE_POSITION = "queue_position"
+SERVICE_FIELD_INTERVAL = "interval"
+SERVICE_FIELD_ORDER = "order"
+SERVICE_FIELD_DURATION = "duration"
+SERVICE_FIELD_MODE = "mode"
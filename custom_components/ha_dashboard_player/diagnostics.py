@@ -0,0 +1,57 @@
+"""Diagnostics support for HA Dashboard Player."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    ATTR_CACHED_MEDIA_URL,
+    ATTR_MEDIA_URL,
+    ATTR_NEXT_MEDIA_URL,
+    DATA_CACHE,
+    DOMAIN,
+)
+from .metrics import get_metrics
+
+# Resolved URLs may carry signed tokens.
+TO_REDACT = {ATTR_MEDIA_URL, ATTR_CACHED_MEDIA_URL, ATTR_NEXT_MEDIA_URL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "media_player", DOMAIN, f"{DOMAIN}_{entry.entry_id}"
+    )
+    state = hass.states.get(entity_id) if entity_id else None
+    metrics = get_metrics(hass)
+
+    diagnostics: dict[str, Any] = {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "entity_id": entity_id,
+        "state": (
+            {
+                "state": state.state,
+                "attributes": async_redact_data(dict(state.attributes), TO_REDACT),
+            }
+            if state
+            else None
+        ),
+        "metrics": metrics.as_dict(),
+    }
+
+    if (cache := hass.data.get(DOMAIN, {}).get(DATA_CACHE)) is not None:
+        diagnostics["cache"] = {
+            "total_size": cache.index.total_size,
+            "entry_count": cache.index.entry_count,
+            "max_bytes": cache.max_bytes,
+            "max_entries": cache.max_entries,
+            "downloads_in_flight": cache.async_in_flight(),
+        }
+    return diagnostics
@@ -0,0 +1,145 @@
+"""Move the moov atom of cached MP4 files in front of the media data."""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import BinaryIO
+
+_LOGGER = logging.getLogger(__name__)
+
+MP4_CONTENT_TYPES = {"video/mp4", "video/quicktime", "video/x-m4v", "audio/mp4"}
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+_MAX_MOOV_SIZE = 64 * 1024 * 1024
+# Atoms that only contain other atoms on the way to the chunk offset tables.
+_CONTAINER_ATOMS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+
+class FastStartError(Exception):
+    """The file cannot be rewritten into fast-start layout."""
+
+
+def make_faststart(path: Path, target: Path | None = None) -> bool:
+    """Rewrite path so that moov precedes mdat.
+
+    Returns True if the file was rewritten and False if it already was
+    fast-start or is not a plain MP4 (fragmented, compressed header). Runs
+    in the executor. The result atomically replaces target, which defaults
+    to path; path itself is left alone when a different target is given.
+    """
+    target = target or path
+    with open(path, "rb") as source:
+        atoms = _read_top_level_atoms(source)
+        names = [name for name, _, _ in atoms]
+        if b"moov" not in names or b"mdat" not in names or b"moof" in names:
+            return False
+        moov_index = names.index(b"moov")
+        mdat_index = names.index(b"mdat")
+        if moov_index < mdat_index:
+            return False
+
+        _, moov_start, moov_size = atoms[moov_index]
+        if moov_size > _MAX_MOOV_SIZE:
+            raise FastStartError(f"moov atom of {moov_size} bytes is too large")
+        insert_at = atoms[mdat_index][1]
+        source.seek(moov_start)
+        moov = bytearray(source.read(moov_size))
+        _patch_chunk_offsets(moov, 0, len(moov), insert_at, moov_start, moov_size)
+
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f".{target.name}.", suffix=".part", dir=target.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as output:
+                _copy_range(source, output, 0, insert_at)
+                output.write(moov)
+                _copy_range(source, output, insert_at, moov_start - insert_at)
+                end = moov_start + moov_size
+                source.seek(0, os.SEEK_END)
+                _copy_range(source, output, end, source.tell() - end)
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    _LOGGER.debug("Moved %d byte moov atom to the front of %s", moov_size, target.name)
+    return True
+
+
+def _read_top_level_atoms(source: BinaryIO) -> list[tuple[bytes, int, int]]:
+    """Return (type, offset, size) of every top-level atom."""
+    source.seek(0, os.SEEK_END)
+    file_size = source.tell()
+    atoms = []
+    offset = 0
+    while offset + 8 <= file_size:
+        source.seek(offset)
+        size, name = struct.unpack(">I4s", source.read(8))
+        if size == 1:
+            (size,) = struct.unpack(">Q", source.read(8))
+        elif size == 0:
+            size = file_size - offset
+        if size < 8 or offset + size > file_size:
+            raise FastStartError(f"Truncated or corrupt {name!r} atom at {offset}")
+        atoms.append((name, offset, size))
+        offset += size
+    return atoms
+
+
+def _patch_chunk_offsets(
+    moov: bytearray,
+    start: int,
+    end: int,
+    insert_at: int,
+    moov_start: int,
+    moov_size: int,
+) -> None:
+    """Shift stco/co64 entries that point between insert_at and the old moov."""
+    offset = start
+    while offset + 8 <= end:
+        size, name = struct.unpack_from(">I4s", moov, offset)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", moov, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise FastStartError(f"Corrupt {name!r} atom inside moov")
+
+        if name == b"cmov":
+            raise FastStartError("Compressed moov atoms are not supported")
+        if name in _CONTAINER_ATOMS:
+            _patch_chunk_offsets(
+                moov, offset + header, offset + size, insert_at, moov_start, moov_size
+            )
+        elif name in (b"stco", b"co64"):
+            wide = name == b"co64"
+            fmt, width = (">Q", 8) if wide else (">I", 4)
+            (count,) = struct.unpack_from(">I", moov, offset + header + 4)
+            table = offset + header + 8
+            if table + count * width > offset + size:
+                raise FastStartError(f"Corrupt {name!r} table")
+            for position in range(table, table + count * width, width):
+                (chunk,) = struct.unpack_from(fmt, moov, position)
+                if insert_at <= chunk < moov_start:
+                    chunk += moov_size
+                    if not wide and chunk > 0xFFFFFFFF:
+                        raise FastStartError("Chunk offset overflows stco")
+                    struct.pack_into(fmt, moov, position, chunk)
+        offset += size
+
+
+def _copy_range(source: BinaryIO, target: BinaryIO, start: int, length: int) -> None:
+    source.seek(start)
+    remaining = length
+    while remaining > 0:
+        chunk = source.read(min(_COPY_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise FastStartError("Unexpected end of file")
+        target.write(chunk)
+        remaining -= len(chunk)
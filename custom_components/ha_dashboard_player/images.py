@@ -0,0 +1,121 @@
+"""Display-sized image derivatives for the media cache."""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pillow save format, content type and file suffix per derivative format.
+_FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "png": ("PNG", "image/png", ".png"),
+}
+_ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+_EXIF_ORIENTATION = 0x0112
+
+
+@dataclass(frozen=True)
+class ImageSpec:
+    """Target size and encoding of image derivatives."""
+
+    max_width: int
+    max_height: int
+    format: str
+    quality: int
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if derivatives should be generated at all."""
+        return self.max_width > 0 or self.max_height > 0 or self.format != "original"
+
+    def derivative_key(self, key: str, version: str) -> str:
+        """Return the cache key of the derivative of key at version."""
+        return (
+            f"{key}#derivative={self.max_width}x{self.max_height}"
+            f",{self.format},q{self.quality},{version}"
+        )
+
+    def filename(self, stem: str, source_format: str) -> str:
+        """Return the cache filename, with a suffix matching the encoding."""
+        fmt = source_format if self.format == "original" else self.format
+        return f"{stem}{_FORMATS[fmt][2]}"
+
+
+def render_derivative(
+    source: Path, cache_dir: Path, stem: str, spec: ImageSpec
+) -> tuple[str, int, str] | None:
+    """Write a display-sized copy of source into cache_dir as stem.
+
+    Returns (filename, size, content_type), or None when the original can be
+    served as is: it already fits and needs no re-encoding, or it is animated
+    or in a format that is not re-encoded. Runs in the executor.
+    """
+    from PIL import Image, ImageOps  # pylint: disable=import-outside-toplevel
+
+    with Image.open(source) as original:
+        if getattr(original, "is_animated", False):
+            return None
+        source_format = (original.format or "").lower()
+        fmt = source_format if spec.format == "original" else spec.format
+        if fmt not in _FORMATS:
+            return None
+
+        limit = (spec.max_width or 1 << 16, spec.max_height or 1 << 16)
+        orientation = original.getexif().get(_EXIF_ORIENTATION, 1)
+        width, height = original.size
+        if orientation in _ROTATED_ORIENTATIONS:
+            width, height = height, width
+        if (
+            width <= limit[0]
+            and height <= limit[1]
+            and fmt == source_format
+            and orientation == 1
+        ):
+            return None
+
+        # Let the JPEG decoder downscale by a power of two while decoding.
+        draft_limit = limit[::-1] if orientation in _ROTATED_ORIENTATIONS else limit
+        original.draft("RGB", draft_limit)
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail(limit, Image.Resampling.LANCZOS)
+
+        pil_format, content_type, _ = _FORMATS[fmt]
+        options: dict = {}
+        if icc_profile := original.info.get("icc_profile"):
+            options["icc_profile"] = icc_profile
+        if pil_format == "JPEG":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            options.update(quality=spec.quality, optimize=True, progressive=True)
+        elif pil_format == "WEBP":
+            options.update(quality=spec.quality, method=4)
+
+        filename = spec.filename(stem, source_format)
+        target = cache_dir / filename
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f".{filename}.", suffix=".part", dir=cache_dir
+        )
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                image.save(handle, pil_format, **options)
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    size = target.stat().st_size
+    _LOGGER.debug(
+        "Rendered %dx%d %s derivative of %s (%d bytes)",
+        image.width,
+        image.height,
+        fmt,
+        source.name,
+        size,
+    )
+    return filename, size, content_type
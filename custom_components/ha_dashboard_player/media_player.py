@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import json
 import logging
-import hashlib
 import math
+import time
 from datetime import datetime, timezone
-from pathlib import Path
+from functools import partial
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 import voluptuous as vol
 
 from homeassistant.components.media_player import BrowseMedia, MediaPlayerEntity
 from homeassistant.components.media_player.const import (
+    ATTR_MEDIA_ENQUEUE,
+    MediaPlayerEnqueue,
     MediaPlayerEntityFeature,
     MediaPlayerState,
 )
@@ -25,29 +29,72 @@ from homeassistant.components.media_source import (
 )
 from homeassistant.components.media_player import async_process_play_media_url
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers import config_validation as cv
 
+from .cache import CacheEntry, get_media_cache
 from .const import (
     ATTR_CACHE_ENABLED,
+    ATTR_CACHE_ENTRIES,
+    ATTR_CACHE_SIZE,
     ATTR_CACHED_MEDIA_URL,
     ATTR_INTEGRATION,
     ATTR_LAST_ERROR,
     ATTR_MEDIA_URL,
+    ATTR_NEXT_MEDIA_CONTENT_TYPE,
+    ATTR_NEXT_MEDIA_URL,
+    ATTR_PRELOAD_PROGRESS,
+    ATTR_QUEUE_POSITION,
+    ATTR_QUEUE_SIZE,
+    ATTR_SLIDESHOW_INTERVAL,
+    CACHE_VIEW_URL,
     CONF_ENABLE_CACHE,
+    CONF_FEEDBACK_TIMEOUT,
+    CONF_IMAGE_FORMAT,
+    CONF_IMAGE_MAX_HEIGHT,
+    CONF_IMAGE_MAX_WIDTH,
+    CONF_IMAGE_QUALITY,
     CONF_NAME,
+    CONF_RESOLVE_CACHE_TTL,
     CONF_RESTORE_LAST_MEDIA,
+    CONF_SYNC_MEMBERS,
+    CONF_SYNC_TOLERANCE,
+    DATA_PLAYERS,
     DEFAULT_ENABLE_CACHE,
+    DEFAULT_FEEDBACK_TIMEOUT,
+    DEFAULT_IMAGE_FORMAT,
+    DEFAULT_IMAGE_MAX_HEIGHT,
+    DEFAULT_IMAGE_MAX_WIDTH,
+    DEFAULT_IMAGE_QUALITY,
     DEFAULT_NAME,
+    DEFAULT_PRELOAD_CONCURRENCY,
+    DEFAULT_RESOLVE_CACHE_TTL,
     DEFAULT_RESTORE_LAST_MEDIA,
+    DEFAULT_SLIDESHOW_INTERVAL,
+    DEFAULT_SYNC_TOLERANCE,
     DOMAIN,
+    MAX_PRELOAD_CONCURRENCY,
+    PLAYLIST_PREFETCH_COUNT,
+    SERVICE_CANCEL_PRELOAD,
+    SERVICE_CLEAR_RESOLVE_CACHE,
     SERVICE_CLEAR_SCREEN,
+    SERVICE_MEDIA_ENDED,
     SERVICE_REPORT_STATE,
+    SERVICE_START_SLIDESHOW,
+    SERVICE_FIELD_CONCURRENCY,
+    SERVICE_FIELD_INTERVAL,
+    SERVICE_FIELD_MEDIA_CONTENT_ID,
     SERVICE_FIELD_MEDIA_URL,
+    SERVICE_FIELD_MEDIA_URLS,
+    SERVICE_FIELD_ORDER,
+    SERVICE_FIELD_QUEUE_POSITION,
     SERVICE_FIELD_STATE,
     SERVICE_FIELD_MEDIA_POSITION,
     SERVICE_FIELD_MEDIA_DURATION,
@@ -56,10 +103,33 @@ from .const import (
     SERVICE_FIELD_REPEAT,
     SERVICE_FIELD_SHUFFLE,
     SERVICE_PRELOAD_MEDIA,
+    SERVICE_PRELOAD_MEDIA_BATCH,
+    SIGNAL_CACHE_UPDATED,
+    SIGNAL_PLAYER_COMMAND,
+    SLIDESHOW_ORDERS,
+)
+from .images import ImageSpec
+from .metrics import PlayerMetrics, get_metrics
+from .playlist import (
+    PlaylistItem,
+    PlaylistQueue,
+    async_load_playlist,
+    is_playlist_media,
 )
+from .sync import SyncGroup
+from .ttl_cache import TTLCache
+from .watchdog import get_feedback_watchdog
 
 _LOGGER = logging.getLogger(__name__)
 
+_LOCAL_MEDIA_SOURCE_PREFIX = "media-source://media_source/local/"
+_RESOLVE_CACHE_MAX_ENTRIES = 256
+_SIGNED_URL_MARGIN = 60
+_RESIGN_MIN_DELAY = 10
+_POSITION_TOLERANCE = 1.0
+_POSITION_SEEK_THRESHOLD = 3.0
+_STATE_WRITE_WINDOW = 1.0
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
@@ -73,6 +143,27 @@ async def async_setup_entry(
         CONF_RESTORE_LAST_MEDIA,
         entry.data.get(CONF_RESTORE_LAST_MEDIA, DEFAULT_RESTORE_LAST_MEDIA),
     )
+    resolve_cache_ttl = entry.options.get(
+        CONF_RESOLVE_CACHE_TTL,
+        entry.data.get(CONF_RESOLVE_CACHE_TTL, DEFAULT_RESOLVE_CACHE_TTL),
+    )
+    feedback_timeout = entry.options.get(
+        CONF_FEEDBACK_TIMEOUT,
+        entry.data.get(CONF_FEEDBACK_TIMEOUT, DEFAULT_FEEDBACK_TIMEOUT),
+    )
+    sync_members = entry.options.get(
+        CONF_SYNC_MEMBERS, entry.data.get(CONF_SYNC_MEMBERS, [])
+    )
+    sync_tolerance = entry.options.get(
+        CONF_SYNC_TOLERANCE,
+        entry.data.get(CONF_SYNC_TOLERANCE, DEFAULT_SYNC_TOLERANCE),
+    )
+    image_spec = ImageSpec(
+        max_width=entry.options.get(CONF_IMAGE_MAX_WIDTH, DEFAULT_IMAGE_MAX_WIDTH),
+        max_height=entry.options.get(CONF_IMAGE_MAX_HEIGHT, DEFAULT_IMAGE_MAX_HEIGHT),
+        format=entry.options.get(CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT),
+        quality=entry.options.get(CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY),
+    )
 
     player = HADashboardPlayer(
         hass=hass,
@@ -80,6 +171,11 @@ async def async_setup_entry(
         entry_id=entry.entry_id,
         enable_cache=enable_cache,
         restore_last_media=restore_last_media,
+        resolve_cache_ttl=resolve_cache_ttl,
+        feedback_timeout=feedback_timeout,
+        sync_members=sync_members,
+        sync_tolerance=sync_tolerance,
+        image_spec=image_spec,
     )
 
     async_add_entities([player], True)
@@ -90,11 +186,54 @@ async def async_setup_entry(
         {vol.Required(SERVICE_FIELD_MEDIA_URL): cv.string},
         "async_preload_media",
     )
+    platform.async_register_entity_service(
+        SERVICE_PRELOAD_MEDIA_BATCH,
+        {
+            vol.Required(SERVICE_FIELD_MEDIA_URLS): vol.All(
+                cv.ensure_list, [cv.string]
+            ),
+            vol.Optional(
+                SERVICE_FIELD_CONCURRENCY, default=DEFAULT_PRELOAD_CONCURRENCY
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_PRELOAD_CONCURRENCY)),
+        },
+        "async_preload_media_batch",
+    )
+    platform.async_register_entity_service(
+        SERVICE_CANCEL_PRELOAD,
+        {},
+        "async_cancel_preload",
+    )
+    platform.async_register_entity_service(
+        SERVICE_CLEAR_RESOLVE_CACHE,
+        {},
+        "async_clear_resolve_cache",
+    )
     platform.async_register_entity_service(
         SERVICE_CLEAR_SCREEN,
         {},
         "async_clear_screen",
     )
+    platform.async_register_entity_service(
+        SERVICE_START_SLIDESHOW,
+        {
+            vol.Required(SERVICE_FIELD_MEDIA_CONTENT_ID): cv.string,
+            vol.Optional(
+                SERVICE_FIELD_INTERVAL, default=DEFAULT_SLIDESHOW_INTERVAL
+            ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+            vol.Optional(SERVICE_FIELD_ORDER, default=SLIDESHOW_ORDERS[0]): vol.In(
+                SLIDESHOW_ORDERS
+            ),
+        },
+        "async_start_slideshow",
+    )
+    platform.async_register_entity_service(
+        SERVICE_MEDIA_ENDED,
+        {
+            vol.Required(SERVICE_FIELD_MEDIA_CONTENT_ID): cv.string,
+            vol.Optional(SERVICE_FIELD_QUEUE_POSITION): vol.Coerce(int),
+        },
+        "async_media_ended",
+    )
     platform.async_register_entity_service(
         SERVICE_REPORT_STATE,
         {
@@ -125,6 +264,7 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         | MediaPlayerEntityFeature.VOLUME_MUTE
         | MediaPlayerEntityFeature.REPEAT_SET
         | MediaPlayerEntityFeature.SHUFFLE_SET
+        | MediaPlayerEntityFeature.MEDIA_ENQUEUE
     )
 
     def __init__(
@@ -134,6 +274,11 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         entry_id: str,
         enable_cache: bool,
         restore_last_media: bool,
+        resolve_cache_ttl: int = DEFAULT_RESOLVE_CACHE_TTL,
+        feedback_timeout: float = DEFAULT_FEEDBACK_TIMEOUT,
+        sync_members: list[str] | None = None,
+        sync_tolerance: float = DEFAULT_SYNC_TOLERANCE,
+        image_spec: ImageSpec | None = None,
     ) -> None:
         self.hass = hass
         self._attr_name = name
@@ -143,16 +288,51 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         self._cache_enabled = enable_cache
         self._restore_last_media = restore_last_media
         self._last_error: str | None = None
-        self._cache_map: dict[str, str] = {}
-        self._cache_dir = Path(hass.config.path("www/ha-dashboard-player/cache"))
-        self._last_feedback: datetime | None = None
-        self._feedback_unsub = None
-        self._feedback_timeout_seconds = 3.0
+        self._feedback_timeout_seconds = feedback_timeout
+        self._pending_write_unsub = None
+        self._preload_task: asyncio.Task | None = None
+        self._preload_progress: dict[str, Any] | None = None
+        self._resolve_cache: TTLCache[str] = TTLCache(
+            resolve_cache_ttl, _RESOLVE_CACHE_MAX_ENTRIES
+        )
+        self._browse_cache: TTLCache[BrowseMedia] = TTLCache(
+            resolve_cache_ttl, _RESOLVE_CACHE_MAX_ENTRIES
+        )
+        self._hinted_url: str | None = None
+        self._resign_for: tuple[str | None, str | None] = (None, None)
+        self._resign_unsub = None
+        self._sync_members = sync_members or []
+        self._sync_tolerance = sync_tolerance
+        self._image_spec = image_spec
+        self._sync_group: SyncGroup | None = None
+        self._queue: PlaylistQueue | None = None
+        self._prefetch_task: asyncio.Task | None = None
+        self._next_item: tuple[str, str] | None = None
+        self._slideshow_interval: float | None = None
+        self._slideshow_unsub = None
+        self.position_sample: tuple[float, datetime] | None = None
 
     async def async_added_to_hass(self) -> None:
         """Restore state on startup."""
         await super().async_added_to_hass()
 
+        players = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PLAYERS, {})
+        players[self.entity_id] = self
+
+        if self._cache_enabled:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass, SIGNAL_CACHE_UPDATED, self._async_cache_updated
+                )
+            )
+
+        if self._sync_members:
+            self._sync_group = SyncGroup(
+                self.hass, self, self._sync_members, self._sync_tolerance
+            )
+            self._sync_group.async_start()
+            self.async_on_remove(self._sync_group.async_stop)
+
         if not self._restore_last_media:
             return
 
@@ -173,7 +353,75 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         self._attr_repeat = last_state.attributes.get("repeat")
         self._attr_shuffle = last_state.attributes.get("shuffle")
         self._media_url = last_state.attributes.get(ATTR_MEDIA_URL)
-        self._cached_media_url = last_state.attributes.get(ATTR_CACHED_MEDIA_URL)
+        self._set_cached_media_url(last_state.attributes.get(ATTR_CACHED_MEDIA_URL))
+        if self._cached_media_url:
+            # Signatures do not survive a restart.
+            if urlparse(self._media_url or "").path == self._cached_media_url:
+                self._media_url = self._sign_url(self._cached_media_url)
+            task = self.hass.async_create_background_task(
+                self._async_verify_restored_media(self._cached_media_url),
+                f"{DOMAIN} verify restored media {self.entity_id}",
+            )
+            self.async_on_remove(task.cancel)
+
+    async def _async_verify_restored_media(self, cached_url: str) -> None:
+        """Check the restored cached file and fetch it again if it is gone.
+
+        Until the new copy is ready the origin URL is shown. A video or
+        audio that is already playing keeps the origin URL, so swapping the
+        source does not restart it.
+        """
+        if await get_media_cache(self.hass).async_verify(cached_url):
+            return
+        media_id = self._attr_media_content_id
+        if self._cached_media_url != cached_url or media_id is None:
+            return
+        _LOGGER.info("Cached copy of %s is missing, using the origin", media_id)
+        try:
+            origin_url = await self._resolve_media_url(media_id)
+        except Exception as err:  # pylint: disable=broad-except
+            origin_url = None
+            _LOGGER.debug("Unable to resolve %s: %s", media_id, err)
+        if self._cached_media_url != cached_url:
+            return
+        if origin_url is None:
+            self._last_error = f"Unable to resolve media: {media_id}"
+            self.async_write_ha_state()
+            return
+        self._media_url = origin_url
+        self._set_cached_media_url(None)
+        self.async_write_ha_state()
+
+        fresh_url = await self._maybe_cache_media(
+            origin_url, media_id, background=True
+        )
+        if fresh_url is None or self._media_url != origin_url:
+            return
+        media_type = self._attr_media_content_type or ""
+        self._set_cached_media_url(fresh_url)
+        if (
+            media_type.startswith("image")
+            or self._attr_state != MediaPlayerState.PLAYING
+        ):
+            self._media_url = self._playable_url(fresh_url)
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release the cached file pinned by this player."""
+        self.hass.data.get(DOMAIN, {}).get(DATA_PLAYERS, {}).pop(self.entity_id, None)
+        self._cancel_feedback_timer()
+        self._cancel_pending_write()
+        self._cancel_resign_timer()
+        if self._preload_task is not None:
+            self._preload_task.cancel()
+        self._clear_queue()
+        if self._cache_enabled:
+            get_media_cache(self.hass).async_pin(self.unique_id, None)
+
+    @callback
+    def _async_cache_updated(self) -> None:
+        """Refresh cache usage attributes."""
+        self.async_write_ha_state()
 
     @property
     def supported_features(self) -> int:
@@ -183,6 +431,11 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
             features &= ~MediaPlayerEntityFeature.REPEAT_SET
         if not self._is_playlist():
             features &= ~MediaPlayerEntityFeature.SHUFFLE_SET
+        else:
+            features |= (
+                MediaPlayerEntityFeature.NEXT_TRACK
+                | MediaPlayerEntityFeature.PREVIOUS_TRACK
+            )
         if not self._media_url:
             features &= ~MediaPlayerEntityFeature.STOP
         return features
@@ -190,11 +443,24 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
+        cache = get_media_cache(self.hass) if self._cache_enabled else None
         return {
             ATTR_MEDIA_URL: self._media_url,
             ATTR_CACHED_MEDIA_URL: self._cached_media_url,
             ATTR_CACHE_ENABLED: self._cache_enabled,
+            ATTR_CACHE_SIZE: cache.index.total_size if cache else None,
+            ATTR_CACHE_ENTRIES: cache.index.entry_count if cache else None,
             ATTR_LAST_ERROR: self._last_error,
+            ATTR_PRELOAD_PROGRESS: (
+                dict(self._preload_progress) if self._preload_progress else None
+            ),
+            ATTR_QUEUE_POSITION: self._queue.position if self._queue else None,
+            ATTR_QUEUE_SIZE: len(self._queue) if self._queue else None,
+            ATTR_NEXT_MEDIA_URL: self._next_item[0] if self._next_item else None,
+            ATTR_NEXT_MEDIA_CONTENT_TYPE: (
+                self._next_item[1] if self._next_item else None
+            ),
+            ATTR_SLIDESHOW_INTERVAL: self._slideshow_interval,
             ATTR_INTEGRATION: True,
         }
 
@@ -213,9 +479,13 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
 
     async def async_play(self) -> None:
         """Resume playback."""
+        if self._sync_group is not None and self._media_url:
+            await self._sync_group.async_play()
+            return
         if self._media_url:
             self._attr_state = MediaPlayerState.PLAYING
         self.async_write_ha_state()
+        self.async_send_command("play")
 
     async def async_media_play(self) -> None:
         """Play via media service."""
@@ -223,9 +493,13 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
 
     async def async_pause(self) -> None:
         """Pause playback."""
+        if self._sync_group is not None and self._media_url:
+            await self._sync_group.async_pause()
+            return
         if self._media_url:
             self._attr_state = MediaPlayerState.PAUSED
         self.async_write_ha_state()
+        self.async_send_command("pause")
 
     async def async_media_pause(self) -> None:
         """Pause via media service."""
@@ -241,9 +515,13 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
 
     async def async_media_seek(self, position: float) -> None:
         """Seek to a position."""
+        if self._sync_group is not None and self._media_url:
+            await self._sync_group.async_seek(position)
+            return
         self._attr_media_position = position
         self._attr_media_position_updated_at = datetime.now(timezone.utc)
         self.async_write_ha_state()
+        self.async_send_command("seek", media_position=position)
 
     async def async_set_volume_level(self, volume: float) -> None:
         """Set volume."""
@@ -272,12 +550,190 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
             self._attr_shuffle = False
         else:
             self._attr_shuffle = shuffle
+            self._queue.set_shuffle(shuffle)
+            self._async_schedule_prefetch()
         self.async_write_ha_state()
 
-    async def async_play_media(self, media_type: str, media_id: str, **kwargs: Any) -> None:
-        """Start playing media."""
+    async def async_media_next_track(self) -> None:
+        """Play the next queue item, or stop at the end of the queue."""
+        if self._queue is None:
+            return
+        if self._queue.advance(self._attr_repeat == "all") is None:
+            await self.async_clear_screen()
+            return
+        await self._async_play_queue_item()
+
+    async def async_media_ended(
+        self, media_content_id: str, queue_position: int | None = None
+    ) -> None:
+        """Advance the queue past an item a card finished playing.
+
+        Every card showing the player reports the end of the item, so the
+        queue only advances while the reported item is still the current
+        one and later reports of the same item are ignored.
+        """
+        if self._queue is None or media_content_id != self._attr_media_content_id:
+            return
+        if queue_position is not None and queue_position != self._queue.position:
+            return
+        await self.async_media_next_track()
+
+    async def async_media_previous_track(self) -> None:
+        """Play the previous queue item."""
+        if self._queue is None:
+            return
+        self._queue.rewind(self._attr_repeat == "all")
+        await self._async_play_queue_item()
+
+    async def async_play_media(
+        self,
+        media_type: str,
+        media_id: str,
+        start_at: datetime | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Start playing media, optionally at a shared future moment.
+
+        With enqueue set to add, next or play the item is queued behind the
+        current media instead of replacing it, and the next queued item is
+        published in next_media_url so the card can buffer it.
+        """
+        if start_at is not None:
+            await self._async_play_item(media_type, media_id, start_at)
+            return
+
+        items = await self._async_load_items(media_type, media_id)
+        if items is not None and not items:
+            return
+
+        enqueue = kwargs.get(ATTR_MEDIA_ENQUEUE)
+        if self._media_url and enqueue in (
+            MediaPlayerEnqueue.ADD,
+            MediaPlayerEnqueue.NEXT,
+            MediaPlayerEnqueue.PLAY,
+        ):
+            await self._async_enqueue(
+                items or [PlaylistItem(media_id, media_type)], enqueue
+            )
+            return
+
+        self._clear_queue()
+        if items is not None:
+            self._queue = PlaylistQueue(media_id, items, bool(self._attr_shuffle))
+            self._attr_media_playlist = media_id
+            await self._async_play_queue_item()
+        elif self._sync_group is not None:
+            await self._sync_group.async_play_media(media_type, media_id)
+        else:
+            await self._async_play_item(media_type, media_id)
+
+    async def _async_load_items(
+        self, media_type: str, media_id: str
+    ) -> list[PlaylistItem] | None:
+        """Return the items of a playlist, or None for a single media item.
+
+        Load failures are recorded in last_error and returned as [].
+        """
+        if not is_playlist_media(media_type, media_id):
+            return None
+        try:
+            items = await async_load_playlist(
+                self.hass, media_id, self._resolve_media_url
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            self._last_error = f"Unable to load playlist {media_id}: {err}"
+            self.async_write_ha_state()
+            return []
+        if items is not None and not items:
+            self._last_error = f"Playlist is empty: {media_id}"
+            self.async_write_ha_state()
+        return items
+
+    async def _async_enqueue(
+        self, items: list[PlaylistItem], enqueue: MediaPlayerEnqueue
+    ) -> None:
+        """Add items behind the current media, starting a queue if needed."""
+        if self._queue is None:
+            current = PlaylistItem(
+                self._attr_media_content_id or self._media_url,
+                self._attr_media_content_type or "",
+            )
+            self._queue = PlaylistQueue(current.media_id, [current])
+        self._queue.insert(items, enqueue != MediaPlayerEnqueue.ADD)
+        if enqueue == MediaPlayerEnqueue.PLAY:
+            self._queue.advance(False)
+            await self._async_play_queue_item()
+            return
+        self._async_schedule_prefetch()
+        self.async_write_ha_state()
+
+    async def async_start_slideshow(
+        self, media_content_id: str, interval: float, order: str
+    ) -> None:
+        """Loop through the images of a folder or playlist."""
+        try:
+            items = await async_load_playlist(
+                self.hass, media_content_id, self._resolve_media_url
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            self._last_error = f"Unable to load slideshow {media_content_id}: {err}"
+            self.async_write_ha_state()
+            return
+        images = [item for item in items or [] if item.media_type.startswith("image")]
+        if not images:
+            self._last_error = f"No images found in {media_content_id}"
+            self.async_write_ha_state()
+            return
+
+        self._clear_queue()
+        shuffle = order == "shuffle"
+        self._queue = PlaylistQueue(media_content_id, images, shuffle)
+        self._attr_media_playlist = media_content_id
+        self._attr_shuffle = shuffle
+        self._attr_repeat = "all"
+        self._slideshow_interval = interval
+        await self._async_play_queue_item()
+
+    async def _async_play_queue_item(self) -> None:
+        item = self._queue.current
+        self._next_item = None
+        if self._sync_group is not None:
+            await self._sync_group.async_play_media(item.media_type, item.media_id)
+        else:
+            await self._async_play_item(item.media_type, item.media_id)
+        self._async_schedule_prefetch()
+        self._async_schedule_slide()
+
+    @callback
+    def _async_schedule_slide(self) -> None:
+        """Arm the timer that advances the slideshow."""
+        self._cancel_slide_timer()
+        if self._queue is not None and self._slideshow_interval is not None:
+            self._slideshow_unsub = async_call_later(
+                self.hass, self._slideshow_interval, self._async_slide_timer
+            )
+
+    @callback
+    def _async_slide_timer(self, _now) -> None:
+        self._slideshow_unsub = None
+        if self._attr_state != MediaPlayerState.PLAYING:
+            self._async_schedule_slide()
+            return
+        self.hass.async_create_task(
+            self.async_media_next_track(), f"{DOMAIN} slideshow {self.entity_id}"
+        )
+
+    def _cancel_slide_timer(self) -> None:
+        if self._slideshow_unsub is not None:
+            self._slideshow_unsub()
+            self._slideshow_unsub = None
+
+    async def _async_play_item(
+        self, media_type: str, media_id: str, start_at: datetime | None = None
+    ) -> None:
         self._last_error = None
         self._cancel_feedback_timer()
+        self.position_sample = None
         resolved_url = await self._resolve_media_url(media_id)
         if resolved_url is None:
             self._last_error = f"Unable to resolve media: {media_id}"
@@ -285,12 +741,12 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
             return
 
         final_url = resolved_url
-        cached_url = await self._maybe_cache_media(resolved_url)
+        cached_url = await self._maybe_cache_media(
+            resolved_url, media_id, progressive=not media_type.startswith("image")
+        )
         if cached_url:
-            final_url = cached_url
-            self._cached_media_url = cached_url
-        else:
-            self._cached_media_url = None
+            final_url = self._playable_url(cached_url)
+        self._set_cached_media_url(cached_url)
 
         self._media_url = final_url
         self._attr_media_content_type = media_type
@@ -299,18 +755,24 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
             self._attr_media_position = 0
             self._attr_media_duration = 0
             self._attr_media_position_updated_at = None
-            self._attr_repeat = None
-            self._attr_shuffle = False
+            if not self._is_playlist():
+                self._attr_repeat = None
+                self._attr_shuffle = False
         else:
             self._attr_media_position = 0
             self._attr_media_duration = None
-            self._attr_media_position_updated_at = datetime.now(timezone.utc)
+            self._attr_media_position_updated_at = start_at or datetime.now(
+                timezone.utc
+            )
             if not self._is_playlist() and self._attr_shuffle:
                 self._attr_shuffle = False
             if not self._is_playlist() and self._attr_repeat == "all":
                 self._attr_repeat = "one"
         self._attr_state = MediaPlayerState.PLAYING
         self.async_write_ha_state()
+        self.async_send_command(
+            "play_media", media_url=final_url, media_content_type=media_type
+        )
 
     async def async_browse_media(
         self, media_content_type: str | None = None, media_content_id: str | None = None
@@ -319,26 +781,131 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         if media_content_id in (None, "root"):
             media_content_id = "media-source://"
 
+        if (cached := self._browse_cache.get(media_content_id)) is not None:
+            return cached
+
         try:
-            return await async_browse_media(
+            result = await async_browse_media(
                 self.hass, media_content_id, entity_id=self.entity_id
             )
         except TypeError:
-            return await async_browse_media(self.hass, media_content_id)
+            result = await async_browse_media(self.hass, media_content_id)
+        self._browse_cache.set(media_content_id, result)
+        return result
+
+    async def async_clear_resolve_cache(self) -> None:
+        """Forget cached media-source resolutions and browse results."""
+        self._resolve_cache.clear()
+        self._browse_cache.clear()
 
     async def async_preload_media(self, media_url: str) -> None:
-        """Preload a media URL into cache."""
+        """Preload a media URL or media-source ID into cache."""
         self._last_error = None
-        cached_url = await self._maybe_cache_media(media_url)
+        resolved_url = await self._resolve_media_url(media_url)
+        if resolved_url is None:
+            self._last_error = f"Unable to resolve media: {media_url}"
+            self.async_write_ha_state()
+            return
+        cached_url = await self._maybe_cache_media(
+            resolved_url, media_url, background=True
+        )
         if cached_url:
-            self._cached_media_url = cached_url
+            self._set_cached_media_url(cached_url)
+        self.async_write_ha_state()
+
+    async def async_preload_media_batch(
+        self, media_urls: list[str], concurrency: int = DEFAULT_PRELOAD_CONCURRENCY
+    ) -> None:
+        """Preload several media items into cache in the background."""
+        if self._preload_task is not None:
+            self._preload_task.cancel()
+        self._preload_progress = {
+            "status": "running",
+            "queued": len(media_urls),
+            "active": 0,
+            "done": 0,
+            "failed": 0,
+            "skipped": 0,
+            "bytes": 0,
+        }
+        self._preload_task = self.hass.async_create_background_task(
+            self._async_run_preload_batch(media_urls, concurrency),
+            f"{DOMAIN} preload batch {self.entity_id}",
+        )
+        self.async_write_ha_state()
+
+    async def async_cancel_preload(self) -> None:
+        """Cancel a running batch preload and the downloads only it started."""
+        if self._preload_task is None:
+            return
+        self._preload_task.cancel()
+        self._preload_task = None
+        if self._preload_progress is not None:
+            self._preload_progress["status"] = "cancelled"
+            self._preload_progress["active"] = 0
+        self.async_write_ha_state()
+
+    async def _async_run_preload_batch(
+        self, media_urls: list[str], concurrency: int
+    ) -> None:
+        progress = self._preload_progress
+        assert progress is not None
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _async_preload(media_id: str) -> None:
+            async with semaphore:
+                progress["queued"] -= 1
+                progress["active"] += 1
+                try:
+                    outcome, size = await self._async_preload_item(media_id)
+                finally:
+                    progress["active"] -= 1
+            progress[outcome] += 1
+            progress["bytes"] += size
+            self.async_write_ha_state()
+
+        await asyncio.gather(*(_async_preload(media_id) for media_id in media_urls))
+        progress["status"] = "finished"
+        self._preload_task = None
         self.async_write_ha_state()
 
+    async def _async_preload_item(self, media_id: str) -> tuple[str, int]:
+        """Cache one batch item and return its progress counter and size.
+
+        Items are skipped when the cache is disabled or they are not
+        cacheable, such as local media.
+        """
+        if not self._cache_enabled:
+            return "skipped", 0
+        try:
+            resolved_url = await self._resolve_media_url(media_id)
+        except Exception as err:  # pylint: disable=broad-except
+            self._last_error = str(err)
+            return "failed", 0
+        if resolved_url is None:
+            self._last_error = f"Unable to resolve media: {media_id}"
+            return "failed", 0
+        if self._cache_key(resolved_url, media_id) is None:
+            return "skipped", 0
+        # The batch semaphore bounds these, not the shared prefetch slots.
+        entry = await self._async_cache_entry(
+            resolved_url, media_id, background=True, queued=False
+        )
+        return ("done", entry.size) if entry is not None else ("failed", 0)
+
     async def async_clear_screen(self) -> None:
         """Clear output and set state to idle."""
+        self._async_clear_output()
+        if self._sync_group is not None:
+            await self._sync_group.async_clear()
+
+    @callback
+    def _async_clear_output(self) -> None:
         self._cancel_feedback_timer()
+        self._clear_queue()
+        self.position_sample = None
         self._media_url = None
-        self._cached_media_url = None
+        self._set_cached_media_url(None)
         self._attr_media_content_type = None
         self._attr_media_content_id = None
         self._attr_media_position = None
@@ -346,6 +913,44 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         self._attr_media_position_updated_at = None
         self._attr_state = MediaPlayerState.IDLE
         self.async_write_ha_state()
+        self.async_send_command("stop")
+
+    @callback
+    def async_apply_sync(
+        self,
+        command: str,
+        position: float | None = None,
+        start_at: datetime | None = None,
+    ) -> None:
+        """Apply a command fanned out by a synchronized playback group."""
+        if command == "stop":
+            self._async_clear_output()
+            return
+        if not self._media_url:
+            return
+        self._cancel_pending_write()
+        self.position_sample = None
+        if command == "pause":
+            self._attr_state = MediaPlayerState.PAUSED
+            self._attr_media_position = position
+            self._attr_media_position_updated_at = datetime.now(timezone.utc)
+            self.async_write_ha_state()
+            self.async_send_command("pause")
+            return
+        if command == "play":
+            self._attr_state = MediaPlayerState.PLAYING
+        self._attr_media_position = position
+        self._attr_media_position_updated_at = start_at
+        self.async_write_ha_state()
+
+    @callback
+    def async_send_command(self, command: str, **data: Any) -> None:
+        """Push a playback command to cards subscribed over the websocket."""
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_PLAYER_COMMAND.format(self.entity_id),
+            {"command": command, **data},
+        )
 
     async def async_report_state(
         self,
@@ -358,68 +963,199 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         shuffle: bool | None = None,
     ) -> None:
         """Update player state from frontend feedback."""
+        self.async_handle_feedback(
+            state=state,
+            media_position=media_position,
+            media_duration=media_duration,
+            volume_level=volume_level,
+            is_volume_muted=is_volume_muted,
+            repeat=repeat,
+            shuffle=shuffle,
+        )
+
+    @callback
+    def async_handle_feedback(
+        self,
+        state: str | None = None,
+        media_position: float | None = None,
+        media_duration: float | None = None,
+        volume_level: float | None = None,
+        is_volume_muted: bool | None = None,
+        repeat: str | None = None,
+        shuffle: bool | None = None,
+    ) -> None:
+        """Apply feedback from the service or the websocket channel.
+
+        Position reports that match the position already extrapolated from
+        media_position_updated_at are not written. Small drift is batched
+        into one delayed write, while seeks and duration, volume, mute,
+        repeat or shuffle changes are written immediately.
+        """
+        self._metrics.reports.async_mark()
         if self._attr_state in (MediaPlayerState.IDLE, MediaPlayerState.OFF):
-            self._attr_media_position = None
-            self._attr_media_duration = None
-            self._attr_media_position_updated_at = None
-            self.async_write_ha_state()
+            if (
+                self._attr_media_position is not None
+                or self._attr_media_duration is not None
+                or self.media_position_updated_at is not None
+            ):
+                self._attr_media_position = None
+                self._attr_media_duration = None
+                self._attr_media_position_updated_at = None
+                self._async_write_state_now()
             return
 
-        self._last_feedback = datetime.now(timezone.utc)
-        self._schedule_feedback_timeout()
+        now = datetime.now(timezone.utc)
+        get_feedback_watchdog(self.hass).async_touch(
+            self, self._feedback_timeout_seconds
+        )
+
+        discontinuity = False
+        drifted = False
+
+        updated_at = self.media_position_updated_at
+        if updated_at is not None and updated_at > now:
+            # Holding for a synchronized start; the card reports its paused
+            # position until then.
+            media_position = None
 
         if media_position is not None:
             if math.isfinite(media_position) and media_position >= 0:
-                self._attr_media_position = media_position
-                self._attr_media_position_updated_at = datetime.now(timezone.utc)
+                self.position_sample = (media_position, now)
+                expected = self._expected_position(now)
+                drift = None if expected is None else abs(media_position - expected)
+                if drift is None or drift > _POSITION_SEEK_THRESHOLD:
+                    discontinuity = True
+                elif drift > _POSITION_TOLERANCE:
+                    drifted = True
+                if discontinuity or drifted:
+                    self._attr_media_position = media_position
+                    self._attr_media_position_updated_at = now
 
         if media_duration is not None:
-            if math.isfinite(media_duration):
+            if (
+                math.isfinite(media_duration)
+                and media_duration != self._attr_media_duration
+            ):
                 self._attr_media_duration = media_duration
+                discontinuity = True
 
         if media_duration is not None and media_duration <= 0:
-            self._attr_media_position = 0
-            self._attr_media_position_updated_at = None
-
-        if volume_level is not None:
+            if (
+                self._attr_media_position != 0
+                or self.media_position_updated_at is not None
+            ):
+                self._attr_media_position = 0
+                self._attr_media_position_updated_at = None
+                discontinuity = True
+
+        if volume_level is not None and volume_level != self._attr_volume_level:
             self._attr_volume_level = volume_level
+            discontinuity = True
 
-        if is_volume_muted is not None:
+        if (
+            is_volume_muted is not None
+            and is_volume_muted != self._attr_is_volume_muted
+        ):
             self._attr_is_volume_muted = is_volume_muted
+            discontinuity = True
 
-        if repeat is not None:
+        if repeat is not None and repeat != self._attr_repeat:
             self._attr_repeat = repeat
+            discontinuity = True
 
-        if shuffle is not None:
+        if shuffle is not None and shuffle != self._attr_shuffle:
             self._attr_shuffle = shuffle
+            discontinuity = True
 
-        self.async_write_ha_state()
+        if discontinuity:
+            self._async_write_state_now()
+        elif drifted:
+            self._async_schedule_state_write()
 
-    def _schedule_feedback_timeout(self) -> None:
-        """Clear progress values if feedback goes stale."""
-        self._cancel_feedback_timer()
-        self._feedback_unsub = async_call_later(
-            self.hass, self._feedback_timeout_seconds, self._handle_feedback_timeout
-        )
+    def _expected_position(self, now: datetime) -> float | None:
+        """Return where playback should be according to the current state."""
+        position = self._attr_media_position
+        if position is None:
+            return None
+        updated_at = self.media_position_updated_at
+        if self._attr_state == MediaPlayerState.PLAYING and updated_at is not None:
+            return position + (now - updated_at).total_seconds()
+        return position
+
+    @callback
+    def _async_schedule_state_write(self) -> None:
+        """Coalesce feedback updates into one write per window."""
+        if self._pending_write_unsub is None:
+            self._pending_write_unsub = async_call_later(
+                self.hass, _STATE_WRITE_WINDOW, self._async_flush_state_write
+            )
 
-    def _cancel_feedback_timer(self) -> None:
-        if self._feedback_unsub is not None:
-            self._feedback_unsub()
-            self._feedback_unsub = None
+    @callback
+    def _async_flush_state_write(self, _now) -> None:
+        self._pending_write_unsub = None
+        self.async_write_ha_state()
 
-    def _handle_feedback_timeout(self, _now) -> None:
-        self.hass.loop.call_soon_threadsafe(
-            self.hass.async_create_task, self._async_handle_feedback_timeout()
-        )
+    @callback
+    def _async_write_state_now(self) -> None:
+        self._cancel_pending_write()
+        self.async_write_ha_state()
 
-    async def _async_handle_feedback_timeout(self) -> None:
-        if self._last_feedback is None:
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and count the write."""
+        self._metrics.state_writes += 1
+        self._async_schedule_resign()
+        super().async_write_ha_state()
+
+    @callback
+    def _async_schedule_resign(self) -> None:
+        """Arm a timer that re-signs published cache URLs before they expire."""
+        published = (self._media_url, self._next_item[0] if self._next_item else None)
+        if published == self._resign_for:
             return
+        self._resign_for = published
+        self._cancel_resign_timer()
+        ttls = [
+            ttl
+            for url in published
+            if _is_cache_url(url) and (ttl := _signed_url_ttl(url)) is not None
+        ]
+        if ttls:
+            self._resign_unsub = async_call_later(
+                self.hass, max(min(ttls), _RESIGN_MIN_DELAY), self._async_resign
+            )
 
-        elapsed = (datetime.now(timezone.utc) - self._last_feedback).total_seconds()
-        if elapsed < self._feedback_timeout_seconds:
-            return
+    @callback
+    def _async_resign(self, _now) -> None:
+        self._resign_unsub = None
+        if _is_cache_url(self._media_url):
+            self._media_url = self._sign_url(urlparse(self._media_url).path)
+        if self._next_item is not None and _is_cache_url(self._next_item[0]):
+            self._hinted_url = self._sign_url(urlparse(self._next_item[0]).path)
+            self._next_item = (self._hinted_url, self._next_item[1])
+        self.async_write_ha_state()
+
+    def _cancel_resign_timer(self) -> None:
+        if self._resign_unsub is not None:
+            self._resign_unsub()
+            self._resign_unsub = None
+
+    @property
+    def _metrics(self) -> PlayerMetrics:
+        return get_metrics(self.hass).async_player(self.entity_id)
 
+    def _cancel_pending_write(self) -> None:
+        if self._pending_write_unsub is not None:
+            self._pending_write_unsub()
+            self._pending_write_unsub = None
+
+    def _cancel_feedback_timer(self) -> None:
+        get_feedback_watchdog(self.hass).async_cancel(self)
+
+    @callback
+    def async_feedback_timeout(self) -> None:
+        """Clear progress values once card feedback has gone stale."""
+        self._metrics.feedback_timeouts += 1
         media_type = self._attr_media_content_type or ""
         if media_type.startswith("image"):
             return
@@ -428,68 +1164,170 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
             self._attr_media_position = None
             self._attr_media_duration = None
             self._attr_media_position_updated_at = None
-            self.async_write_ha_state()
+            self._async_write_state_now()
 
     async def _resolve_media_url(self, media_id: str) -> str | None:
-        """Resolve a media ID into a playable URL."""
-        if is_media_source_id(media_id):
-            local_prefix = "media-source://media_source/local/"
-            if media_id.startswith(local_prefix):
-                local_path = media_id[len(local_prefix) :]
-                return async_process_play_media_url(
-                    self.hass, f"/media/local/{local_path}"
-                )
+        """Resolve a media ID into a playable URL, reusing recent results."""
+        if not is_media_source_id(media_id):
+            return media_id
+
+        if (cached := self._resolve_cache.get(media_id)) is not None:
+            return cached
+
+        started = time.monotonic()
+        resolved_url = await self._async_resolve_media_source(media_id)
+        self._metrics.resolve_latency.async_observe(
+            (time.monotonic() - started) * 1000
+        )
+        if resolved_url is not None:
+            self._resolve_cache.set(
+                media_id, resolved_url, _signed_url_ttl(resolved_url)
+            )
+        return resolved_url
+
+    async def _async_resolve_media_source(self, media_id: str) -> str | None:
+        """Resolve a media-source ID into a playable URL."""
+        if media_id.startswith(_LOCAL_MEDIA_SOURCE_PREFIX):
+            local_path = media_id[len(_LOCAL_MEDIA_SOURCE_PREFIX) :]
+            return async_process_play_media_url(self.hass, f"/media/local/{local_path}")
+        _LOGGER.debug(
+            "Resolving media_source id=%s via %s",
+            media_id,
+            async_resolve_media,
+        )
+        try:
+            resolved = await async_resolve_media(
+                self.hass, media_id, entity_id=self.entity_id
+            )
+        except TypeError as err:
             _LOGGER.debug(
-                "Resolving media_source id=%s via %s",
-                media_id,
-                async_resolve_media,
+                "async_resolve_media entity_id failed, falling back: %s",
+                err,
             )
+            resolved = await async_resolve_media(self.hass, media_id)
+        return async_process_play_media_url(self.hass, resolved.url)
+
+    async def _maybe_cache_media(
+        self,
+        media_url: str,
+        media_id: str | None = None,
+        progressive: bool = False,
+        background: bool = False,
+    ) -> str | None:
+        """Download media to local cache when enabled.
+
+        With progressive the local URL is returned once the first bytes are
+        cached, and the cache view streams the rest as it downloads.
+        background downloads are queued and bandwidth-limited.
+        """
+        if progressive:
+            if (cache_key := self._cache_key(media_url, media_id)) is None:
+                return None
             try:
-                resolved = await async_resolve_media(
-                    self.hass, media_id, entity_id=self.entity_id
-                )
-            except TypeError as err:
-                _LOGGER.debug(
-                    "async_resolve_media entity_id failed, falling back: %s",
-                    err,
+                return await get_media_cache(self.hass).async_cache_progressive(
+                    media_url,
+                    cache_key,
+                    partial(self._async_progressive_failed, media_url),
                 )
-                resolved = await async_resolve_media(self.hass, media_id)
-            return async_process_play_media_url(self.hass, resolved.url)
+            except Exception as err:  # pylint: disable=broad-except
+                self._last_error = str(err)
+                return None
+        entry = await self._async_cache_entry(media_url, media_id, background)
+        return entry.local_url if entry is not None else None
+
+    @callback
+    def _async_progressive_failed(
+        self, media_url: str, local_url: str, err: BaseException
+    ) -> None:
+        """Switch back to media_url when the download being streamed fails."""
+        if self._cached_media_url != local_url:
+            return
+        _LOGGER.warning("Caching %s failed while playing: %s", media_url, err)
+        self._last_error = str(err) or type(err).__name__
+        self._set_cached_media_url(None)
+        self._media_url = media_url
+        self.async_write_ha_state()
+        self.async_send_command(
+            "play_media",
+            media_url=media_url,
+            media_content_type=self._attr_media_content_type,
+        )
 
-        return media_id
+    def _cache_key(self, media_url: str, media_id: str | None) -> str | None:
+        """Return the cache key for media_url, or None if it is not cacheable.
 
-    async def _maybe_cache_media(self, media_url: str) -> str | None:
-        """Download media to local cache when enabled."""
+        Media-source items are keyed on their media-source ID, because the
+        resolved URL is signed and changes on every resolution.
+        """
         if not self._cache_enabled:
             return None
-
-        if not media_url.startswith("http://") and not media_url.startswith("https://"):
+        if media_id is not None and is_media_source_id(media_id):
+            if media_id.startswith(_LOCAL_MEDIA_SOURCE_PREFIX):
+                return None
+            return media_id
+        if not media_url.startswith("http://") and not media_url.startswith(
+            "https://"
+        ):
             return None
+        return media_url
 
-        if media_url in self._cache_map:
-            return self._cache_map[media_url]
-
-        parsed = urlparse(media_url)
-        suffix = Path(parsed.path).suffix
-        digest = hashlib.sha256(media_url.encode("utf-8")).hexdigest()
-        filename = f"{digest}{suffix}"
-        target = self._cache_dir / filename
-        target_url = f"/local/ha-dashboard-player/cache/{filename}"
-
-        await asyncio.to_thread(self._cache_dir.mkdir, parents=True, exist_ok=True)
+    async def _async_cache_entry(
+        self,
+        media_url: str,
+        media_id: str | None = None,
+        background: bool = False,
+        queued: bool = True,
+    ) -> CacheEntry | None:
+        """Return the cache entry for media_url, or None if it is not cacheable."""
+        if (cache_key := self._cache_key(media_url, media_id)) is None:
+            return None
 
-        session = async_get_clientsession(self.hass)
+        cache = get_media_cache(self.hass)
         try:
-            async with session.get(media_url) as resp:
-                resp.raise_for_status()
-                data = await resp.read()
+            entry = await cache.async_cache_entry(
+                media_url, cache_key, background, queued
+            )
         except Exception as err:  # pylint: disable=broad-except
             self._last_error = str(err)
             return None
 
-        await asyncio.to_thread(target.write_bytes, data)
-        self._cache_map[media_url] = target_url
-        return target_url
+        content_type = entry.content_type or ""
+        if (
+            self._image_spec is not None
+            and self._image_spec.enabled
+            and content_type.startswith("image/")
+        ):
+            try:
+                return await cache.async_derivative(entry, self._image_spec)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Unable to resize cached image %s: %s", cache_key, err)
+        return entry
+
+    def _playable_url(self, local_url: str) -> str:
+        """Return a signed URL of a cached file that media elements can load.
+
+        The URL published as the next-media hint is reused while it is
+        valid, so the card plays the copy it preloaded.
+        """
+        hinted = self._hinted_url
+        if (
+            hinted is not None
+            and urlparse(hinted).path == local_url
+            and (_signed_url_ttl(hinted) or 0) > 0
+        ):
+            return hinted
+        return self._sign_url(local_url)
+
+    def _sign_url(self, local_url: str) -> str:
+        return async_process_play_media_url(
+            self.hass, local_url, allow_relative_url=True
+        )
+
+    def _set_cached_media_url(self, cached_url: str | None) -> None:
+        """Track the cached file on screen and protect it from eviction."""
+        self._cached_media_url = cached_url
+        if self._cache_enabled:
+            get_media_cache(self.hass).async_pin(self.unique_id, cached_url)
 
     @property
     def repeat(self) -> str | None:
@@ -502,18 +1340,85 @@ class HADashboardPlayer(MediaPlayerEntity, RestoreEntity):
         return self._attr_shuffle
 
     def _can_repeat(self) -> bool:
+        if self._queue is not None:
+            return True
         media_type = self._attr_media_content_type or ""
         return bool(media_type) and not media_type.startswith("image")
 
     def _is_playlist(self) -> bool:
-        media_type = (self._attr_media_content_type or "").lower()
-        if "playlist" in media_type:
-            return True
+        return self._queue is not None
+
+    @callback
+    def _async_schedule_prefetch(self) -> None:
+        """Warm the cache with the next queue items while this one plays."""
+        self._cancel_prefetch()
+        self._next_item = None
+        if self._queue is None:
+            return
+        upcoming = self._queue.upcoming(
+            PLAYLIST_PREFETCH_COUNT, self._attr_repeat == "all"
+        )
+        if upcoming:
+            self._prefetch_task = self.hass.async_create_background_task(
+                self._async_prefetch(upcoming),
+                f"{DOMAIN} playlist prefetch {self.entity_id}",
+            )
 
-        media_id = (self._attr_media_content_id or "").lower()
-        return media_id.endswith((".m3u", ".m3u8", ".pls"))
+    async def _async_prefetch(self, items: list[PlaylistItem]) -> None:
+        """Resolve and cache upcoming items and publish the first one."""
+        for index, item in enumerate(items):
+            try:
+                resolved_url = await self._resolve_media_url(item.media_id)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Prefetch of %s failed: %s", item.media_id, err)
+                continue
+            if resolved_url is None:
+                continue
+            cached_url = await self._maybe_cache_media(
+                resolved_url, item.media_id, background=True
+            )
+            if index == 0:
+                if cached_url:
+                    self._hinted_url = self._sign_url(cached_url)
+                self._next_item = (
+                    self._hinted_url if cached_url else resolved_url,
+                    item.media_type,
+                )
+                self.async_write_ha_state()
+
+    def _clear_queue(self) -> None:
+        self._cancel_prefetch()
+        self._cancel_slide_timer()
+        self._queue = None
+        self._next_item = None
+        self._hinted_url = None
+        self._slideshow_interval = None
+        self._attr_media_playlist = None
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
 
     @property
     def media_position_updated_at(self) -> datetime | None:
         """Return media position updated at."""
         return getattr(self, "_attr_media_position_updated_at", None)
+
+
+def _is_cache_url(url: str | None) -> bool:
+    return url is not None and urlparse(url).path.startswith(f"{CACHE_VIEW_URL}/")
+
+
+def _signed_url_ttl(url: str) -> float | None:
+    """Return seconds a signed URL stays valid, or None if it is not signed."""
+    signature = parse_qs(urlparse(url).query).get("authSig")
+    if not signature:
+        return None
+    try:
+        payload = signature[0].split(".")[1]
+        padded = payload + "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+        return float(claims["exp"]) - time.time() - _SIGNED_URL_MARGIN
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
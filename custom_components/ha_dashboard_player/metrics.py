@@ -0,0 +1,164 @@
+"""Runtime counters and latency histograms for HA Dashboard Player."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_METRICS, DOMAIN
+
+_HISTOGRAM_SAMPLES = 500
+_RATE_WINDOW = 60.0
+
+
+class Histogram:
+    """Lifetime count, sum and max plus percentiles of the recent samples."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max: float | None = None
+        self._recent: deque[float] = deque(maxlen=_HISTOGRAM_SAMPLES)
+
+    @callback
+    def async_observe(self, value: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        self.total += value
+        self.max = value if self.max is None else max(self.max, value)
+        self._recent.append(value)
+
+    @property
+    def median(self) -> float | None:
+        """Return the median of the recent samples."""
+        return statistics.median(self._recent) if self._recent else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable summary."""
+        recent = sorted(self._recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else None
+        return {
+            "count": self.count,
+            "mean": _round(self.total / self.count) if self.count else None,
+            "median": _round(self.median),
+            "p95": _round(p95),
+            "max": _round(self.max),
+        }
+
+
+class RateMeter:
+    """Count events and their rate over the last minute."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self._recent: deque[float] = deque()
+
+    @callback
+    def async_mark(self) -> None:
+        """Record one event now."""
+        now = time.monotonic()
+        self.total += 1
+        self._recent.append(now)
+        self._prune(now)
+
+    @property
+    def per_minute(self) -> int:
+        """Return the number of events in the last minute."""
+        self._prune(time.monotonic())
+        return len(self._recent)
+
+    def _prune(self, now: float) -> None:
+        while self._recent and self._recent[0] < now - _RATE_WINDOW:
+            self._recent.popleft()
+
+
+@dataclass
+class PlayerMetrics:
+    """Counters of one player entity."""
+
+    reports: RateMeter = field(default_factory=RateMeter)
+    state_writes: int = 0
+    feedback_timeouts: int = 0
+    resolve_latency: Histogram = field(default_factory=Histogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable summary."""
+        return {
+            "reports_total": self.reports.total,
+            "reports_per_minute": self.reports.per_minute,
+            "state_writes": self.state_writes,
+            "feedback_timeouts": self.feedback_timeouts,
+            "resolve_latency_ms": self.resolve_latency.as_dict(),
+        }
+
+
+class IntegrationMetrics:
+    """Counters shared by the media cache and all players."""
+
+    def __init__(self) -> None:
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_downloaded = 0
+        self.downloads_completed = 0
+        self.downloads_failed = 0
+        self.download_duration = Histogram()
+        self.download_throughput = Histogram()
+        self.players: dict[str, PlayerMetrics] = {}
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        """Return the percentage of cache lookups served from disk."""
+        lookups = self.cache_hits + self.cache_misses
+        return round(self.cache_hits / lookups * 100, 1) if lookups else None
+
+    @callback
+    def async_player(self, entity_id: str) -> PlayerMetrics:
+        """Return the counters of entity_id, creating them on first use."""
+        if (player := self.players.get(entity_id)) is None:
+            player = self.players[entity_id] = PlayerMetrics()
+        return player
+
+    @callback
+    def async_record_download(self, size: int, seconds: float) -> None:
+        """Record a finished download."""
+        self.downloads_completed += 1
+        self.bytes_downloaded += size
+        self.download_duration.async_observe(seconds)
+        if seconds > 0:
+            self.download_throughput.async_observe(size / seconds / 1024 / 1024)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable summary."""
+        return {
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_ratio": self.cache_hit_ratio,
+            "bytes_downloaded": self.bytes_downloaded,
+            "downloads_completed": self.downloads_completed,
+            "downloads_failed": self.downloads_failed,
+            "download_duration_s": self.download_duration.as_dict(),
+            "download_throughput_mb_s": self.download_throughput.as_dict(),
+            "players": {
+                entity_id: player.as_dict()
+                for entity_id, player in self.players.items()
+            },
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 3)
+
+
+@callback
+def get_metrics(hass: HomeAssistant) -> IntegrationMetrics:
+    """Return the metrics shared by the integration."""
+    data = hass.data.setdefault(DOMAIN, {})
+    metrics: IntegrationMetrics | None = data.get(DATA_METRICS)
+    if metrics is None:
+        metrics = data[DATA_METRICS] = IntegrationMetrics()
+    return metrics
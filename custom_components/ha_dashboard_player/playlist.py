@@ -0,0 +1,260 @@
+"""Playlist parsing and play queue for HA Dashboard Player."""
+
+from __future__ import annotations
+
+import logging
+import mimetypes
+import posixpath
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+
+from homeassistant.components.media_source import (
+    async_browse_media,
+    is_media_source_id,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.network import get_url
+
+_LOGGER = logging.getLogger(__name__)
+
+PLAYLIST_SUFFIXES = (".m3u", ".m3u8", ".pls")
+
+_MAX_PLAYLIST_BYTES = 1024 * 1024
+_MAX_PLAYLIST_ITEMS = 5000
+_FETCH_TIMEOUT = aiohttp.ClientTimeout(total=30)
+_FOLDER_MEDIA_TYPES = ("directory", "folder")
+
+
+@dataclass
+class PlaylistItem:
+    """One playable entry of a playlist."""
+
+    media_id: str
+    media_type: str
+    title: str | None = None
+
+
+class PlaylistQueue:
+    """Server-side play queue with a stable shuffle order.
+
+    The play order is a permutation of the item indexes. Shuffling keeps the
+    current item first and reshuffles the rest, and every wrap-around with
+    repeat-all draws a fresh order that does not replay the last item first.
+    """
+
+    def __init__(self, name: str, items: list[PlaylistItem], shuffle: bool = False):
+        self.name = name
+        self.items = items
+        self.shuffled = False
+        self._order = list(range(len(items)))
+        self._position = 0
+        if shuffle:
+            self.set_shuffle(True)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def position(self) -> int:
+        """Return the zero-based position in the play order."""
+        return self._position
+
+    @property
+    def current(self) -> PlaylistItem:
+        """Return the item at the current position."""
+        return self.items[self._order[self._position]]
+
+    def set_shuffle(self, shuffle: bool) -> None:
+        """Switch between playlist order and a shuffled order."""
+        current = self._order[self._position]
+        self.shuffled = shuffle
+        if shuffle:
+            rest = [index for index in range(len(self.items)) if index != current]
+            random.shuffle(rest)
+            self._order = [current, *rest]
+            self._position = 0
+        else:
+            self._order = list(range(len(self.items)))
+            self._position = current
+
+    def advance(self, wrap: bool) -> PlaylistItem | None:
+        """Move to the next item, or return None at the end without wrap."""
+        if self._position + 1 < len(self._order):
+            self._position += 1
+        elif wrap:
+            if self.shuffled:
+                self._reshuffle()
+            self._position = 0
+        else:
+            return None
+        return self.current
+
+    def insert(self, items: list[PlaylistItem], next_up: bool) -> None:
+        """Queue items right after the current one or at the end."""
+        start = len(self.items)
+        self.items.extend(items)
+        added = list(range(start, len(self.items)))
+        if next_up:
+            self._order[self._position + 1 : self._position + 1] = added
+        else:
+            self._order.extend(added)
+
+    def rewind(self, wrap: bool) -> PlaylistItem:
+        """Move to the previous item, staying on the first one without wrap."""
+        if self._position > 0:
+            self._position -= 1
+        elif wrap:
+            self._position = len(self._order) - 1
+        return self.current
+
+    def upcoming(self, count: int, wrap: bool) -> list[PlaylistItem]:
+        """Return up to count items that follow the current one."""
+        count = min(count, len(self._order) - 1)
+        positions = range(self._position + 1, self._position + 1 + count)
+        if wrap:
+            positions = [pos % len(self._order) for pos in positions]
+        return [self.items[self._order[pos]] for pos in positions if pos < len(self)]
+
+    def _reshuffle(self) -> None:
+        last = self._order[-1]
+        random.shuffle(self._order)
+        if len(self._order) > 1 and self._order[0] == last:
+            self._order[0], self._order[-1] = self._order[-1], self._order[0]
+
+
+def is_playlist_media(media_type: str, media_id: str) -> bool:
+    """Return True if media_type/media_id describe a playlist or folder."""
+    media_type = (media_type or "").lower()
+    if "playlist" in media_type or media_type in _FOLDER_MEDIA_TYPES:
+        return True
+    return urlparse(media_id).path.lower().endswith(PLAYLIST_SUFFIXES)
+
+
+async def async_load_playlist(
+    hass: HomeAssistant,
+    media_id: str,
+    resolve: Callable[[str], Awaitable[str | None]],
+) -> list[PlaylistItem] | None:
+    """Load the items of an M3U/PLS playlist or media-source folder.
+
+    Returns None when media_id turns out not to be a playlist, for example
+    an HLS stream served as .m3u8, so the caller can play it directly.
+    """
+    path = urlparse(media_id).path.lower()
+    if is_media_source_id(media_id) and not path.endswith(PLAYLIST_SUFFIXES):
+        return await _async_browse_folder(hass, media_id)
+
+    url = await resolve(media_id)
+    if url is None:
+        raise HomeAssistantError(f"Unable to resolve playlist: {media_id}")
+    text = await _async_fetch_text(hass, url)
+
+    if path.endswith(".pls") or text.lstrip().lower().startswith("[playlist]"):
+        entries = parse_pls(text)
+    else:
+        entries = parse_m3u(text)
+        if entries is None:
+            return None
+
+    items = [
+        PlaylistItem(
+            media_id=_join_location(media_id, url, location),
+            media_type=_guess_media_type(location),
+            title=title,
+        )
+        for location, title in entries[:_MAX_PLAYLIST_ITEMS]
+    ]
+    _LOGGER.debug("Loaded %d playlist items from %s", len(items), media_id)
+    return items
+
+
+def parse_m3u(text: str) -> list[tuple[str, str | None]] | None:
+    """Return (location, title) pairs, or None for an HLS media playlist."""
+    entries: list[tuple[str, str | None]] = []
+    title: str | None = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith("#EXT-X-"):
+            return None
+        if line.startswith("#EXTINF:"):
+            _, _, title = line.partition(",")
+            title = title.strip() or None
+            continue
+        if line.startswith("#"):
+            continue
+        entries.append((line, title))
+        title = None
+    return entries
+
+
+def parse_pls(text: str) -> list[tuple[str, str | None]]:
+    """Return (location, title) pairs from a PLS playlist."""
+    files: dict[int, str] = {}
+    titles: dict[int, str] = {}
+    for raw_line in text.splitlines():
+        key, sep, value = raw_line.strip().partition("=")
+        if not sep:
+            continue
+        key = key.strip().lower()
+        for prefix, target in (("file", files), ("title", titles)):
+            if key.startswith(prefix) and key[len(prefix) :].isdigit():
+                target[int(key[len(prefix) :])] = value.strip()
+    return [(files[index], titles.get(index)) for index in sorted(files)]
+
+
+async def _async_browse_folder(
+    hass: HomeAssistant, media_id: str
+) -> list[PlaylistItem]:
+    """Return the playable children of a media-source folder."""
+    folder = await async_browse_media(hass, media_id)
+    return [
+        PlaylistItem(
+            media_id=child.media_content_id,
+            media_type=child.media_content_type
+            or _guess_media_type(child.media_content_id),
+            title=child.title,
+        )
+        for child in folder.children or []
+        if child.can_play and not child.can_expand
+    ][:_MAX_PLAYLIST_ITEMS]
+
+
+async def _async_fetch_text(hass: HomeAssistant, url: str) -> str:
+    if url.startswith("/"):
+        url = f"{get_url(hass)}{url}"
+    session = async_get_clientsession(hass)
+    async with session.get(url, timeout=_FETCH_TIMEOUT) as resp:
+        resp.raise_for_status()
+        body = await resp.content.read(_MAX_PLAYLIST_BYTES + 1)
+    if len(body) > _MAX_PLAYLIST_BYTES:
+        raise HomeAssistantError(f"Playlist {url} is too large")
+    return body.decode("utf-8-sig", errors="replace")
+
+
+def _join_location(media_id: str, url: str, location: str) -> str:
+    """Make a playlist entry absolute relative to where the playlist lives.
+
+    Entries of a media-source playlist stay media-source IDs, so they are
+    signed when played instead of reusing the playlist's signature.
+    """
+    if urlparse(location).scheme:
+        return location
+    if is_media_source_id(media_id) and not location.startswith("/"):
+        scheme, _, path = media_id.partition("://")
+        location = location.replace("\\", "/")
+        joined = posixpath.join(posixpath.dirname(path), location)
+        return f"{scheme}://{posixpath.normpath(joined)}"
+    return urljoin(url, location)
+
+
+def _guess_media_type(location: str) -> str:
+    mime_type, _ = mimetypes.guess_type(urlparse(location).path)
+    return mime_type or "music"
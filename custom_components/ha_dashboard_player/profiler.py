@@ -0,0 +1,165 @@
+"""On-demand profiling of the HA Dashboard Player hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.service import async_register_admin_service
+
+from .const import (
+    DATA_PROFILING,
+    DEFAULT_PROFILE_DURATION,
+    DOMAIN,
+    MAX_PROFILE_DURATION,
+    PROFILE_MODES,
+    SERVICE_FIELD_DURATION,
+    SERVICE_FIELD_MODE,
+    SERVICE_PROFILE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_PACKAGE_PREFIX = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_SAMPLE_INTERVAL = 0.005
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            SERVICE_FIELD_DURATION, default=DEFAULT_PROFILE_DURATION
+        ): vol.All(vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)),
+        vol.Optional(SERVICE_FIELD_MODE, default=PROFILE_MODES[0]): vol.In(
+            PROFILE_MODES
+        ),
+    }
+)
+
+
+@callback
+def async_register_profile_service(hass: HomeAssistant) -> None:
+    """Register the admin-only profile service."""
+
+    async def _async_handle_profile(call: ServiceCall) -> None:
+        data = hass.data.setdefault(DOMAIN, {})
+        if data.get(DATA_PROFILING):
+            raise HomeAssistantError("A profile is already running")
+        data[DATA_PROFILING] = True
+        try:
+            path = await async_profile(
+                hass, call.data[SERVICE_FIELD_DURATION], call.data[SERVICE_FIELD_MODE]
+            )
+        finally:
+            data.pop(DATA_PROFILING, None)
+        _LOGGER.warning("Profile written to %s", path)
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_PROFILE, _async_handle_profile, PROFILE_SCHEMA
+    )
+
+
+async def async_profile(hass: HomeAssistant, duration: float, mode: str) -> str:
+    """Profile the integration for duration seconds and return the dump path.
+
+    sampling writes collapsed stacks for flamegraph.pl or speedscope, taken
+    from every thread whose stack runs through this integration. cprofile
+    profiles the event loop and keeps the functions of this integration
+    plus the functions they call directly, as a pstats file. Nothing is
+    hooked outside the window.
+    """
+    started = time.strftime("%Y%m%d-%H%M%S")
+    if mode == "cprofile":
+        path = hass.config.path(f"{DOMAIN}.profile.{started}.prof")
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Unable to start cProfile: {err}") from err
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+        await hass.async_add_executor_job(_dump_scoped_stats, profiler, path)
+        return path
+
+    path = hass.config.path(f"{DOMAIN}.profile.{started}.collapsed")
+    sampler = _StackSampler(_SAMPLE_INTERVAL)
+    sampler.start()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        sampler.stop()
+        await hass.async_add_executor_job(sampler.join)
+    await hass.async_add_executor_job(_write_collapsed, sampler.samples, path)
+    return path
+
+
+class _StackSampler(threading.Thread):
+    """Periodically record the stacks that pass through this integration."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name=f"{DOMAIN}_profiler", daemon=True)
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        """Stop sampling after the current sample."""
+        self._stopped.set()
+
+    def run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            # pylint: disable-next=protected-access
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                ours = False
+                while frame is not None:
+                    code = frame.f_code
+                    ours = ours or code.co_filename.startswith(_PACKAGE_PREFIX)
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                        f":{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                if ours:
+                    stack.append(names.get(ident, str(ident)))
+                    self.samples[";".join(reversed(stack))] += 1
+
+
+def _write_collapsed(samples: Counter[str], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for stack, count in samples.most_common():
+            handle.write(f"{stack} {count}\n")
+
+
+def _dump_scoped_stats(profiler: cProfile.Profile, path: str) -> None:
+    """Write the profile, limited to this integration and its direct callees."""
+    stats = pstats.Stats(profiler)
+    ours = {func for func in stats.stats if func[0].startswith(_PACKAGE_PREFIX)}
+    kept = {
+        func: value
+        for func, value in stats.stats.items()
+        if func in ours or ours.intersection(value[4])
+    }
+    stats.stats = {
+        func: (
+            *value[:4],
+            {caller: timing for caller, timing in value[4].items() if caller in kept},
+        )
+        for func, value in kept.items()
+    }
+    stats.dump_stats(path)
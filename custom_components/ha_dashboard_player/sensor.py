@@ -0,0 +1,163 @@
+"""Optional diagnostic sensors for HA Dashboard Player."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_NAME,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfDataRate,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .cache import get_media_cache
+from .const import (
+    CONF_METRICS_SENSORS,
+    DEFAULT_METRICS_SENSORS,
+    DEFAULT_NAME,
+    DOMAIN,
+)
+from .metrics import IntegrationMetrics, PlayerMetrics, get_metrics
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MetricsSensorDescription(SensorEntityDescription):
+    """Describe a sensor reading the integration metrics."""
+
+    value_fn: Callable[[MetricsSensor], Any]
+    attributes_fn: Callable[[MetricsSensor], dict[str, Any]] | None = None
+
+
+SENSORS: tuple[MetricsSensorDescription, ...] = (
+    MetricsSensorDescription(
+        key="report_rate",
+        name="Report rate",
+        native_unit_of_measurement="reports/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda sensor: sensor.player_metrics.reports.per_minute,
+        attributes_fn=lambda sensor: {
+            "reports_total": sensor.player_metrics.reports.total
+        },
+    ),
+    MetricsSensorDescription(
+        key="state_writes",
+        name="State writes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda sensor: sensor.player_metrics.state_writes,
+    ),
+    MetricsSensorDescription(
+        key="feedback_timeouts",
+        name="Feedback timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda sensor: sensor.player_metrics.feedback_timeouts,
+    ),
+    MetricsSensorDescription(
+        key="resolve_latency",
+        name="Resolve latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda sensor: sensor.player_metrics.resolve_latency.median,
+        attributes_fn=lambda sensor: sensor.player_metrics.resolve_latency.as_dict(),
+    ),
+    MetricsSensorDescription(
+        key="cache_hit_ratio",
+        name="Cache hit ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda sensor: sensor.metrics.cache_hit_ratio,
+        attributes_fn=lambda sensor: {
+            "cache_hits": sensor.metrics.cache_hits,
+            "cache_misses": sensor.metrics.cache_misses,
+        },
+    ),
+    MetricsSensorDescription(
+        key="downloads_in_flight",
+        name="Downloads in flight",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda sensor: get_media_cache(sensor.hass).downloads_in_flight,
+    ),
+    MetricsSensorDescription(
+        key="download_throughput",
+        name="Download throughput",
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.MEBIBYTES_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda sensor: sensor.metrics.download_throughput.median,
+        attributes_fn=lambda sensor: {
+            "bytes_downloaded": sensor.metrics.bytes_downloaded,
+            "downloads_completed": sensor.metrics.downloads_completed,
+            "downloads_failed": sensor.metrics.downloads_failed,
+            "download_duration_s": sensor.metrics.download_duration.as_dict(),
+        },
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
+) -> None:
+    """Set up the metrics sensors when enabled in the options."""
+    if not entry.options.get(CONF_METRICS_SENSORS, DEFAULT_METRICS_SENSORS):
+        return
+    async_add_entities(MetricsSensor(entry, description) for description in SENSORS)
+
+
+class MetricsSensor(SensorEntity):
+    """Expose one value of the integration metrics."""
+
+    entity_description: MetricsSensorDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    def __init__(
+        self, entry: ConfigEntry, description: MetricsSensorDescription
+    ) -> None:
+        self.entity_description = description
+        name = entry.options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME))
+        self._player_unique_id = f"{DOMAIN}_{entry.entry_id}"
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{self._player_unique_id}_{description.key}"
+
+    @property
+    def metrics(self) -> IntegrationMetrics:
+        """Return the metrics shared by the integration."""
+        return get_metrics(self.hass)
+
+    @property
+    def player_metrics(self) -> PlayerMetrics:
+        """Return the metrics of the player of this config entry."""
+        entity_id = er.async_get(self.hass).async_get_entity_id(
+            "media_player", DOMAIN, self._player_unique_id
+        )
+        return self.metrics.async_player(entity_id or self._player_unique_id)
+
+    @property
+    def native_value(self) -> Any:
+        """Return the current metric value."""
+        return self.entity_description.value_fn(self)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the detail behind the metric."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self)
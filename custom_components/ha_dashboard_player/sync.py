@@ -0,0 +1,176 @@
+"""Synchronized playback across several HA Dashboard Player displays."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.media_player.const import MediaPlayerState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PLAYERS, DOMAIN
+
+if TYPE_CHECKING:
+    from .media_player import HADashboardPlayer
+
+_LOGGER = logging.getLogger(__name__)
+
+START_LEAD = timedelta(seconds=2)
+DRIFT_CHECK_INTERVAL = timedelta(seconds=2)
+
+_SEEK_THRESHOLD = 1.0
+_RATE_NUDGE = 0.05
+_SAMPLE_MAX_AGE = 5.0
+
+
+class SyncGroup:
+    """Drive a leader player and its members from one shared timeline.
+
+    Commands are fanned out with a start timestamp slightly in the future so
+    every card begins at the same moment. Position reports from the cards
+    are compared against the timeline, and members that drift are nudged
+    with a temporary playback-rate change or, if far off, a seek.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        leader: HADashboardPlayer,
+        member_ids: list[str],
+        tolerance: float,
+    ) -> None:
+        self.hass = hass
+        self.leader = leader
+        self.member_ids = [
+            entity_id for entity_id in member_ids if entity_id != leader.entity_id
+        ]
+        self.tolerance = tolerance
+        self._origin: datetime | None = None
+        self._corrected_at: dict[str, datetime] = {}
+        self._unsub_check = None
+
+    @property
+    def players(self) -> list[HADashboardPlayer]:
+        """Return the leader followed by the members that are loaded."""
+        registry = self.hass.data.get(DOMAIN, {}).get(DATA_PLAYERS, {})
+        members = [
+            registry[entity_id]
+            for entity_id in self.member_ids
+            if entity_id in registry
+        ]
+        return [self.leader, *members]
+
+    @callback
+    def async_start(self) -> None:
+        """Start watching member drift."""
+        self._unsub_check = async_track_time_interval(
+            self.hass, self._async_check_drift, DRIFT_CHECK_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop watching member drift."""
+        if self._unsub_check is not None:
+            self._unsub_check()
+            self._unsub_check = None
+
+    async def async_play_media(self, media_type: str, media_id: str) -> None:
+        """Start the same media on every display at one shared moment."""
+        start_at = dt_util.utcnow() + START_LEAD
+        self._origin = start_at
+        self._corrected_at.clear()
+        await asyncio.gather(
+            *(
+                player.async_play_media(media_type, media_id, start_at=start_at)
+                for player in self.players
+            )
+        )
+
+    async def async_pause(self) -> None:
+        """Pause every display at the current timeline position."""
+        position = self._timeline_position(dt_util.utcnow())
+        self._origin = None
+        for player in self.players:
+            player.async_apply_sync("pause", position)
+
+    async def async_play(self) -> None:
+        """Resume every display from the paused position."""
+        position = self.leader.media_position or 0.0
+        await self._async_start_at(position, "play")
+
+    async def async_seek(self, position: float) -> None:
+        """Move every display to position at one shared moment."""
+        await self._async_start_at(position, "seek")
+
+    async def async_clear(self) -> None:
+        """Stop every member display."""
+        self._origin = None
+        for player in self.players[1:]:
+            player.async_apply_sync("stop")
+
+    async def _async_start_at(self, position: float, command: str) -> None:
+        start_at = dt_util.utcnow() + START_LEAD
+        self._corrected_at.clear()
+        if self.leader.state == MediaPlayerState.PLAYING or command == "play":
+            self._origin = start_at - timedelta(seconds=position)
+        for player in self.players:
+            player.async_apply_sync(command, position, start_at)
+
+    def _timeline_position(self, now: datetime) -> float | None:
+        """Return where the group should be, honouring looping media."""
+        if self._origin is None:
+            return self.leader.media_position
+        position = (now - self._origin).total_seconds()
+        duration = self.leader.media_duration
+        if self.leader.repeat in ("one", "all") and duration and duration > 0:
+            position %= duration
+        return position
+
+    @callback
+    def _async_check_drift(self, _now) -> None:
+        if self._origin is None or self.leader.state != MediaPlayerState.PLAYING:
+            return
+        now = dt_util.utcnow()
+        if now < self._origin:
+            return
+        expected = self._timeline_position(now)
+        if expected is None:
+            return
+
+        for player in self.players:
+            sample = player.position_sample
+            if sample is None:
+                continue
+            reported, reported_at = sample
+            age = (now - reported_at).total_seconds()
+            if age > _SAMPLE_MAX_AGE:
+                continue
+            corrected_at = self._corrected_at.get(player.entity_id)
+            if corrected_at is not None and reported_at <= corrected_at:
+                continue
+
+            skew = reported + age - expected
+            duration = self.leader.media_duration
+            if duration and duration > 0 and abs(skew) > duration / 2:
+                skew -= math.copysign(duration, skew)
+
+            if abs(skew) > _SEEK_THRESHOLD:
+                _LOGGER.debug("%s is %.2fs off, seeking", player.entity_id, skew)
+                player.async_send_command("seek", media_position=expected)
+            elif abs(skew) > self.tolerance:
+                player.async_send_command(
+                    "rate",
+                    rate=1 - math.copysign(_RATE_NUDGE, skew),
+                    duration=min(
+                        abs(skew) / _RATE_NUDGE,
+                        DRIFT_CHECK_INTERVAL.total_seconds(),
+                    ),
+                )
+            else:
+                continue
+            self._corrected_at[player.entity_id] = now
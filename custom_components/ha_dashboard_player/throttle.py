@@ -0,0 +1,90 @@
+"""Bandwidth limit for background cache downloads."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import time as dt_time
+
+from homeassistant.core import callback
+
+# Bucket depth in seconds of the current rate.
+_BURST_SECONDS = 1.0
+# Longest single wait, so limit and window changes are picked up quickly.
+_MAX_WAIT = 1.0
+
+
+@dataclass(frozen=True)
+class BandwidthPolicy:
+    """Background download limit of one config entry.
+
+    limit is in bytes per second and 0 means unlimited. Between
+    window_start and window_end, which may span midnight, the limit is
+    lifted.
+    """
+
+    limit: int
+    window_start: dt_time | None = None
+    window_end: dt_time | None = None
+
+    def current_limit(self, now: dt_time) -> int:
+        """Return the limit that applies at local time now."""
+        start, end = self.window_start, self.window_end
+        if start is None or end is None or start == end:
+            return self.limit
+        if start < end:
+            in_window = start <= now < end
+        else:
+            in_window = now >= start or now < end
+        return 0 if in_window else self.limit
+
+
+class TokenBucket:
+    """Share one bandwidth budget between all cache downloads.
+
+    Background downloads wait for tokens before each chunk. Foreground
+    downloads never wait but still spend tokens, so queued background
+    transfers back off while something is being played.
+    """
+
+    def __init__(self, rate: Callable[[], int]) -> None:
+        self._rate = rate
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    @callback
+    def async_spend(self, nbytes: int) -> None:
+        """Charge a foreground transfer without waiting."""
+        if rate := self._rate():
+            self._refill(rate)
+            self._tokens -= nbytes
+
+    async def async_consume(
+        self, nbytes: int, promoted: asyncio.Event | None = None
+    ) -> None:
+        """Wait until nbytes fit into the budget, then charge them.
+
+        The wait ends as soon as promoted is set, because the download is
+        now needed in the foreground.
+        """
+        while rate := self._rate():
+            self._refill(rate)
+            if self._tokens >= 0 or (promoted is not None and promoted.is_set()):
+                self._tokens -= nbytes
+                return
+            delay = min(-self._tokens / rate, _MAX_WAIT)
+            if promoted is None:
+                await asyncio.sleep(delay)
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(promoted.wait(), delay)
+
+    def _refill(self, rate: int) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * rate, rate * _BURST_SECONDS
+        )
+        self._updated = now
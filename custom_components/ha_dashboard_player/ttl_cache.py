@@ -0,0 +1,48 @@
+"""Small in-memory caches for HA Dashboard Player."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TTLCache(Generic[_T]):
+    """LRU cache whose entries expire after a time-to-live in seconds."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._items: OrderedDict[str, tuple[float, _T]] = OrderedDict()
+
+    def get(self, key: str) -> _T | None:
+        """Return the value for key, or None if it is missing or expired."""
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires <= time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: _T, ttl: float | None = None) -> None:
+        """Store value for at most ttl seconds (and never beyond the default)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._items.pop(key, None)
+            return
+        self._items[key] = (time.monotonic() + ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,136 @@
+"""HTTP view serving the media cache with Range support."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+
+from .cache import DownloadProgress, MediaCache
+from .const import CACHE_VIEW_URL, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 256 * 1024
+
+
+class CacheView(HomeAssistantView):
+    """Serve cached media, streaming files that are still downloading.
+
+    Complete files go through FileResponse, which answers Range requests
+    and uses sendfile. While a download is in flight the bytes already on
+    disk are served and the response follows the download as it grows.
+    Requests need auth; players publish signed paths, which media elements
+    can load without an auth header.
+    """
+
+    url = CACHE_VIEW_URL + "/{filename}"
+    name = f"api:{DOMAIN}:cache"
+
+    def __init__(self, cache: MediaCache) -> None:
+        self._cache = cache
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Return a cached file or the in-flight download behind it."""
+        await self._cache.index.async_load()
+        if not self._cache.async_servable(filename):
+            raise web.HTTPNotFound
+
+        # Counted until the response is sent, so the file is not rewritten
+        # or deleted underneath it.
+        release = self._cache.async_open_reader(filename)
+        try:
+            return await self._async_serve(request, filename)
+        finally:
+            release()
+
+    async def _async_serve(
+        self, request: web.Request, filename: str
+    ) -> web.StreamResponse:
+        progress = self._cache.async_progress(filename)
+        if progress is not None and progress.path is not None and not progress.done:
+            try:
+                fd = await asyncio.to_thread(os.open, progress.path, os.O_RDONLY)
+            except FileNotFoundError:
+                # The download finished between the lookup and the open.
+                pass
+            else:
+                try:
+                    return await _async_stream_download(request, progress, fd)
+                finally:
+                    await asyncio.to_thread(os.close, fd)
+
+        path = self._cache.cache_dir / filename
+        if not await asyncio.to_thread(path.is_file):
+            raise web.HTTPNotFound
+        headers = {hdrs.CACHE_CONTROL: "no-cache"}
+        if content_type := self._cache.async_content_type(filename):
+            headers[hdrs.CONTENT_TYPE] = content_type
+        response = web.FileResponse(path, headers=headers)
+        await response.prepare(request)
+        return response
+
+
+async def _async_stream_download(
+    request: web.Request, progress: DownloadProgress, fd: int
+) -> web.StreamResponse:
+    """Stream a file that is still being written, following its growth."""
+    size = progress.size
+    start, end = 0, size
+    status = 200
+    try:
+        http_range = request.http_range
+    except ValueError as err:
+        raise web.HTTPRequestRangeNotSatisfiable from err
+    if size and (http_range.start is not None or http_range.stop is not None):
+        start = http_range.start or 0
+        if start < 0:
+            start = max(size + start, 0)
+        end = min(http_range.stop or size, size)
+        if start >= end:
+            raise web.HTTPRequestRangeNotSatisfiable(
+                headers={hdrs.CONTENT_RANGE: f"bytes */{size}"}
+            )
+        status = 206
+
+    response = web.StreamResponse(status=status)
+    response.content_type = progress.content_type or "application/octet-stream"
+    response.headers[hdrs.ACCEPT_RANGES] = "bytes" if size else "none"
+    response.headers[hdrs.CACHE_CONTROL] = "no-store"
+    if end is not None:
+        response.content_length = end - start
+    if status == 206:
+        response.headers[hdrs.CONTENT_RANGE] = f"bytes {start}-{end - 1}/{size}"
+    await response.prepare(request)
+
+    position = start
+    while end is None or position < end:
+        available = await progress.async_wait(position + 1)
+        if progress.error is not None or available <= position:
+            break
+        limit = available if end is None else min(available, end)
+        chunk = b""
+        while position < limit:
+            chunk = await asyncio.to_thread(
+                os.pread, fd, min(_CHUNK_SIZE, limit - position), position
+            )
+            if not chunk:
+                break
+            await response.write(chunk)
+            position += len(chunk)
+        if not chunk:
+            break
+
+    if end is not None and position < end:
+        _LOGGER.debug(
+            "Download of %s ended after %d of %d bytes", request.path, position, end
+        )
+        if request.transport is not None:
+            request.transport.close()
+        return response
+    await response.write_eof()
+    return response
@@ -0,0 +1,98 @@
+"""Feedback watchdog shared by all HA Dashboard Player entities."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from typing import Protocol
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_WATCHDOG, DOMAIN
+
+
+class FeedbackTarget(Protocol):
+    """A player whose card feedback is being watched."""
+
+    @callback
+    def async_feedback_timeout(self) -> None:
+        """Handle feedback that stopped arriving."""
+
+
+class FeedbackWatchdog:
+    """Track feedback deadlines for all players with a single timer.
+
+    Every report only moves the player's deadline. Deadlines live in a heap
+    and superseded heap entries are skipped when they surface, so the loop
+    wakes once per expiry instead of re-arming a timer per report.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._deadlines: dict[FeedbackTarget, float] = {}
+        self._heap: list[tuple[float, int, FeedbackTarget]] = []
+        self._counter = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_when: float | None = None
+
+    @callback
+    def async_touch(self, target: FeedbackTarget, timeout: float) -> None:
+        """Push target's deadline timeout seconds into the future."""
+        deadline = self.hass.loop.time() + timeout
+        self._deadlines[target] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), target))
+        if self._timer_when is None or deadline < self._timer_when:
+            self._async_schedule(deadline)
+
+    @callback
+    def async_cancel(self, target: FeedbackTarget) -> None:
+        """Stop watching target."""
+        self._deadlines.pop(target, None)
+        if not self._deadlines:
+            self._heap.clear()
+            self._async_unschedule()
+
+    @callback
+    def _async_schedule(self, when: float) -> None:
+        self._async_unschedule()
+        self._timer_when = when
+        self._timer = self.hass.loop.call_at(when, self._async_expire)
+
+    @callback
+    def _async_unschedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._timer_when = None
+
+    @callback
+    def _async_expire(self) -> None:
+        self._timer = None
+        self._timer_when = None
+        now = self.hass.loop.time()
+        expired: list[FeedbackTarget] = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, target = heapq.heappop(self._heap)
+            if self._deadlines.get(target) == deadline:
+                del self._deadlines[target]
+                expired.append(target)
+
+        # Drop superseded entries so the next wake-up is a live deadline.
+        while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if self._heap:
+            self._async_schedule(self._heap[0][0])
+
+        for target in expired:
+            target.async_feedback_timeout()
+
+
+@callback
+def get_feedback_watchdog(hass: HomeAssistant) -> FeedbackWatchdog:
+    """Return the watchdog shared by all players."""
+    data = hass.data.setdefault(DOMAIN, {})
+    watchdog: FeedbackWatchdog | None = data.get(DATA_WATCHDOG)
+    if watchdog is None:
+        watchdog = data[DATA_WATCHDOG] = FeedbackWatchdog(hass)
+    return watchdog
@@ -0,0 +1,110 @@
+"""Websocket API used by the HA Dashboard Player card."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.auth.permissions.const import POLICY_CONTROL
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    DATA_PLAYERS,
+    DOMAIN,
+    SERVICE_FIELD_IS_VOLUME_MUTED,
+    SERVICE_FIELD_MEDIA_DURATION,
+    SERVICE_FIELD_MEDIA_POSITION,
+    SERVICE_FIELD_REPEAT,
+    SERVICE_FIELD_SHUFFLE,
+    SERVICE_FIELD_STATE,
+    SERVICE_FIELD_VOLUME_LEVEL,
+    SIGNAL_PLAYER_COMMAND,
+    WS_TYPE_REPORT_STATE,
+    WS_TYPE_SUBSCRIBE,
+)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the card feedback and command channel."""
+    websocket_api.async_register_command(hass, websocket_report_state)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_REPORT_STATE,
+        vol.Required("entity_id"): cv.entity_id,
+        # Same validators as the report_state service the card falls back to.
+        vol.Optional(SERVICE_FIELD_STATE): cv.string,
+        vol.Optional(SERVICE_FIELD_MEDIA_POSITION): vol.Coerce(float),
+        vol.Optional(SERVICE_FIELD_MEDIA_DURATION): vol.Coerce(float),
+        vol.Optional(SERVICE_FIELD_VOLUME_LEVEL): vol.Coerce(float),
+        vol.Optional(SERVICE_FIELD_IS_VOLUME_MUTED): cv.boolean,
+        vol.Optional(SERVICE_FIELD_REPEAT): cv.string,
+        vol.Optional(SERVICE_FIELD_SHUFFLE): cv.boolean,
+    }
+)
+@callback
+def websocket_report_state(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Apply playback feedback from a card without a service call."""
+    _check_control(connection, msg["entity_id"])
+    player = hass.data.get(DOMAIN, {}).get(DATA_PLAYERS, {}).get(msg["entity_id"])
+    if player is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Dashboard player not found"
+        )
+        return
+
+    feedback = {
+        key: value
+        for key, value in msg.items()
+        if key not in ("id", "type", "entity_id")
+    }
+    player.async_handle_feedback(**feedback)
+    connection.send_result(msg["id"])
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE,
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Forward playback commands for a player to the card."""
+    _check_control(connection, msg["entity_id"])
+    if msg["entity_id"] not in hass.data.get(DOMAIN, {}).get(DATA_PLAYERS, {}):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Dashboard player not found"
+        )
+        return
+
+    @callback
+    def _forward_command(command: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], command))
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_PLAYER_COMMAND.format(msg["entity_id"]), _forward_command
+    )
+    connection.send_result(msg["id"])
+
+
+def _check_control(connection: websocket_api.ActiveConnection, entity_id: str) -> None:
+    """Require the same permission as the player's entity services."""
+    if not connection.user.permissions.check_entity(entity_id, POLICY_CONTROL):
+        raise Unauthorized(entity_id=entity_id, permission=POLICY_CONTROL)
@@ -0,0 +1 @@
+"""Tests for the HA Dashboard Player integration."""
@@ -0,0 +1,108 @@
+"""Fixtures for the HA Dashboard Player tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_dashboard_player.cache import MediaCache
+
+
+@dataclass
+class OriginFile:
+    """A file served by the test origin."""
+
+    body: bytes
+    etag: str | None = None
+    content_type: str = "video/mp4"
+
+
+@dataclass
+class Origin:
+    """HTTP server standing in for a media origin.
+
+    Full responses stop after pause_at bytes until resume is set. Range
+    requests starting at an offset in fail_ranges answer 500.
+    """
+
+    server: TestServer
+    files: dict[str, OriginFile] = field(default_factory=dict)
+    requests: list[tuple[str, dict[str, str]]] = field(default_factory=list)
+    pause_at: int | None = None
+    resume: asyncio.Event = field(default_factory=asyncio.Event)
+    fail_ranges: set[int] = field(default_factory=set)
+
+    def url(self, path: str) -> str:
+        """Return the absolute URL of path."""
+        return str(self.server.make_url(path))
+
+    def count(self, path: str) -> int:
+        """Return the number of requests for path."""
+        return sum(1 for requested, _ in self.requests if requested == path)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve a file with ETag, conditional and Range support."""
+        self.requests.append((request.path, dict(request.headers)))
+        if (item := self.files.get(request.path)) is None:
+            raise web.HTTPNotFound
+        headers = {hdrs.ACCEPT_RANGES: "bytes"}
+        if item.etag:
+            headers[hdrs.ETAG] = item.etag
+            if request.headers.get(hdrs.IF_NONE_MATCH) == item.etag:
+                return web.Response(status=304, headers=headers)
+
+        if_range = request.headers.get(hdrs.IF_RANGE)
+        if hdrs.RANGE in request.headers and if_range in (None, item.etag):
+            start = request.http_range.start or 0
+            stop = min(request.http_range.stop or len(item.body), len(item.body))
+            if start in self.fail_ranges:
+                raise web.HTTPInternalServerError
+            headers[hdrs.CONTENT_RANGE] = f"bytes {start}-{stop - 1}/{len(item.body)}"
+            return web.Response(
+                status=206,
+                body=item.body[start:stop],
+                headers=headers,
+                content_type=item.content_type,
+            )
+
+        response = web.StreamResponse(headers=headers)
+        response.content_type = item.content_type
+        response.content_length = len(item.body)
+        await response.prepare(request)
+        if self.pause_at is not None:
+            await response.write(item.body[: self.pause_at])
+            await self.resume.wait()
+            await response.write(item.body[self.pause_at :])
+        else:
+            await response.write(item.body)
+        await response.write_eof()
+        return response
+
+
+@pytest.fixture
+async def origin(socket_enabled: None) -> AsyncIterator[Origin]:
+    """Start a media origin on localhost."""
+    app = web.Application()
+    server = TestServer(app)
+    result = Origin(server)
+    app.router.add_get("/{path:.*}", result.handle)
+    await server.start_server()
+    yield result
+    result.resume.set()
+    await server.close()
+
+
+@pytest.fixture
+async def cache(hass: HomeAssistant, tmp_path: Path) -> MediaCache:
+    """Return a loaded media cache in a temporary directory."""
+    media_cache = MediaCache(hass, tmp_path / "cache")
+    await media_cache.index.async_load()
+    return media_cache
@@ -0,0 +1,282 @@
+"""Tests for the integration-wide media cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.ha_dashboard_player import cache as cache_module
+from custom_components.ha_dashboard_player.cache import MediaCache
+from custom_components.ha_dashboard_player.images import ImageSpec
+
+from .conftest import Origin, OriginFile
+
+BODY = bytes(range(256)) * 8
+
+
+async def _wait_for(predicate, timeout: float = 5) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def _revalidated(cache: MediaCache) -> None:
+    """Wait for the revalidations that are running."""
+    # pylint: disable-next=protected-access
+    await asyncio.gather(*cache._revalidations.values())
+
+
+def _age(entry, seconds: float) -> None:
+    entry.last_validated = time.time() - seconds
+
+
+async def test_concurrent_requests_download_once(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """Callers asking for the same URL share one download."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    origin.pause_at = 10
+    url = origin.url("/video.mp4")
+
+    first = asyncio.ensure_future(cache.async_cache_entry(url))
+    second = asyncio.ensure_future(cache.async_cache_entry(url))
+    await _wait_for(lambda: origin.count("/video.mp4") == 1)
+    origin.resume.set()
+
+    assert await first is await second
+    assert origin.count("/video.mp4") == 1
+    assert (cache.cache_dir / (await first).filename).read_bytes() == BODY
+
+
+async def test_cancelled_preload_stops_its_download(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """A background download is cancelled with the last caller waiting for it."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    origin.pause_at = 10
+    url = origin.url("/video.mp4")
+
+    preload = asyncio.ensure_future(cache.async_cache_entry(url, background=True))
+    await _wait_for(lambda: origin.count("/video.mp4") == 1)
+    preload.cancel()
+
+    await _wait_for(lambda: cache.downloads_in_flight == 0)
+    assert cache.index.entry_count == 0
+    assert not any(cache.cache_dir.iterdir())
+
+
+async def test_playback_keeps_a_joined_preload_running(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """Cancelling a preload does not cancel playback waiting for the same file."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    origin.pause_at = 10
+    url = origin.url("/video.mp4")
+
+    preload = asyncio.ensure_future(cache.async_cache_entry(url, background=True))
+    await _wait_for(lambda: origin.count("/video.mp4") == 1)
+    playback = asyncio.ensure_future(cache.async_cache_entry(url))
+    await asyncio.sleep(0)
+    preload.cancel()
+    origin.resume.set()
+
+    entry = await playback
+    assert origin.count("/video.mp4") == 1
+    assert (cache.cache_dir / entry.filename).read_bytes() == BODY
+
+
+async def test_revalidation_keeps_an_unchanged_file(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """A 304 answer only records that the cached copy is current."""
+    origin.files["/video.mp4"] = OriginFile(BODY, etag='"v1"')
+    url = origin.url("/video.mp4")
+    entry = await cache.async_cache_entry(url)
+    _age(entry, 120)
+
+    assert await cache.async_cache_entry(url) is entry
+    await _revalidated(cache)
+
+    assert origin.requests[-1][1]["If-None-Match"] == '"v1"'
+    assert time.time() - entry.last_validated < 10
+    assert cache.index.async_get(url) is entry
+
+
+async def test_revalidation_publishes_a_changed_file_under_a_new_name(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """A changed file never overwrites the copy a player still shows."""
+    origin.files["/video.mp4"] = OriginFile(BODY, etag='"v1"')
+    url = origin.url("/video.mp4")
+    old = await cache.async_cache_entry(url)
+    cache.async_pin("player", old.local_url)
+    _age(old, 120)
+    origin.files["/video.mp4"] = OriginFile(BODY[::-1], etag='"v2"')
+
+    await cache.async_cache_entry(url)
+    await _revalidated(cache)
+
+    fresh = cache.index.async_get(url)
+    assert fresh.etag == '"v2"'
+    assert fresh.filename != old.filename
+    assert (cache.cache_dir / fresh.filename).read_bytes() == BODY[::-1]
+    assert (cache.cache_dir / old.filename).read_bytes() == BODY
+    assert cache.async_servable(old.filename)
+
+    cache.async_pin("player", fresh.local_url)
+    # pylint: disable-next=protected-access
+    await cache._async_sweep(None)
+    assert not (cache.cache_dir / old.filename).exists()
+    assert not cache.async_servable(old.filename)
+
+
+async def test_expired_file_is_downloaded_under_a_new_name(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """Files without validators are fetched again after their maximum age."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    url = origin.url("/video.mp4")
+    old = await cache.async_cache_entry(url)
+    cache.async_pin("player", old.local_url)
+    _age(old, 2 * 60 * 60)
+
+    fresh = await cache.async_cache_entry(url)
+
+    assert origin.count("/video.mp4") == 2
+    assert fresh.filename != old.filename
+    assert (cache.cache_dir / old.filename).exists()
+
+
+async def test_eviction_skips_pinned_files(cache: MediaCache, origin: Origin) -> None:
+    """The least recently used file goes first, unless a player shows it."""
+    unregister = cache.async_register("entry", 0, 2)
+    entries = {}
+    for name in ("a", "b"):
+        origin.files[f"/{name}.mp4"] = OriginFile(BODY)
+        entries[name] = await cache.async_cache_entry(origin.url(f"/{name}.mp4"))
+    cache.async_pin("player", entries["a"].local_url)
+
+    origin.files["/c.mp4"] = OriginFile(BODY)
+    await cache.async_cache_entry(origin.url("/c.mp4"))
+
+    remaining = {entry.filename for entry in cache.index.least_recently_used()}
+    assert entries["a"].filename in remaining
+    assert entries["b"].filename not in remaining
+    assert not (cache.cache_dir / entries["b"].filename).exists()
+
+    cache.async_pin("player", None)
+    cache.async_register("entry", 0, 1)
+    assert await cache.async_evict() == 1
+    assert not (cache.cache_dir / entries["a"].filename).exists()
+    unregister()
+
+
+async def test_segmented_download_resumes(
+    cache: MediaCache, origin: Origin, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Segments fetched before a failure are not downloaded again."""
+    monkeypatch.setattr(cache_module, "_SEGMENTED_MIN_SIZE", 1024)
+    monkeypatch.setattr(cache_module, "_SEGMENT_SIZE", 512)
+    monkeypatch.setattr(cache_module, "_SEGMENT_CONNECTIONS", 1)
+    origin.files["/video.mp4"] = OriginFile(BODY, etag='"v1"')
+    origin.fail_ranges = {1024}
+    url = origin.url("/video.mp4")
+
+    with pytest.raises(Exception):
+        await cache.async_cache_entry(url)
+    assert cache.index.entry_count == 0
+
+    origin.fail_ranges = set()
+    origin.requests.clear()
+    entry = await cache.async_cache_entry(url)
+
+    ranges = [headers["Range"] for _, headers in origin.requests if "Range" in headers]
+    assert ranges == ["bytes=1024-1535", "bytes=1536-2047"]
+    assert all(
+        headers.get("If-Range") == '"v1"'
+        for _, headers in origin.requests
+        if "Range" in headers
+    )
+    assert (cache.cache_dir / entry.filename).read_bytes() == BODY
+    assert [path.name for path in cache.cache_dir.iterdir()] == [entry.filename]
+
+
+async def test_segmented_download_restarts_when_the_file_changed(
+    cache: MediaCache, origin: Origin, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Segments of an older version are discarded."""
+    monkeypatch.setattr(cache_module, "_SEGMENTED_MIN_SIZE", 1024)
+    monkeypatch.setattr(cache_module, "_SEGMENT_SIZE", 512)
+    monkeypatch.setattr(cache_module, "_SEGMENT_CONNECTIONS", 1)
+    origin.files["/video.mp4"] = OriginFile(BODY, etag='"v1"')
+    origin.fail_ranges = {1024}
+    url = origin.url("/video.mp4")
+    with pytest.raises(Exception):
+        await cache.async_cache_entry(url)
+
+    origin.files["/video.mp4"] = OriginFile(BODY[::-1], etag='"v2"')
+    origin.fail_ranges = set()
+    origin.requests.clear()
+    entry = await cache.async_cache_entry(url)
+
+    ranges = [headers["Range"] for _, headers in origin.requests if "Range" in headers]
+    assert len(ranges) == 4
+    assert (cache.cache_dir / entry.filename).read_bytes() == BODY[::-1]
+
+
+async def test_queued_preloads_wait_for_a_slot(
+    cache: MediaCache, origin: Origin
+) -> None:
+    """At most two queued background downloads run at the same time."""
+    for name in ("a", "b", "c"):
+        origin.files[f"/{name}.mp4"] = OriginFile(BODY)
+    origin.pause_at = 10
+
+    preloads = [
+        asyncio.ensure_future(
+            cache.async_cache_entry(origin.url(f"/{name}.mp4"), background=True)
+        )
+        for name in ("a", "b", "c")
+    ]
+    await _wait_for(lambda: len(origin.requests) == 2)
+    await asyncio.sleep(0.05)
+    assert len(origin.requests) == 2
+
+    playback = asyncio.ensure_future(cache.async_cache_entry(origin.url("/c.mp4")))
+    await _wait_for(lambda: origin.count("/c.mp4") == 1)
+    origin.resume.set()
+    await asyncio.gather(playback, *preloads)
+    assert cache.index.entry_count == 3
+
+
+async def test_passthrough_is_forgotten_with_its_source(
+    cache: MediaCache, origin: Origin, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Images served as they are get checked again once downloaded again."""
+    renders = []
+
+    def _render(source, cache_dir, stem, spec):
+        renders.append(source.name)
+
+    monkeypatch.setattr(cache_module, "render_derivative", _render)
+    spec = ImageSpec(1920, 1080, "original", 85)
+    origin.files["/a.jpg"] = OriginFile(BODY, etag='"v1"', content_type="image/jpeg")
+    url = origin.url("/a.jpg")
+    entry = await cache.async_cache_entry(url)
+
+    assert await cache.async_derivative(entry, spec) is entry
+    assert await cache.async_derivative(entry, spec) is entry
+    assert len(renders) == 1
+
+    unregister = cache.async_register("entry", 0, 1)
+    origin.files["/b.jpg"] = OriginFile(BODY, content_type="image/jpeg")
+    await cache.async_cache_entry(origin.url("/b.jpg"))
+    assert cache.index.async_get(url) is None
+    assert not cache._passthrough  # pylint: disable=protected-access
+
+    entry = await cache.async_cache_entry(url)
+    assert await cache.async_derivative(entry, spec) is entry
+    assert len(renders) == 2
+    unregister()
@@ -0,0 +1,201 @@
+"""Tests for the fast-start MP4 rewriter."""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from custom_components.ha_dashboard_player.faststart import (
+    FastStartError,
+    make_faststart,
+)
+
+FIRST_CHUNK = b"A" * 100
+SECOND_CHUNK = b"B" * 50
+
+
+def _atom(name: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), name) + payload
+
+
+def _large_atom(name: bytes, payload: bytes) -> bytes:
+    """Return an atom using the 64-bit size field."""
+    return struct.pack(">I4sQ", 1, name, 16 + len(payload)) + payload
+
+
+def _chunk_table(name: bytes, offsets: list[int]) -> bytes:
+    fmt = ">Q" if name == b"co64" else ">I"
+    body = struct.pack(">II", 0, len(offsets))
+    body += b"".join(struct.pack(fmt, offset) for offset in offsets)
+    return _atom(name, body)
+
+
+def _moov(table: bytes) -> bytes:
+    stbl = _atom(b"stbl", _atom(b"stsd", b"\0" * 16) + table)
+    trak = _atom(b"trak", _atom(b"mdia", _atom(b"minf", stbl)))
+    return _atom(b"moov", _atom(b"mvhd", b"\0" * 100) + trak)
+
+
+def _ftyp() -> bytes:
+    return _atom(b"ftyp", b"isom\0\0\0\0isomavc1")
+
+
+def _slow_start_file(table: bytes = b"stco", large_mdat: bool = False) -> bytes:
+    """Return ftyp, mdat, moov with chunk offsets pointing into mdat."""
+    ftyp = _ftyp()
+    header = 16 if large_mdat else 8
+    first = len(ftyp) + header
+    offsets = [first, first + len(FIRST_CHUNK)]
+    wrap = _large_atom if large_mdat else _atom
+    mdat = wrap(b"mdat", FIRST_CHUNK + SECOND_CHUNK)
+    return ftyp + mdat + _moov(_chunk_table(table, offsets))
+
+
+def _top_level(data: bytes) -> list[bytes]:
+    names = []
+    offset = 0
+    while offset < len(data):
+        size, name = struct.unpack_from(">I4s", data, offset)
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, offset + 8)
+        names.append(name)
+        offset += size
+    return names
+
+
+def _chunk_offsets(data: bytes, table: bytes) -> list[int]:
+    start = data.index(table) + 4
+    (count,) = struct.unpack_from(">I", data, start + 4)
+    fmt, width = (">Q", 8) if table == b"co64" else (">I", 4)
+    return [
+        struct.unpack_from(fmt, data, start + 8 + index * width)[0]
+        for index in range(count)
+    ]
+
+
+def _write(tmp_path: Path, data: bytes) -> Path:
+    path = tmp_path / "video.mp4"
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.parametrize("table", [b"stco", b"co64"])
+def test_moves_moov_and_patches_offsets(tmp_path: Path, table: bytes) -> None:
+    """moov moves in front of mdat and chunk offsets follow the data."""
+    original = _slow_start_file(table)
+    path = _write(tmp_path, original)
+
+    assert make_faststart(path) is True
+
+    data = path.read_bytes()
+    assert len(data) == len(original)
+    assert _top_level(data) == [b"ftyp", b"moov", b"mdat"]
+    first, second = _chunk_offsets(data, table)
+    assert data[first : first + len(FIRST_CHUNK)] == FIRST_CHUNK
+    assert data[second : second + len(SECOND_CHUNK)] == SECOND_CHUNK
+
+
+def test_large_mdat_header(tmp_path: Path) -> None:
+    """An mdat with a 64-bit size is parsed and moved behind moov."""
+    path = _write(tmp_path, _slow_start_file(large_mdat=True))
+
+    assert make_faststart(path) is True
+
+    data = path.read_bytes()
+    assert _top_level(data) == [b"ftyp", b"moov", b"mdat"]
+    first, second = _chunk_offsets(data, b"stco")
+    assert data[first : first + len(FIRST_CHUNK)] == FIRST_CHUNK
+    assert data[second : second + len(SECOND_CHUNK)] == SECOND_CHUNK
+
+
+def test_offsets_before_mdat_are_kept(tmp_path: Path) -> None:
+    """Chunks stored before the insertion point do not move."""
+    ftyp = _ftyp()
+    early = _atom(b"free", FIRST_CHUNK)
+    early_offset = len(ftyp) + 8
+    mdat_offset = len(ftyp) + len(early) + 8
+    mdat = _atom(b"mdat", SECOND_CHUNK)
+    moov = _moov(_chunk_table(b"stco", [early_offset, mdat_offset]))
+    path = _write(tmp_path, ftyp + early + mdat + moov)
+
+    assert make_faststart(path) is True
+
+    data = path.read_bytes()
+    first, second = _chunk_offsets(data, b"stco")
+    assert first == early_offset
+    assert data[second : second + len(SECOND_CHUNK)] == SECOND_CHUNK
+
+
+def test_rewrite_to_target(tmp_path: Path) -> None:
+    """With a target the source file is left as it was."""
+    original = _slow_start_file()
+    path = _write(tmp_path, original)
+    target = tmp_path / "video.faststart.mp4"
+
+    assert make_faststart(path, target) is True
+
+    assert path.read_bytes() == original
+    data = target.read_bytes()
+    assert _top_level(data) == [b"ftyp", b"moov", b"mdat"]
+    first, _ = _chunk_offsets(data, b"stco")
+    assert data[first : first + len(FIRST_CHUNK)] == FIRST_CHUNK
+    assert sorted(item.name for item in tmp_path.iterdir()) == [
+        "video.faststart.mp4",
+        "video.mp4",
+    ]
+
+
+def test_already_fast_start(tmp_path: Path) -> None:
+    """A file whose moov comes first is left untouched."""
+    moov = _moov(_chunk_table(b"stco", [0]))
+    original = _ftyp() + moov + _atom(b"mdat", FIRST_CHUNK)
+    path = _write(tmp_path, original)
+
+    assert make_faststart(path) is False
+    assert path.read_bytes() == original
+
+
+def test_fragmented_file_is_skipped(tmp_path: Path) -> None:
+    """Fragmented MP4 files are not rewritten."""
+    original = (
+        _ftyp()
+        + _atom(b"mdat", FIRST_CHUNK)
+        + _atom(b"moof", b"\0" * 8)
+        + _moov(_chunk_table(b"stco", [0]))
+    )
+    path = _write(tmp_path, original)
+
+    assert make_faststart(path) is False
+    assert path.read_bytes() == original
+
+
+def test_compressed_moov_is_rejected(tmp_path: Path) -> None:
+    """A compressed movie header cannot be patched."""
+    moov = _atom(b"moov", _atom(b"cmov", b"\0" * 16))
+    original = _ftyp() + _atom(b"mdat", FIRST_CHUNK) + moov
+    path = _write(tmp_path, original)
+
+    with pytest.raises(FastStartError):
+        make_faststart(path)
+    assert path.read_bytes() == original
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_truncated_atom_is_rejected(tmp_path: Path) -> None:
+    """An atom that claims more bytes than the file has is an error."""
+    data = _slow_start_file()
+    path = _write(tmp_path, data[:-10])
+
+    with pytest.raises(FastStartError):
+        make_faststart(path)
+
+
+def test_corrupt_chunk_table_is_rejected(tmp_path: Path) -> None:
+    """A chunk table whose count exceeds its atom is an error."""
+    table = _atom(b"stco", struct.pack(">II", 0, 1000))
+    path = _write(tmp_path, _ftyp() + _atom(b"mdat", FIRST_CHUNK) + _moov(table))
+
+    with pytest.raises(FastStartError):
+        make_faststart(path)
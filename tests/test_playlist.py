@@ -0,0 +1,189 @@
+"""Tests for playlist parsing and the play queue."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.ha_dashboard_player.playlist import (
+    PlaylistItem,
+    PlaylistQueue,
+    _join_location,
+    is_playlist_media,
+    parse_m3u,
+    parse_pls,
+)
+
+
+def _queue(count: int, shuffle: bool = False) -> PlaylistQueue:
+    items = [PlaylistItem(f"item{index}", "video/mp4") for index in range(count)]
+    return PlaylistQueue("playlist", items, shuffle)
+
+
+def _ids(items: list[PlaylistItem]) -> list[str]:
+    return [item.media_id for item in items]
+
+
+def test_parse_m3u() -> None:
+    """Titles from EXTINF apply to the next entry only."""
+    text = (
+        "#EXTM3U\n"
+        "\n"
+        "#EXTINF:10,Intro\n"
+        "intro.mp4\n"
+        "# a comment\n"
+        "https://example.com/b.mp4\n"
+        "#EXTINF:-1,\n"
+        "  c.mp3  \n"
+    )
+    assert parse_m3u(text) == [
+        ("intro.mp4", "Intro"),
+        ("https://example.com/b.mp4", None),
+        ("c.mp3", None),
+    ]
+
+
+def test_parse_m3u_hls() -> None:
+    """HLS media playlists are not treated as play queues."""
+    text = "#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXTINF:6,\nsegment0.ts\n"
+    assert parse_m3u(text) is None
+
+
+def test_parse_pls() -> None:
+    """Entries are ordered by number and keys are case-insensitive."""
+    text = (
+        "[playlist]\n"
+        "File2=b.mp3\n"
+        "title2=Second\n"
+        "FILE1 = a.mp3\n"
+        "NumberOfEntries=2\n"
+        "Length1=-1\n"
+        "Version=2\n"
+    )
+    assert parse_pls(text) == [("a.mp3", None), ("b.mp3", "Second")]
+
+
+@pytest.mark.parametrize(
+    ("media_type", "media_id", "expected"),
+    [
+        ("playlist", "media-source://media_source/local/list", True),
+        ("directory", "media-source://media_source/local/photos", True),
+        ("audio/mpegurl", "https://example.com/list", False),
+        ("music", "https://example.com/list.M3U?token=1", True),
+        ("video/mp4", "https://example.com/list.pls", True),
+        ("video/mp4", "https://example.com/video.mp4", False),
+    ],
+)
+def test_is_playlist_media(media_type: str, media_id: str, expected: bool) -> None:
+    """Playlists are detected by media type or by suffix."""
+    assert is_playlist_media(media_type, media_id) is expected
+
+
+@pytest.mark.parametrize(
+    ("media_id", "url", "location", "expected"),
+    [
+        (
+            "https://example.com/lists/a.m3u",
+            "https://example.com/lists/a.m3u",
+            "https://cdn.example.com/x.mp4",
+            "https://cdn.example.com/x.mp4",
+        ),
+        (
+            "https://example.com/lists/a.m3u",
+            "https://example.com/lists/a.m3u",
+            "../media/x.mp4",
+            "https://example.com/media/x.mp4",
+        ),
+        (
+            "media-source://media_source/local/lists/a.m3u",
+            "/media/local/lists/a.m3u?authSig=abc",
+            "..\\clips\\x.mp4",
+            "media-source://media_source/local/clips/x.mp4",
+        ),
+        (
+            "media-source://media_source/local/lists/a.m3u",
+            "https://ha.local:8123/media/local/lists/a.m3u?authSig=abc",
+            "/local/x.mp4",
+            "https://ha.local:8123/local/x.mp4",
+        ),
+    ],
+)
+def test_join_location(media_id: str, url: str, location: str, expected: str) -> None:
+    """Relative entries resolve against the playlist's location."""
+    assert _join_location(media_id, url, location) == expected
+
+
+def test_queue_advance_and_rewind() -> None:
+    """The queue stops at the end unless it wraps."""
+    queue = _queue(3)
+    assert queue.current.media_id == "item0"
+    assert queue.advance(False).media_id == "item1"
+    assert queue.advance(False).media_id == "item2"
+    assert queue.advance(False) is None
+    assert queue.position == 2
+    assert queue.advance(True).media_id == "item0"
+    assert queue.rewind(False).media_id == "item0"
+    assert queue.rewind(True).media_id == "item2"
+
+
+def test_shuffle_keeps_current_first() -> None:
+    """Shuffling starts the new order at the current item."""
+    random.seed(1)
+    queue = _queue(10)
+    queue.advance(False)
+    queue.advance(False)
+
+    queue.set_shuffle(True)
+
+    assert queue.position == 0
+    assert queue.current.media_id == "item2"
+    order = [queue.current.media_id]
+    while (item := queue.advance(False)) is not None:
+        order.append(item.media_id)
+    assert sorted(order) == sorted(_ids(queue.items))
+
+
+def test_unshuffle_restores_playlist_order() -> None:
+    """Turning shuffle off continues from the current item in list order."""
+    random.seed(2)
+    queue = _queue(10, shuffle=True)
+    queue.advance(False)
+    current = queue.current.media_id
+
+    queue.set_shuffle(False)
+
+    assert queue.current.media_id == current
+    assert queue.position == int(current.removeprefix("item"))
+
+
+def test_reshuffle_does_not_repeat_last_item_first() -> None:
+    """A wrap-around never starts with the item that just played."""
+    for seed in range(50):
+        random.seed(seed)
+        queue = _queue(4, shuffle=True)
+        for _ in range(3):
+            queue.advance(False)
+        last = queue.current.media_id
+        assert queue.advance(True).media_id != last
+
+
+def test_insert_next_and_at_end() -> None:
+    """Items play right after the current one or after everything else."""
+    queue = _queue(3)
+    queue.insert([PlaylistItem("end", "video/mp4")], next_up=False)
+    queue.insert([PlaylistItem("next", "video/mp4")], next_up=True)
+
+    assert _ids(queue.upcoming(10, False)) == ["next", "item1", "item2", "end"]
+    assert len(queue) == 5
+
+
+def test_upcoming_wraps() -> None:
+    """Upcoming items continue at the start of the queue with repeat-all."""
+    queue = _queue(3)
+    queue.advance(False)
+    queue.advance(False)
+
+    assert _ids(queue.upcoming(2, False)) == []
+    assert _ids(queue.upcoming(2, True)) == ["item0", "item1"]
+    assert _ids(queue.upcoming(5, True)) == ["item0", "item1"]
@@ -0,0 +1,168 @@
+"""Tests for the background download bandwidth limit."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import time as dt_time
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.ha_dashboard_player import throttle
+from custom_components.ha_dashboard_player.cache import DownloadProgress
+from custom_components.ha_dashboard_player.throttle import BandwidthPolicy, TokenBucket
+
+LIMIT = 1_000_000
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "now", "expected"),
+    [
+        (None, None, dt_time(12, 0), LIMIT),
+        (dt_time(1, 0), None, dt_time(1, 30), LIMIT),
+        (dt_time(1, 0), dt_time(5, 0), dt_time(0, 59), LIMIT),
+        (dt_time(1, 0), dt_time(5, 0), dt_time(1, 0), 0),
+        (dt_time(1, 0), dt_time(5, 0), dt_time(4, 59), 0),
+        (dt_time(1, 0), dt_time(5, 0), dt_time(5, 0), LIMIT),
+        (dt_time(22, 0), dt_time(6, 0), dt_time(23, 0), 0),
+        (dt_time(22, 0), dt_time(6, 0), dt_time(3, 0), 0),
+        (dt_time(22, 0), dt_time(6, 0), dt_time(6, 0), LIMIT),
+        (dt_time(22, 0), dt_time(6, 0), dt_time(12, 0), LIMIT),
+        (dt_time(8, 0), dt_time(8, 0), dt_time(8, 0), LIMIT),
+    ],
+)
+def test_full_speed_window(
+    start: dt_time | None, end: dt_time | None, now: dt_time, expected: int
+) -> None:
+    """The limit is lifted inside the window, which may span midnight."""
+    policy = BandwidthPolicy(LIMIT, start, end)
+    assert policy.current_limit(now) == expected
+
+
+def test_unlimited_policy() -> None:
+    """A limit of 0 stays unlimited outside the window."""
+    policy = BandwidthPolicy(0, dt_time(1, 0), dt_time(2, 0))
+    assert policy.current_limit(dt_time(12, 0)) == 0
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the bucket clock; sleeping advances it instead of waiting."""
+    clock = SimpleNamespace(now=1000.0, sleeps=[], on_sleep=None)
+    real_sleep = asyncio.sleep
+
+    async def _sleep(delay: float) -> None:
+        clock.sleeps.append(delay)
+        clock.now += delay
+        if clock.on_sleep is not None:
+            clock.on_sleep()
+        await real_sleep(0)
+
+    monkeypatch.setattr(throttle, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(throttle.asyncio, "sleep", _sleep)
+    return clock
+
+
+def test_unlimited_bucket_never_waits(clock: SimpleNamespace) -> None:
+    """Without a rate, consuming returns at once."""
+
+    async def _consume() -> None:
+        bucket = TokenBucket(lambda: 0)
+        for _ in range(100):
+            await bucket.async_consume(10 * LIMIT)
+
+    asyncio.run(_consume())
+    assert clock.sleeps == []
+
+
+def test_background_waits_for_debt(clock: SimpleNamespace) -> None:
+    """A background chunk waits until the previous chunk is paid off."""
+
+    async def _consume() -> None:
+        bucket = TokenBucket(lambda: 10 * LIMIT)
+        await bucket.async_consume(2 * LIMIT)
+        await bucket.async_consume(1)
+
+    asyncio.run(_consume())
+    assert sum(clock.sleeps) == pytest.approx(0.2)
+
+
+def test_foreground_spend_delays_background(clock: SimpleNamespace) -> None:
+    """Foreground transfers never wait but push background ones back."""
+
+    async def _consume() -> None:
+        bucket = TokenBucket(lambda: 10 * LIMIT)
+        bucket.async_spend(2 * LIMIT)
+        await bucket.async_consume(1)
+
+    asyncio.run(_consume())
+    assert sum(clock.sleeps) == pytest.approx(0.2)
+
+
+def test_waits_are_capped(clock: SimpleNamespace) -> None:
+    """Long waits are split so limit changes are picked up quickly."""
+
+    async def _consume() -> None:
+        bucket = TokenBucket(lambda: LIMIT)
+        await bucket.async_consume(3 * LIMIT)
+        await bucket.async_consume(1)
+
+    asyncio.run(_consume())
+    assert clock.sleeps == [1.0, 1.0, 1.0]
+
+
+def test_lifting_the_limit_releases_waiters(clock: SimpleNamespace) -> None:
+    """A waiting chunk proceeds once the rate drops to unlimited."""
+    rate = {"value": LIMIT}
+
+    def _lift() -> None:
+        if len(clock.sleeps) == 2:
+            rate["value"] = 0
+
+    async def _consume() -> None:
+        bucket = TokenBucket(lambda: rate["value"])
+        await bucket.async_consume(10 * LIMIT)
+        clock.on_sleep = _lift
+        await bucket.async_consume(1)
+
+    asyncio.run(_consume())
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_promoted_chunk_skips_waiting_chunks(clock: SimpleNamespace) -> None:
+    """A promoted chunk is not queued behind background chunks that wait."""
+
+    async def _consume() -> None:
+        bucket = TokenBucket(lambda: LIMIT)
+        await bucket.async_consume(100 * LIMIT)
+        waiters = [asyncio.ensure_future(bucket.async_consume(1)) for _ in range(3)]
+        await asyncio.sleep(0)
+        promoted = asyncio.Event()
+        promoted.set()
+        await asyncio.wait_for(bucket.async_consume(1, promoted), 0.5)
+        assert not any(waiter.done() for waiter in waiters)
+        for waiter in waiters:
+            waiter.cancel()
+
+    asyncio.run(_consume())
+
+
+def test_promotion_ends_a_throttled_wait(clock: SimpleNamespace) -> None:
+    """A throttled chunk goes through once its download is promoted."""
+
+    async def _consume() -> float:
+        bucket = TokenBucket(lambda: LIMIT)
+        bucket.async_spend(60 * LIMIT)
+        progress = DownloadProgress(bucket, foreground=False)
+        waiter = asyncio.ensure_future(progress.async_throttle(LIMIT))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert not waiter.done()
+        progress.async_promote()
+        await asyncio.wait_for(waiter, 0.5)
+        await progress.async_throttle(LIMIT)
+        return bucket._tokens  # pylint: disable=protected-access
+
+    tokens = asyncio.run(_consume())
+    assert sum(clock.sleeps) == 0
+    assert tokens == pytest.approx(-62 * LIMIT)
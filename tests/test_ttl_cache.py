@@ -0,0 +1,81 @@
+"""Tests for the in-memory TTL cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.ha_dashboard_player import ttl_cache
+from custom_components.ha_dashboard_player.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the monotonic clock of the cache with a settable one."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        ttl_cache, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+def test_entries_expire(clock: SimpleNamespace) -> None:
+    """Values are returned until their time-to-live has passed."""
+    cache: TTLCache[str] = TTLCache(10, 5)
+    cache.set("a", "1")
+
+    clock.now += 9.9
+    assert cache.get("a") == "1"
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_is_capped_by_default(clock: SimpleNamespace) -> None:
+    """A per-entry ttl shortens but never extends the default."""
+    cache: TTLCache[str] = TTLCache(10, 5)
+    cache.set("short", "1", ttl=2)
+    cache.set("long", "2", ttl=100)
+
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == "2"
+    clock.now += 5
+    assert cache.get("long") is None
+
+
+def test_non_positive_ttl_drops_entry(clock: SimpleNamespace) -> None:
+    """Storing an already expired value removes the previous one."""
+    cache: TTLCache[str] = TTLCache(10, 5)
+    cache.set("a", "1")
+    cache.set("a", "2", ttl=0)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted(clock: SimpleNamespace) -> None:
+    """Reads refresh recency, so the oldest unread entry goes first."""
+    cache: TTLCache[int] = TTLCache(10, 2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_clear(clock: SimpleNamespace) -> None:
+    """clear drops every entry."""
+    cache: TTLCache[int] = TTLCache(10, 5)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
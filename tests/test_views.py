@@ -0,0 +1,129 @@
+"""Tests for the HTTP view serving the media cache."""
+
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from aiohttp.test_utils import TestClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.ha_dashboard_player.cache import MediaCache, cache_url
+from custom_components.ha_dashboard_player.views import CacheView
+
+from .conftest import Origin, OriginFile
+from .test_cache import _wait_for
+from .test_faststart import _slow_start_file, _top_level
+
+BODY = bytes(range(256)) * 8
+
+
+@pytest.fixture
+async def client(
+    hass: HomeAssistant, cache: MediaCache, hass_client: ClientSessionGenerator
+) -> TestClient:
+    """Return an authenticated client of the cache view."""
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_view(CacheView(cache))
+    return await hass_client()
+
+
+async def test_serves_ranges_of_cached_files(
+    cache: MediaCache, origin: Origin, client: TestClient
+) -> None:
+    """Complete files answer Range requests with their content type."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    entry = await cache.async_cache_entry(origin.url("/video.mp4"))
+
+    resp = await client.get(entry.local_url, headers={"Range": "bytes=10-19"})
+
+    assert resp.status == HTTPStatus.PARTIAL_CONTENT
+    assert resp.content_type == "video/mp4"
+    assert await resp.read() == BODY[10:20]
+
+
+async def test_unknown_files_are_not_found(
+    cache: MediaCache, origin: Origin, client: TestClient
+) -> None:
+    """Only indexed files and downloads in flight are served."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    entry = await cache.async_cache_entry(origin.url("/video.mp4"))
+    (cache.cache_dir / "stray.mp4").write_bytes(BODY)
+
+    assert (await client.get(cache_url("stray.mp4"))).status == HTTPStatus.NOT_FOUND
+    assert (await client.get(entry.local_url)).status == HTTPStatus.OK
+
+
+async def test_requires_auth(
+    hass: HomeAssistant, cache: MediaCache, origin: Origin, hass_client_no_auth
+) -> None:
+    """Requests without auth or a signed path are rejected."""
+    assert await async_setup_component(hass, "http", {})
+    hass.http.register_view(CacheView(cache))
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    entry = await cache.async_cache_entry(origin.url("/video.mp4"))
+
+    client = await hass_client_no_auth()
+    assert (await client.get(entry.local_url)).status == HTTPStatus.UNAUTHORIZED
+
+
+async def test_streams_a_download_in_flight(
+    cache: MediaCache, origin: Origin, client: TestClient
+) -> None:
+    """A file is served while it downloads, following the download."""
+    origin.files["/video.mp4"] = OriginFile(BODY)
+    origin.pause_at = 100
+
+    local_url = await cache.async_cache_progressive(origin.url("/video.mp4"))
+    assert cache.downloads_in_flight == 1
+
+    full = await client.get(local_url)
+    ranged = await client.get(local_url, headers={"Range": "bytes=50-149"})
+    assert cache.downloads_in_flight == 1
+    origin.resume.set()
+
+    assert full.status == HTTPStatus.OK
+    assert await full.read() == BODY
+    assert ranged.status == HTTPStatus.PARTIAL_CONTENT
+    assert ranged.headers["Content-Range"] == f"bytes 50-149/{len(BODY)}"
+    assert await ranged.read() == BODY[50:150]
+
+
+async def test_streamed_mp4_is_rewritten_once_unused(
+    cache: MediaCache, origin: Origin, client: TestClient
+) -> None:
+    """A streamed MP4 keeps its layout until nobody uses it."""
+    body = _slow_start_file()
+    origin.files["/video.mp4"] = OriginFile(body)
+    origin.pause_at = 10
+    url = origin.url("/video.mp4")
+
+    local_url = await cache.async_cache_progressive(url)
+    cache.async_pin("player", local_url)
+    resp = client.get(local_url)
+    origin.resume.set()
+    assert await (await resp).read() == body
+    # pylint: disable-next=protected-access
+    await _wait_for(lambda: not cache.downloads_in_flight and not cache._readers)
+
+    entry = cache.index.async_get(url)
+    assert entry.faststart_pending
+    assert entry.local_url == local_url
+    assert (cache.cache_dir / entry.filename).read_bytes() == body
+
+    cache.async_pin("player", None)
+    # pylint: disable=protected-access
+    await cache._async_sweep(None)
+    await asyncio.gather(*cache._faststarts.values())
+    # pylint: enable=protected-access
+
+    assert not entry.faststart_pending
+    assert entry.local_url != local_url
+    rewritten = (cache.cache_dir / entry.filename).read_bytes()
+    assert _top_level(rewritten)[1] == b"moov"
+    assert (await client.get(local_url)).status == HTTPStatus.NOT_FOUND
@@ -0,0 +1,155 @@
+"""Tests for the shared feedback watchdog."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.ha_dashboard_player.watchdog import FeedbackWatchdog
+
+
+class FakeTimer:
+    """Timer handle of FakeLoop."""
+
+    def __init__(self, when: float, callback) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class FakeLoop:
+    """Event loop clock that only moves when the test advances it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.timers: list[FakeTimer] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when: float, callback) -> FakeTimer:
+        timer = FakeTimer(when, callback)
+        self.timers.append(timer)
+        return timer
+
+    @property
+    def pending(self) -> list[FakeTimer]:
+        return [timer for timer in self.timers if not timer.cancelled]
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        while due := [timer for timer in self.pending if timer.when <= self.now]:
+            timer = min(due, key=lambda item: item.when)
+            self.timers.remove(timer)
+            timer.callback()
+
+
+class Player:
+    """Feedback target that records its timeouts."""
+
+    def __init__(self, name: str, log: list[str]) -> None:
+        self.name = name
+        self.log = log
+
+    def async_feedback_timeout(self) -> None:
+        self.log.append(self.name)
+
+
+@pytest.fixture
+def loop() -> FakeLoop:
+    """Return a fake event loop."""
+    return FakeLoop()
+
+
+@pytest.fixture
+def watchdog(loop: FakeLoop) -> FeedbackWatchdog:
+    """Return a watchdog running on the fake loop."""
+    return FeedbackWatchdog(SimpleNamespace(loop=loop))
+
+
+def test_timeout_fires_once(loop: FakeLoop, watchdog: FeedbackWatchdog) -> None:
+    """A target times out once after its last report."""
+    log: list[str] = []
+    watchdog.async_touch(Player("a", log), 3)
+
+    loop.advance(2.9)
+    assert log == []
+    loop.advance(0.1)
+    assert log == ["a"]
+    loop.advance(10)
+    assert log == ["a"]
+    assert watchdog._heap == []
+
+
+def test_reports_push_the_deadline(loop: FakeLoop, watchdog: FeedbackWatchdog) -> None:
+    """Each report moves the deadline without adding timers."""
+    log: list[str] = []
+    player = Player("a", log)
+    for _ in range(10):
+        watchdog.async_touch(player, 3)
+        loop.advance(1)
+
+    assert log == []
+    assert len(loop.pending) == 1
+    loop.advance(2)
+    assert log == ["a"]
+
+
+def test_superseded_entries_are_dropped(
+    loop: FakeLoop, watchdog: FeedbackWatchdog
+) -> None:
+    """Stale heap entries do not wake the loop or linger after expiry."""
+    log: list[str] = []
+    fast = Player("fast", log)
+    slow = Player("slow", log)
+    watchdog.async_touch(slow, 10)
+    for _ in range(5):
+        watchdog.async_touch(fast, 3)
+        loop.advance(1)
+
+    loop.advance(2)
+    assert log == ["fast"]
+    assert [entry[2] for entry in watchdog._heap] == [slow]
+    assert [timer.when for timer in loop.pending] == [10]
+
+    loop.advance(3)
+    assert log == ["fast", "slow"]
+    assert watchdog._heap == []
+    assert loop.pending == []
+
+
+def test_targets_expire_in_deadline_order(
+    loop: FakeLoop, watchdog: FeedbackWatchdog
+) -> None:
+    """Several targets due at the same wake-up expire earliest first."""
+    log: list[str] = []
+    watchdog.async_touch(Player("b", log), 2)
+    watchdog.async_touch(Player("a", log), 1)
+    watchdog.async_touch(Player("c", log), 3)
+
+    loop.advance(5)
+
+    assert log == ["a", "b", "c"]
+
+
+def test_cancel_stops_watching(loop: FakeLoop, watchdog: FeedbackWatchdog) -> None:
+    """Cancelling the last target clears the heap and the timer."""
+    log: list[str] = []
+    first = Player("first", log)
+    second = Player("second", log)
+    watchdog.async_touch(first, 3)
+    watchdog.async_touch(second, 5)
+
+    watchdog.async_cancel(first)
+    loop.advance(4)
+    assert log == []
+
+    watchdog.async_cancel(second)
+    assert watchdog._heap == []
+    assert loop.pending == []
+    loop.advance(10)
+    assert log == []
@@ -91,8 +91,11 @@ TEMPLATE.innerHTML = `
   <div class="player">
     <div class="surface">
       <video class="hidden" playsinline></video>
+      <video class="hidden" playsinline></video>
+      <audio class="hidden"></audio>
       <audio class="hidden"></audio>
       <img class="hidden" alt="" />
+      <img class="hidden" alt="" />
       <div class="idle"></div>
     </div>
   </div>
@@ -115,9 +118,20 @@ class HADashboardPlayerCard extends HTMLElement {
 
   set hass(hass) {
     this._hass = hass;
+    this._ensureSubscription();
     this._updateFromState();
   }
 
+  connectedCallback() {
+    this._ensureSubscription();
+  }
+
+  disconnectedCallback() {
+    this._unsubscribe();
+    clearTimeout(this._startTimer);
+    this._startTimer = null;
+  }
+
   setConfig(config) {
     if (!config.entity) {
       throw new Error("Entity is required");
@@ -128,9 +142,9 @@ class HADashboardPlayerCard extends HTMLElement {
     if (!this.shadowRoot) {
       this.attachShadow({ mode: "open" });
       this.shadowRoot.appendChild(TEMPLATE.content.cloneNode(true));
-      this._video = this.shadowRoot.querySelector("video");
-      this._audio = this.shadowRoot.querySelector("audio");
-      this._img = this.shadowRoot.querySelector("img");
+      [this._video, this._videoNext] = this.shadowRoot.querySelectorAll("video");
+      [this._audio, this._audioNext] = this.shadowRoot.querySelectorAll("audio");
+      [this._img, this._imgNext] = this.shadowRoot.querySelectorAll("img");
       this._idle = this.shadowRoot.querySelector(".idle");
       this._onMediaEnded = (event) => this._handleMediaEnded(event);
       this._onMediaPlay = (event) => this._handleMediaPlay(event);
@@ -145,26 +159,25 @@ class HADashboardPlayerCard extends HTMLElement {
       this._reportedImageUrl = null;
       this._lastMediaTime = null;
       this._lastPositionReport = 0;
-
-      this._video.addEventListener("ended", this._onMediaEnded);
-      this._audio.addEventListener("ended", this._onMediaEnded);
-      this._video.addEventListener("play", this._onMediaPlay);
-      this._audio.addEventListener("play", this._onMediaPlay);
-      this._video.addEventListener("pause", this._onMediaPause);
-      this._audio.addEventListener("pause", this._onMediaPause);
-      this._video.addEventListener("timeupdate", this._onMediaTimeUpdate);
-      this._audio.addEventListener("timeupdate", this._onMediaTimeUpdate);
-      this._video.addEventListener("seeked", this._onMediaSeeked);
-      this._audio.addEventListener("seeked", this._onMediaSeeked);
-      this._video.addEventListener("loadedmetadata", this._onMediaLoaded);
-      this._audio.addEventListener("loadedmetadata", this._onMediaLoaded);
-      this._video.addEventListener("durationchange", this._onMediaDuration);
-      this._audio.addEventListener("durationchange", this._onMediaDuration);
-      this._video.addEventListener("volumechange", this._onMediaVolume);
-      this._audio.addEventListener("volumechange", this._onMediaVolume);
+      this._wsReportUnsupported = false;
+      this._subscribedEntity = null;
+      this._unsubPromise = null;
+
+      // Each media kind has two elements; the hidden one buffers the next item.
+      for (const element of this._mediaElements()) {
+        element.addEventListener("ended", this._onMediaEnded);
+        element.addEventListener("play", this._onMediaPlay);
+        element.addEventListener("pause", this._onMediaPause);
+        element.addEventListener("timeupdate", this._onMediaTimeUpdate);
+        element.addEventListener("seeked", this._onMediaSeeked);
+        element.addEventListener("loadedmetadata", this._onMediaLoaded);
+        element.addEventListener("durationchange", this._onMediaDuration);
+        element.addEventListener("volumechange", this._onMediaVolume);
+      }
     }
 
     this._applyConfig();
+    this._ensureSubscription();
   }
 
   getCardSize() {
@@ -181,21 +194,29 @@ class HADashboardPlayerCard extends HTMLElement {
     this.style.setProperty("--ha-dashboard-player-fit", this._config.fit);
 
     const controls = Boolean(this._config.show_controls);
-    this._video.controls = controls;
-    this._audio.controls = controls;
-
     const kioskCompat = Boolean(this._config.kiosk_compat);
-    const autoplay = Boolean(this._config.autoplay) || kioskCompat;
-    this._video.autoplay = autoplay;
-    this._audio.autoplay = autoplay;
-    this._video.preload = kioskCompat ? "auto" : "metadata";
-    this._audio.preload = kioskCompat ? "auto" : "metadata";
-    if (kioskCompat) {
-      this._video.muted = true;
-      this._audio.muted = true;
+    this._autoplay = Boolean(this._config.autoplay) || kioskCompat;
+    this._preload = kioskCompat ? "auto" : "metadata";
+    for (const element of this._mediaElements()) {
+      element.controls = controls;
+      if (kioskCompat) {
+        element.muted = true;
+      }
+    }
+    for (const element of [this._video, this._audio]) {
+      element.autoplay = this._autoplay;
+      element.preload = this._preload;
+    }
+    for (const element of [this._videoNext, this._audioNext]) {
+      element.autoplay = false;
+      element.preload = "auto";
     }
   }
 
+  _mediaElements() {
+    return [this._video, this._videoNext, this._audio, this._audioNext];
+  }
+
   _updateFromState() {
     if (!this._hass || !this._config) {
       return;
@@ -228,16 +249,25 @@ class HADashboardPlayerCard extends HTMLElement {
         return;
       }
       this._showImage(mediaUrl);
+      this._preloadNext(attrs);
       return;
     }
 
+    // Remember which queue item is loaded, for reporting when it ends.
+    this._playingItem = {
+      contentId: attrs.media_content_id,
+      queuePosition: attrs.queue_position,
+    };
+
     if (mediaType.startsWith("video")) {
       this._showVideo(mediaUrl, state, attrs);
+      this._preloadNext(attrs);
       return;
     }
 
     if (mediaType.startsWith("audio") || mediaType === "music") {
       this._showAudio(mediaUrl, state, attrs);
+      this._preloadNext(attrs);
       return;
     }
 
@@ -248,56 +278,139 @@ class HADashboardPlayerCard extends HTMLElement {
     this._hideAll();
     this._idle.classList.remove("hidden");
     if (this._video) {
-      this._video.pause();
-      this._video.removeAttribute("src");
-      this._video.load();
-    }
-    if (this._audio) {
-      this._audio.pause();
-      this._audio.removeAttribute("src");
-      this._audio.load();
+      for (const element of this._mediaElements()) {
+        element.pause();
+        element.removeAttribute("src");
+        element.load();
+      }
     }
   }
 
   _hideAll() {
-    this._video.classList.add("hidden");
-    this._audio.classList.add("hidden");
+    for (const element of this._mediaElements()) {
+      element.classList.add("hidden");
+    }
     this._img.classList.add("hidden");
+    this._imgNext.classList.add("hidden");
     this._idle.classList.add("hidden");
   }
 
   _showImage(url) {
+    if (
+      this._sameMedia(this._imgNext.getAttribute("src"), url) &&
+      !this._sameMedia(this._img.getAttribute("src"), url)
+    ) {
+      // The upcoming slide is already decoded in the hidden element.
+      [this._img, this._imgNext] = [this._imgNext, this._img];
+    }
     this._hideAll();
-    this._img.src = url;
+    // An image on screen needs no new request when only its signature changed.
+    if (!this._sameMedia(this._img.getAttribute("src"), url)) {
+      this._img.src = url;
+    }
     this._img.classList.remove("hidden");
-    if (this._reportedImageUrl !== url) {
+    if (!this._sameMedia(this._reportedImageUrl, url)) {
       this._reportedImageUrl = url;
       this._reportState("playing", 0, 0, null, null, null, null, true);
     }
   }
 
+  _preloadNext(attrs) {
+    const url = attrs.next_media_url;
+    const type = attrs.next_media_content_type || "";
+    let element = null;
+    if (type.startsWith("image")) {
+      element = this._imgNext;
+    } else if (type.startsWith("video")) {
+      element = this._videoNext;
+    } else if (type.startsWith("audio") || type === "music") {
+      element = this._audioNext;
+    }
+    if (!url || !element || this._sameMedia(element.getAttribute("src"), url)) {
+      return;
+    }
+
+    element.setAttribute("src", url);
+    if (element === this._imgNext) {
+      if (typeof element.decode === "function") {
+        element.decode().catch(() => undefined);
+      }
+    } else {
+      element.load();
+    }
+  }
+
+  _flipMedia(active, next) {
+    // Promote the element that buffered the next item and recycle the old one.
+    active.pause();
+    active.autoplay = false;
+    active.preload = "auto";
+    active.removeAttribute("src");
+    active.load();
+    next.autoplay = this._autoplay;
+    next.preload = this._preload;
+    this._lastMediaTime = null;
+    return [next, active];
+  }
+
   _showVideo(url, state, attrs) {
-    this._hideAll();
-    const currentSrc = this._video.getAttribute("src");
-    if (currentSrc !== url) {
-      this._video.setAttribute("src", url);
-      this._lastMediaTime = null;
+    if (
+      this._sameMedia(this._videoNext.getAttribute("src"), url) &&
+      !this._sameMedia(this._video.getAttribute("src"), url)
+    ) {
+      [this._video, this._videoNext] = this._flipMedia(this._video, this._videoNext);
     }
+    this._hideAll();
+    this._setSource(this._video, url);
     this._applyMediaSettings(this._video, state, attrs);
     this._video.classList.remove("hidden");
   }
 
   _showAudio(url, state, attrs) {
-    this._hideAll();
-    const currentSrc = this._audio.getAttribute("src");
-    if (currentSrc !== url) {
-      this._audio.setAttribute("src", url);
-      this._lastMediaTime = null;
+    if (
+      this._sameMedia(this._audioNext.getAttribute("src"), url) &&
+      !this._sameMedia(this._audio.getAttribute("src"), url)
+    ) {
+      [this._audio, this._audioNext] = this._flipMedia(this._audio, this._audioNext);
     }
+    this._hideAll();
+    this._setSource(this._audio, url);
     this._applyMediaSettings(this._audio, state, attrs);
     this._audio.classList.remove("hidden");
   }
 
+  _setSource(element, url) {
+    const currentSrc = element.getAttribute("src");
+    if (currentSrc === url) {
+      return;
+    }
+    if (this._sameMedia(currentSrc, url)) {
+      // The server re-signed the URL before it expired: keep the position.
+      const position = element.currentTime;
+      element.setAttribute("src", url);
+      element.currentTime = position;
+      return;
+    }
+    element.setAttribute("src", url);
+    this._lastMediaTime = null;
+  }
+
+  _sameMedia(a, b) {
+    // Signed URLs of one file differ only in their authSig parameter.
+    if (!a || !b) {
+      return false;
+    }
+    if (a === b) {
+      return true;
+    }
+    const unsigned = (value) => {
+      const url = new URL(value, window.location.href);
+      url.searchParams.delete("authSig");
+      return url.href;
+    };
+    return unsigned(a) === unsigned(b);
+  }
+
   _applyMediaSettings(element, state, attrs) {
     element.muted = Boolean(attrs.is_volume_muted);
     if (typeof attrs.volume_level === "number") {
@@ -305,7 +418,14 @@ class HADashboardPlayerCard extends HTMLElement {
     }
 
     const repeat = attrs.repeat;
-    element.loop = repeat === "one" || repeat === "all";
+    const queued = typeof attrs.queue_size === "number";
+    element.loop = repeat === "one" || (repeat === "all" && !queued);
+
+    const startDelay = this._startDelay(state, attrs);
+    if (startDelay > 0) {
+      this._holdForStart(element, attrs, startDelay);
+      return;
+    }
 
     const position = this._computePosition(state, attrs);
     if (typeof position === "number" && !Number.isNaN(position)) {
@@ -322,6 +442,31 @@ class HADashboardPlayerCard extends HTMLElement {
     }
   }
 
+  _startDelay(state, attrs) {
+    if (state !== "playing" || !attrs.media_position_updated_at) {
+      return 0;
+    }
+    const startAt = Date.parse(attrs.media_position_updated_at);
+    if (Number.isNaN(startAt)) {
+      return 0;
+    }
+    return startAt - Date.now();
+  }
+
+  _holdForStart(element, attrs, delayMs) {
+    // A synchronized group start: cue the media now, start it on time.
+    element.pause();
+    const position = typeof attrs.media_position === "number" ? attrs.media_position : 0;
+    if (Math.abs(element.currentTime - position) > 0.1) {
+      element.currentTime = position;
+    }
+    clearTimeout(this._startTimer);
+    this._startTimer = setTimeout(() => {
+      this._startTimer = null;
+      this._updateFromState();
+    }, delayMs);
+  }
+
   _reportState(
     state,
     mediaPosition,
@@ -372,7 +517,89 @@ class HADashboardPlayerCard extends HTMLElement {
       return;
     }
     this._lastReportPayload = payloadKey;
-    this._hass.callService("ha_dashboard_player", "report_state", payload);
+    this._sendReport(payload);
+  }
+
+  _sendReport(payload) {
+    if (this._wsReportUnsupported) {
+      this._hass.callService("ha_dashboard_player", "report_state", payload);
+      return;
+    }
+    this._hass
+      .callWS({ type: "ha_dashboard_player/report_state", ...payload })
+      .catch((err) => {
+        console.warn("ha-dashboard-player: report_state failed", err);
+        if (err?.code === "unknown_command") {
+          this._wsReportUnsupported = true;
+        }
+        this._hass
+          .callService("ha_dashboard_player", "report_state", payload)
+          .catch(() => undefined);
+      });
+  }
+
+  _ensureSubscription() {
+    const entityId = this._config?.entity;
+    if (!this._hass?.connection || !entityId || !this.isConnected) {
+      return;
+    }
+    if (this._subscribedEntity === entityId) {
+      return;
+    }
+
+    this._unsubscribe();
+    this._subscribedEntity = entityId;
+    this._unsubPromise = this._hass.connection
+      .subscribeMessage((message) => this._handleCommand(message), {
+        type: "ha_dashboard_player/subscribe",
+        entity_id: entityId,
+      })
+      .catch(() => undefined);
+  }
+
+  _unsubscribe() {
+    if (this._unsubPromise) {
+      this._unsubPromise
+        .then((unsub) => {
+          if (unsub) {
+            unsub();
+          }
+        })
+        .catch(() => undefined);
+      this._unsubPromise = null;
+    }
+    this._subscribedEntity = null;
+  }
+
+  _handleCommand(message) {
+    const element = this._activeMediaElement();
+    if (!element) {
+      return;
+    }
+
+    if (message?.command === "seek" && typeof message.media_position === "number") {
+      element.currentTime = message.media_position;
+    } else if (message?.command === "pause") {
+      element.pause();
+    } else if (message?.command === "play") {
+      element.play().catch(() => undefined);
+    } else if (message?.command === "rate" && typeof message.rate === "number") {
+      element.playbackRate = message.rate;
+      clearTimeout(this._rateTimer);
+      this._rateTimer = setTimeout(() => {
+        element.playbackRate = 1;
+      }, (message.duration || 0) * 1000);
+    }
+  }
+
+  _activeMediaElement() {
+    if (this._video && !this._video.classList.contains("hidden")) {
+      return this._video;
+    }
+    if (this._audio && !this._audio.classList.contains("hidden")) {
+      return this._audio;
+    }
+    return null;
   }
 
   _handleMediaPlay(event) {
@@ -537,6 +764,24 @@ class HADashboardPlayerCard extends HTMLElement {
       return;
     }
 
+    const stateObj = this._hass.states[this._config.entity];
+    if (typeof stateObj?.attributes?.queue_size === "number") {
+      // Other cards report the same end; the player advances only once.
+      const item = this._playingItem;
+      if (!item?.contentId) {
+        return;
+      }
+      const payload = {
+        entity_id: this._config.entity,
+        media_content_id: item.contentId,
+      };
+      if (typeof item.queuePosition === "number") {
+        payload.queue_position = item.queuePosition;
+      }
+      this._hass.callService("ha_dashboard_player", "media_ended", payload);
+      return;
+    }
+
     this._setIdle();
     this._hass.callService("media_player", "media_stop", {
       entity_id: this._config.entity,